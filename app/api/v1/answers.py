@@ -1,15 +1,24 @@
+import asyncio
 import logging
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
 from sqlalchemy.exc import IntegrityError
 
-from app.api.v1.deps import get_db
-from app.schemas import AnswerRead
-from app.schemas.answer import AnswerCreate
+from app.api.v1.deps import get_answer_feed, get_config, get_db
+from app.api.v1.fieldsets import FIELDS_QUERY, parse_fields
+from app.api.v1.filters import CreatedRange, created_range
+from app.api.v1.pagination import decode_cursor, encode_cursor
+from app.core.config import Config
+from app.schemas import AnswerRead, trusted
+from app.schemas.answer import AnswerCreate, AnswersPageRead
 
 if TYPE_CHECKING:
-    from app.db.database import Database
+    from app.db.answer_feed import AnswerFeed
+    from app.db.storage import Storage
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["answers"])
@@ -23,10 +32,10 @@ router = APIRouter(tags=["answers"])
 async def create_answer_endpoint(
     question_id: int,
     payload: AnswerCreate,
-    db: "Database" = Depends(get_db),
+    db: "Storage" = Depends(get_db),
 ):
     try:
-        return await db.create_answer_for_question(
+        answer = await db.create_answer_for_question(
             question_id=question_id, data=payload
         )
     except IntegrityError:
@@ -34,22 +43,176 @@ async def create_answer_endpoint(
             status_code=status.HTTP_404_NOT_FOUND, detail="Question not found"
         ) from None
     except Exception as e:
-        logger.exception(f"Unexpected error {e}", exc_info=True)
+        logger.exception("Unexpected error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
         ) from None
+    return trusted.json_response(
+        trusted.answer_read(answer), status_code=status.HTTP_201_CREATED
+    )
+
+
+async def _wait_disconnect(request: Request) -> None:
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+
+@router.get("/questions/{question_id}/answers/stream")
+async def stream_answers_endpoint(
+    question_id: int,
+    request: Request,
+    feed: "AnswerFeed | None" = Depends(get_answer_feed),
+    db: "Storage" = Depends(get_db),
+    config: Config = Depends(get_config),
+):
+    """
+    Server-Sent Events: pushes every new answer to the question as an
+    ``answer`` event. A client that falls behind gets an ``overflow`` event
+    and the stream is closed; it should reload the question and reconnect.
+    """
+    if feed is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Answer feed is disabled",
+        )
+    try:
+        question = await db.get_question_projection(
+            question_id=question_id, fields=("id",)
+        )
+    except Exception as e:
+        logger.exception("Unexpected error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from None
+    if question is None:
+        # Иначе поток без единого события висел бы до отключения клиента
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Question not found"
+        )
+
+    async def event_stream():
+        async with feed.subscribe(question_id) as subscription:
+            # Отключение клиента ждём вместе с очередью: иначе оно заметно
+            # только на следующем keepalive
+            disconnected = asyncio.create_task(_wait_disconnect(request))
+            try:
+                yield ": connected\n\n"
+                while True:
+                    getter = asyncio.create_task(subscription.get())
+                    done, _ = await asyncio.wait(
+                        {getter, disconnected},
+                        timeout=config.feed.keepalive,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    if getter not in done:
+                        getter.cancel()
+                        if disconnected in done:
+                            return
+                        yield ": keepalive\n\n"
+                        continue
+                    answer = getter.result()
+                    if answer is None:
+                        yield "event: overflow\ndata: {}\n\n"
+                        return
+                    data = to_json(trusted.answer_read(answer)).decode()
+                    yield f"event: answer\nid: {answer['id']}\ndata: {data}\n\n"
+            finally:
+                disconnected.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def answers_page(
+    db: "Storage",
+    cursor: str | None,
+    limit: int,
+    fields: str | None,
+    period: CreatedRange,
+    user_id: str | None = None,
+):
+    """
+    One keyset page of answers, newest first (shared by ``/answers`` and
+    ``/users/{user_id}/answers``).
+    """
+    selected = parse_fields(fields, AnswerRead)
+    before = None
+    if cursor is not None:
+        created_at, answer_id = decode_cursor(cursor, size=2)
+        try:
+            before = (datetime.fromisoformat(created_at), int(answer_id))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            ) from None
+
+    try:
+        # Берём на одну строку больше, чтобы узнать, есть ли ещё страница
+        answers = await db.list_answers(
+            limit=limit + 1,
+            before=before,
+            fields=selected or tuple(AnswerRead.model_fields),
+            user_id=user_id,
+            created_after=period.created_after,
+            created_before=period.created_before,
+        )
+    except Exception as e:
+        logger.exception("Unexpected error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from None
+
+    next_cursor = None
+    if len(answers) > limit:
+        answers = answers[:limit]
+        last = answers[-1]
+        next_cursor = encode_cursor(last["created_at"].isoformat(), last["id"])
+    if selected is not None:
+        answers = [{name: answer[name] for name in selected} for answer in answers]
+    else:
+        answers = [trusted.answer_read(answer) for answer in answers]
+    return trusted.json_response({"answers": answers, "next_cursor": next_cursor})
+
+
+@router.get("/answers", response_model=AnswersPageRead)
+async def list_answers_endpoint(
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: str | None = FIELDS_QUERY,
+    period: CreatedRange = Depends(created_range),
+    db: "Storage" = Depends(get_db),
+):
+    """
+    All answers, newest first, with keyset pagination; meant for reports
+    over a ``created_after``/``created_before`` window.
+    """
+    return await answers_page(
+        db, cursor=cursor, limit=limit, fields=fields, period=period
+    )
 
 
 @router.get("/answers/{answer_id}", response_model=AnswerRead)
 async def get_answer_endpoint(
     answer_id: int,
-    db: "Database" = Depends(get_db),
+    fields: str | None = FIELDS_QUERY,
+    db: "Storage" = Depends(get_db),
 ):
+    selected = parse_fields(fields, AnswerRead)
     try:
-        answer = await db.get_answer_by_id(answer_id=answer_id)
+        if selected is not None:
+            answer = await db.get_answer_projection(
+                answer_id=answer_id, fields=selected
+            )
+        else:
+            answer = await db.get_answer_by_id(answer_id=answer_id)
     except Exception as e:
-        logger.exception(f"Unexpected error {e}", exc_info=True)
+        logger.exception("Unexpected error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -58,7 +221,9 @@ async def get_answer_endpoint(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Answer not found"
         ) from None
-    return answer
+    if selected is not None:
+        return trusted.json_response(answer)
+    return trusted.json_response(trusted.answer_read(answer))
 
 
 @router.delete(
@@ -67,12 +232,12 @@ async def get_answer_endpoint(
 )
 async def delete_answer_endpoint(
     answer_id: int,
-    db: "Database" = Depends(get_db),
+    db: "Storage" = Depends(get_db),
 ):
     try:
         deleted = await db.delete_answer_by_id(answer_id=answer_id)
     except Exception as e:
-        logger.exception(f"Unexpected error {e}", exc_info=True)
+        logger.exception("Unexpected error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -0,0 +1,79 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.api.v1.deps import get_db
+from app.api.v1.pagination import decode_cursor, encode_cursor
+from app.db.storage import ChangesPruned, Storage
+from app.schemas.change import ChangesLagRead, ChangesRead
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+@router.get("", response_model=ChangesRead, status_code=status.HTTP_200_OK)
+async def get_changes_endpoint(
+    cursor: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Storage = Depends(get_db),
+):
+    """
+    Incremental change feed: creates and deletes (tombstones) of questions
+    and answers after ``cursor``, oldest first. Start without a cursor and
+    keep the returned ``next_cursor`` between syncs. Changes are kept for
+    ``CHANGES_RETENTION_DAYS``; a cursor into the pruned part gets 410 and
+    the client has to resync from scratch.
+    """
+    after = None
+    if cursor is not None:
+        # (txid, seq), у шардированного хранилища — по паре на шард
+        parts = decode_cursor(cursor, size=db.change_cursor_size)
+        try:
+            after = tuple(int(part) for part in parts)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            ) from None
+
+    try:
+        # Берём на одну строку больше, чтобы узнать, есть ли ещё страница
+        changes = await db.list_changes(after=after, limit=limit + 1)
+    except ChangesPruned:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Cursor expired, resync from scratch",
+        ) from None
+    except Exception as e:
+        logger.exception("Unexpected error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from None
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    if changes:
+        last = changes[-1]
+        position = last.get("position", (last["txid"], last["seq"]))
+        next_cursor = encode_cursor(*position)
+    else:
+        next_cursor = cursor
+    return {"changes": changes, "next_cursor": next_cursor, "has_more": has_more}
+
+
+@router.get("/lag", response_model=ChangesLagRead, status_code=status.HTTP_200_OK)
+async def get_changes_lag_endpoint(db: Storage = Depends(get_db)):
+    """
+    How far the change feed is held back. A change becomes visible only once
+    every transaction older than it has finished, so one long transaction
+    delays everything committed after it started.
+    """
+    try:
+        return await db.changes_lag()
+    except Exception as e:
+        logger.exception("Unexpected error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from None
@@ -0,0 +1,83 @@
+import math
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+from fastapi import Depends, HTTPException, Request, status
+
+from app.api.v1.deps import get_config
+from app.core.config import Config
+from app.core.deadlines import ClientDisconnected, DeadlineExceeded, run_with_deadline
+
+T = TypeVar("T")
+
+# Нестандартный код nginx: клиент закрыл соединение, ответ уже никто не прочтёт
+HTTP_499_CLIENT_CLOSED_REQUEST = 499
+
+
+@dataclass
+class RequestDeadline:
+    """
+    Deadline of the current request; ``run`` executes database work under it.
+    """
+
+    request: Request
+    timeout: float | None
+
+    async def run(self, coro: Awaitable[T]) -> T:
+        """
+        Awaits ``coro`` unless the deadline passes or the client disconnects
+        first; then the query is cancelled and the request is answered with
+        504 (or 499, which nobody will read).
+        """
+        try:
+            return await run_with_deadline(coro, self.timeout, self._disconnected())
+        except DeadlineExceeded:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Deadline exceeded",
+            ) from None
+        except ClientDisconnected:
+            raise HTTPException(
+                status_code=HTTP_499_CLIENT_CLOSED_REQUEST,
+                detail="Client closed request",
+            ) from None
+
+    async def _disconnected(self) -> None:
+        # У GET тела нет: receive() отдаёт пустой http.request, а следующий
+        # вызов ждёт http.disconnect — он приходит, когда клиент ушёл
+        while (await self.request.receive())["type"] != "http.disconnect":
+            pass
+
+
+def _header_timeout(raw: str) -> float:
+    try:
+        value = float(raw)
+    except ValueError:
+        value = math.nan
+    if not math.isfinite(value) or value <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid request timeout header",
+        )
+    return value
+
+
+def request_deadline(route: str) -> Callable[..., Awaitable[RequestDeadline]]:
+    """
+    Dependency factory: deadline for ``route`` from ``Config.deadlines``,
+    shortened by the client's timeout header when one is sent.
+    """
+
+    async def dependency(
+        request: Request, config: Config = Depends(get_config)
+    ) -> RequestDeadline:
+        timeout = config.deadlines.for_route(route)
+        header = config.deadlines.header
+        raw = request.headers.get(header) if header else None
+        if raw is not None:
+            requested = _header_timeout(raw)
+            timeout = min(timeout, requested) if timeout else requested
+        return RequestDeadline(request=request, timeout=timeout)
+
+    return dependency
@@ -1,7 +1,17 @@
 from fastapi import Request
 
-from app.db.database import Database
+from app.core.config import Config
+from app.db.answer_feed import AnswerFeed
+from app.db.storage import Storage
 
 
-async def get_db(request: Request) -> Database:
+async def get_db(request: Request) -> Storage:
     return request.app.state.db
+
+
+async def get_config(request: Request) -> Config:
+    return request.app.state.config
+
+
+async def get_answer_feed(request: Request) -> AnswerFeed | None:
+    return getattr(request.app.state, "answer_feed", None)
@@ -0,0 +1,28 @@
+from fastapi import HTTPException, Query, status
+from pydantic import BaseModel
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated list of fields to return, e.g. `id,created_at`",
+)
+
+
+def parse_fields(raw: str | None, schema: type[BaseModel]) -> tuple[str, ...] | None:
+    """
+    Validates ``?fields=`` against the response schema.
+
+    Returns the requested names in schema order (so equal sets give equal
+    tuples and reuse the same cached SQL projection), or ``None`` when the
+    parameter is absent.
+    """
+    if raw is None:
+        return None
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested - schema.model_fields.keys()
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"Unknown fields: {', '.join(sorted(unknown)) or '(empty)'}; "
+            f"allowed: {', '.join(schema.model_fields)}",
+        )
+    return tuple(name for name in schema.model_fields if name in requested)
@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from fastapi import HTTPException, Query, status
+
+
+@dataclass
+class CreatedRange:
+    """
+    Half-open ``[created_after, created_before)`` filter on ``created_at``.
+    """
+
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+
+    def __bool__(self) -> bool:
+        return self.created_after is not None or self.created_before is not None
+
+
+def _aware(value: datetime | None) -> datetime | None:
+    # Время без зоны считаем UTC, а не часовым поясом сессии Postgres
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value
+
+
+async def created_range(
+    created_after: datetime | None = Query(
+        None, description="Only rows with `created_at >= created_after` (ISO 8601)"
+    ),
+    created_before: datetime | None = Query(
+        None, description="Only rows with `created_at < created_before` (ISO 8601)"
+    ),
+) -> CreatedRange:
+    period = CreatedRange(_aware(created_after), _aware(created_before))
+    if period.created_after and period.created_before:
+        if period.created_after >= period.created_before:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail="created_after must be earlier than created_before",
+            )
+    return period
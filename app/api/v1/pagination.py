@@ -0,0 +1,28 @@
+import base64
+import binascii
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*parts: object) -> str:
+    """
+    Packs cursor parts into an opaque URL-safe token.
+    """
+    raw = "|".join(str(part) for part in parts)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, size: int) -> list[str]:
+    """
+    Unpacks a token made by ``encode_cursor``; responds 400 if it is broken.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        parts = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        parts = []
+    if len(parts) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return parts
@@ -1,11 +1,18 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
-from app.api.v1.deps import get_db
-from app.db.database import Database
+from app.api.v1.deadlines import RequestDeadline, request_deadline
+from app.api.v1.deps import get_config, get_db
+from app.api.v1.fieldsets import FIELDS_QUERY, parse_fields
+from app.api.v1.filters import CreatedRange, created_range
+from app.core.config import Config
+from app.db.storage import Storage
+from app.schemas import trusted
 from app.schemas.question import (
     QuestionCreate,
+    QuestionPreviewRead,
+    QuestionPreviewsRead,
     QuestionRead,
     QuestionsRead,
     QuestionWithAnswersRead,
@@ -16,31 +23,74 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/questions", tags=["questions"])
 
 
-@router.get("", response_model=QuestionsRead, status_code=status.HTTP_200_OK)
-async def get_questions_endpoint(db: Database = Depends(get_db)):
+@router.get(
+    "",
+    response_model=QuestionsRead | QuestionPreviewsRead,
+    status_code=status.HTTP_200_OK,
+)
+async def get_questions_endpoint(
+    preview: int | None = Query(
+        None,
+        ge=1,
+        le=10_000,
+        description="Cut each text to this many characters and add `truncated`",
+    ),
+    fields: str | None = FIELDS_QUERY,
+    period: CreatedRange = Depends(created_range),
+    db: Storage = Depends(get_db),
+    deadline: RequestDeadline = Depends(request_deadline("questions.list")),
+):
+    schema = QuestionPreviewRead if preview is not None else QuestionRead
+    selected = parse_fields(fields, schema)
+    if selected is None and period:
+        # Фильтр по времени есть только у проекций — берём все поля схемы
+        selected = tuple(schema.model_fields)
     try:
-        return {"questions": await db.list_questions()}
+        if selected is not None:
+            questions = await deadline.run(
+                db.list_questions_projection(
+                    fields=selected,
+                    preview=preview,
+                    created_after=period.created_after,
+                    created_before=period.created_before,
+                )
+            )
+        elif preview is not None:
+            questions = await deadline.run(db.list_question_previews(preview=preview))
+        else:
+            questions = await deadline.run(db.list_questions())
+    except HTTPException:
+        raise
     except Exception:
-        logger.exception("Database error", exc_info=True)
+        logger.exception("Database error")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
         ) from None
+    if selected is not None:
+        # Проекция уже содержит ровно запрошенные поля
+        return trusted.json_response({"questions": questions})
+    if preview is not None:
+        return trusted.json_response(trusted.question_previews_read(questions))
+    return trusted.json_response(trusted.questions_read(questions))
 
 
 @router.post("", response_model=QuestionRead, status_code=status.HTTP_201_CREATED)
 async def create_question_endpoint(
     payload: QuestionCreate,
-    db: Database = Depends(get_db),
+    db: Storage = Depends(get_db),
 ):
     try:
-        return await db.create_question(data=payload)
+        question = await db.create_question(data=payload)
     except Exception as e:
-        logger.exception(f"Unexpected error {e}", exc_info=True)
+        logger.exception("Unexpected error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
         ) from None
+    return trusted.json_response(
+        trusted.question_read(question), status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.get(
@@ -49,27 +99,46 @@ async def create_question_endpoint(
     status_code=status.HTTP_200_OK,
 )
 async def get_question_with_answers_endpoint(
-    question_id: int, db: Database = Depends(get_db)
+    question_id: int,
+    fields: str | None = FIELDS_QUERY,
+    db: Storage = Depends(get_db),
+    config: Config = Depends(get_config),
+    deadline: RequestDeadline = Depends(request_deadline("questions.get")),
 ):
+    selected = parse_fields(fields, QuestionWithAnswersRead)
     try:
-        question = await db.get_question(question_id=question_id)
+        if selected is not None:
+            question = await deadline.run(
+                db.get_question_projection(question_id=question_id, fields=selected)
+            )
+        elif getattr(config.db, "json_reads", False):
+            question = await deadline.run(db.get_question_json(question_id=question_id))
+        else:
+            question = await deadline.run(db.get_question(question_id=question_id))
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.exception(f"Unexpected error {e}", exc_info=True)
+        logger.exception("Unexpected error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
         ) from None
     if question is None:
         raise HTTPException(status_code=404, detail="Question not found")
-    return question
+    if isinstance(question, bytes):
+        # Документ уже собран Postgres — отдаём байты без response_model
+        return Response(content=question, media_type="application/json")
+    if selected is not None:
+        return trusted.json_response(question)
+    return trusted.json_response(trusted.question_with_answers_read(question))
 
 
 @router.delete("/{question_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_question_endpoint(question_id: int, db: Database = Depends(get_db)):
+async def delete_question_endpoint(question_id: int, db: Storage = Depends(get_db)):
     try:
         deleted = await db.delete_question_by_id(question_id=question_id)
     except Exception as e:
-        logger.exception(f"Unexpected error {e}", exc_info=True)
+        logger.exception("Unexpected error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, Query, status
+
+from app.api.v1.answers import answers_page
+from app.api.v1.deps import get_db
+from app.api.v1.fieldsets import FIELDS_QUERY
+from app.api.v1.filters import CreatedRange, created_range
+from app.db.storage import Storage
+from app.schemas.answer import AnswersPageRead
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+
+@router.get(
+    "/{user_id}/answers",
+    response_model=AnswersPageRead,
+    status_code=status.HTTP_200_OK,
+)
+async def get_user_answers_endpoint(
+    user_id: str,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: str | None = FIELDS_QUERY,
+    period: CreatedRange = Depends(created_range),
+    db: Storage = Depends(get_db),
+):
+    """
+    Answers of one user, newest first, with keyset pagination: pass the
+    returned ``next_cursor`` to get the next (older) page.
+    """
+    return await answers_page(
+        db, cursor=cursor, limit=limit, fields=fields, period=period, user_id=user_id
+    )
@@ -0,0 +1,83 @@
+"""
+Offline bulk import/export of questions and answers.
+
+    python -m app.cli export dump/ --format jsonl
+    python -m app.cli import dump/ --format csv
+
+Connection settings come from ``.env`` like for the API. With sharding
+(``DB_SHARDS``) every command works on one shard, ``--shard N`` (default 0):
+export each shard separately; an import stays on the shard it targets, its
+questions get that shard's ids.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from pathlib import Path
+
+from app.core.config import load_config
+from app.db.bulk import (
+    FORMATS,
+    IMPORT_PARTITION_MONTHS,
+    export_dump,
+    import_dump,
+)
+from app.db.database import Database
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Bulk import/export of questions and answers via COPY.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, description in (
+        ("export", "write questions.<format> and answers.<format> to DIRECTORY"),
+        ("import", "load a dump from DIRECTORY, questions get new ids"),
+    ):
+        command = commands.add_parser(name, help=description)
+        command.add_argument("directory", type=Path)
+        command.add_argument("--format", choices=FORMATS, default="jsonl")
+        command.add_argument("--shard", type=int, default=0)
+        if name == "import":
+            command.add_argument(
+                "--partition-months",
+                type=int,
+                default=IMPORT_PARTITION_MONTHS,
+                help="create answer partitions at most this many months back, "
+                     "older answers go to the DEFAULT partition",
+            )
+    return parser
+
+
+async def run(args: argparse.Namespace) -> None:
+    config = load_config(path=".env")
+    shards = config.db.shard_configs
+    if not 0 <= args.shard < len(shards):
+        raise SystemExit(f"--shard must be in 0..{len(shards) - 1}")
+    db = Database(db_config=shards[args.shard], echo=False)
+    started = time.perf_counter()
+    try:
+        if args.command == "export":
+            stats = await export_dump(db, args.directory, args.format)
+        else:
+            stats = await import_dump(
+                db, args.directory, args.format, args.partition_months
+            )
+    finally:
+        await db.close()
+    for line in stats:
+        print(line)
+    total = sum(line.rows for line in stats)
+    elapsed = time.perf_counter() - started
+    print(f"total: {total} rows in {elapsed:.2f}s ({total / elapsed:,.0f} rows/s)")
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    asyncio.run(run(build_parser().parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
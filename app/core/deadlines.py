@@ -0,0 +1,85 @@
+import asyncio
+import time
+from collections.abc import Awaitable
+from contextvars import ContextVar
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# Абсолютный дедлайн текущего запроса по time.monotonic(); None — без дедлайна.
+# Выставляется в run_with_deadline и виден всем вызовам Database внутри него.
+deadline_var: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    The work did not finish before the request deadline.
+    """
+
+
+class ClientDisconnected(Exception):
+    """
+    The client went away before the work finished.
+    """
+
+
+def remaining() -> float | None:
+    """
+    Seconds left until the current deadline, or None when there is none.
+    """
+    deadline = deadline_var.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+async def run_with_deadline(
+        coro: Awaitable[T],
+        timeout: float | None,
+        disconnected: Awaitable | None = None,
+) -> T:
+    """
+    Runs ``coro`` in its own task, bounded by ``timeout`` seconds and by
+    ``disconnected`` (an awaitable that completes when the client is gone).
+
+    Whichever comes first cancels the task. Cancelling a task that waits on
+    asyncpg also cancels the statement on the server, and the task is
+    awaited before returning, so its pooled connection is already back in
+    the pool when the caller gets the exception.
+
+    Raises:
+        DeadlineExceeded: ``timeout`` passed first.
+        ClientDisconnected: ``disconnected`` completed first.
+    """
+    deadline = time.monotonic() + timeout if timeout else None
+    token = deadline_var.set(deadline) if deadline is not None else None
+    try:
+        # Задача получает копию контекста — уже с дедлайном
+        task = asyncio.ensure_future(coro)
+    finally:
+        if token is not None:
+            deadline_var.reset(token)
+    watcher = asyncio.ensure_future(disconnected) if disconnected is not None else None
+    waiters = {task} if watcher is None else {task, watcher}
+    try:
+        done, _ = await asyncio.wait(
+            waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        if not task.done():
+            task.cancel()
+            # Ждём, пока отмена дойдёт до драйвера и соединение вернётся в пул
+            await asyncio.gather(task, return_exceptions=True)
+    if task in done:
+        try:
+            return task.result()
+        except TimeoutError:
+            # Таймаут драйвера, выставленный из того же дедлайна
+            if deadline is not None and time.monotonic() >= deadline:
+                raise DeadlineExceeded() from None
+            raise
+    if watcher is not None and watcher in done:
+        raise ClientDisconnected()
+    raise DeadlineExceeded()
@@ -1,24 +1,186 @@
+import copy
+import json
 import logging
+import queue
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
 
+from app.core.config import LogConfig
 
-def setup_logging():
+# ID текущего запроса; выставляется middleware и попадает в каждую запись лога
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Свои обработчики uvicorn пишут в stdout синхронно, из цикла событий;
+# их записи отправляются в корневой логгер, т. е. в очередь
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+TEXT_FORMAT = (
+    "%(filename)s:%(lineno)d #%(levelname)-8s [%(asctime)s] - %(name)s - "
+    "[%(request_id)s] %(message)s"
+)
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Attaches the current request ID to every record.
+
+    Must be installed on the handler that runs in the caller's context
+    (the queue handler), otherwise the context variable is already gone.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Deduplicates bursts of identical WARNING+ records.
+
+    Records are grouped by logger, level, unformatted message template and
+    exception type. Within ``window`` seconds only the first ``burst`` records
+    of a group pass; the rest are counted and reported as ``suppressed`` on
+    the first record of the group that passes in the next window.
+    """
+
+    def __init__(self, burst: int = 5, window: float = 60.0, max_keys: int = 1024):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.max_keys = max_keys
+        # key -> [window_start, passed, suppressed]
+        self._groups: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.burst <= 0:
+            return True
+        exc_type = record.exc_info[0] if record.exc_info else None
+        key = (record.name, record.levelno, record.msg, exc_type)
+        now = time.monotonic()
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None or now - group[0] >= self.window:
+                if group is None and len(self._groups) >= self.max_keys:
+                    self._groups.clear()
+                suppressed = group[2] if group else 0
+                self._groups[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if group[1] < self.burst:
+                group[1] += 1
+                return True
+            group[2] += 1
+            return False
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Renders a record as a single-line JSON object.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+            "location": f"{record.filename}:{record.lineno}",
+        }
+        suppressed = getattr(record, "suppressed", None)
+        if suppressed:
+            payload["suppressed"] = suppressed
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks and keeps heavy formatting off the caller.
+
+    Like the stock ``QueueHandler.prepare``, the message is merged with its
+    arguments right away (they may change or go away before the listener
+    gets to the record), but the traceback in ``exc_info`` is left for the
+    listener thread to format instead of being rendered on the event loop.
+    When the queue is full the record is dropped and counted instead of
+    blocking the loop.
+    """
+
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Копия: другие обработчики той же записи видят её нетронутой
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging(config: LogConfig | None = None) -> QueueListener:
     """
     Set up logging configuration for the application.
 
-    This method initializes the logging configuration for the application.
-    It sets the log level to INFO and configures a basic colorized log for
-    output. The log format includes the filename, line number, log level,
-    timestamp, logger name, and log message.
+    The root logger gets a single non-blocking queue handler; a background
+    ``QueueListener`` thread formats the records (JSON or plain text) and
+    writes them to stdout. Uvicorn's own loggers lose their handlers and
+    propagate to the root, so access and server logs take the same path.
+    Repeated errors are rate-limited, and every record carries the ID of the
+    request it was emitted from.
 
     Returns:
-        None
+        The started listener. Call ``listener.stop()`` on shutdown to flush
+        the queue.
 
     Example usage:
-        setup_logging()
+        listener = setup_logging(config.log)
+        ...
+        listener.stop()
     """
-    log_level = logging.INFO
+    config = config or LogConfig()
 
-    logging.basicConfig(
-        level=log_level,
-        format="%(filename)s:%(lineno)d #%(levelname)-8s [%(asctime)s] - %(name)s - %(message)s",
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(
+        JsonFormatter() if config.json else logging.Formatter(TEXT_FORMAT)
     )
+
+    log_queue: queue.Queue = queue.Queue(maxsize=config.queue_size)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(
+        RateLimitFilter(burst=config.error_burst, window=config.error_window)
+    )
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(config.level)
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,219 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
+import asyncpg
+
+from app.db.database import CHANGES_CHANNEL
+
+if TYPE_CHECKING:
+    from app.db.database import Database
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    One client's view of the feed for a single question.
+
+    Holds a bounded queue. When the client does not keep up and the queue
+    fills, the subscription is marked as overflowed: pending answers are
+    dropped and ``get`` returns ``None`` so the stream can tell the client to
+    resync instead of buffering without limit.
+    """
+
+    def __init__(self, question_id: int, buffer_size: int):
+        self.question_id = question_id
+        self.queue: asyncio.Queue[dict | None] = asyncio.Queue(maxsize=buffer_size)
+        self.overflowed = False
+
+    def push(self, answer: dict) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(answer)
+        except asyncio.QueueFull:
+            self.overflow()
+
+    def overflow(self) -> None:
+        """
+        Drops pending answers and makes ``get`` return ``None``.
+        """
+        if self.overflowed:
+            return
+        self.overflowed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self) -> dict | None:
+        return await self.queue.get()
+
+
+class AnswerFeed:
+    """
+    Fans out new answers to per-question subscribers and keeps this worker's
+    question cache in sync with writes made by other workers.
+
+    Each worker keeps a dedicated asyncpg connection per database (one per
+    shard when sharded) that LISTENs on ``CHANGES_CHANNEL``. Every write to
+    questions and answers emits a NOTIFY with the entity id and its
+    question; the feed drops that question from the cache and, for a new
+    answer, loads it once (only if somebody is subscribed to that question)
+    and pushes it to every subscriber's queue. Notifications are processed
+    one by one, so answers reach clients in commit order (per shard: all
+    answers of a question live on one).
+
+    At most ``pending_size`` notifications wait for dispatch. When the
+    database writes faster than that, the backlog is dropped: every
+    subscriber gets the overflow signal and the question cache is cleared,
+    since there is no telling which questions changed. The same happens
+    after a lost LISTEN connection is restored: whatever was written while
+    it was down never arrived.
+    """
+
+    def __init__(
+        self,
+        db: "Database",
+        buffer_size: int = 100,
+        reconnect_delay: float = 1.0,
+        pending_size: int = 10_000,
+    ):
+        self.db = db
+        self.buffer_size = buffer_size
+        self.reconnect_delay = reconnect_delay
+        self._subscribers: dict[int, set[Subscription]] = defaultdict(set)
+        self._pending: asyncio.Queue[str] = asyncio.Queue(maxsize=pending_size)
+        self.dropped = 0
+        self._conns: list[asyncpg.Connection] = []
+        self._tasks: list[asyncio.Task] = []
+        self._lost = asyncio.Event()
+
+    # ---------- lifecycle ----------
+
+    async def start(self) -> None:
+        await self._connect()
+        self._tasks = [
+            asyncio.create_task(self._dispatch_loop()),
+            asyncio.create_task(self._reconnect_loop()),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._close()
+
+    async def _close(self) -> None:
+        conns, self._conns = self._conns, []
+        for conn in conns:
+            # Своё закрытие — не потеря соединения
+            conn.remove_termination_listener(self._on_terminate)
+            if not conn.is_closed():
+                await conn.close()
+
+    async def _connect(self) -> None:
+        self._lost.clear()
+        # Потеря любого соединения переподключает все: так проще, чем
+        # следить, какие из них живы
+        await self._close()
+        for dsn in self.db.dsns:
+            conn = await asyncpg.connect(dsn)
+            self._conns.append(conn)
+            conn.add_termination_listener(self._on_terminate)
+            await conn.add_listener(CHANGES_CHANNEL, self._on_notify)
+        logger.info(
+            "Listening on channel %s (%d connections)",
+            CHANGES_CHANNEL,
+            len(self._conns),
+        )
+
+    def _on_terminate(self, conn) -> None:
+        self._lost.set()
+
+    async def _reconnect_loop(self) -> None:
+        while True:
+            await self._lost.wait()
+            logger.warning("LISTEN connection lost, reconnecting")
+            try:
+                await self._connect()
+            except Exception as e:
+                logger.warning("LISTEN reconnect failed: %s", e)
+                # Не дождёмся нового сигнала от соединения, которого нет
+                self._lost.set()
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+            # Уведомления, отправленные без соединения, потеряны
+            self._resync()
+
+    # ---------- subscriptions ----------
+
+    @asynccontextmanager
+    async def subscribe(self, question_id: int) -> AsyncIterator[Subscription]:
+        subscription = Subscription(question_id, self.buffer_size)
+        self._subscribers[question_id].add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscribers = self._subscribers.get(question_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[question_id]
+
+    def subscriber_count(self, question_id: int) -> int:
+        return len(self._subscribers.get(question_id, ()))
+
+    def publish(self, question_id: int, answer: dict) -> None:
+        for subscription in tuple(self._subscribers.get(question_id, ())):
+            subscription.push(answer)
+
+    # ---------- notifications ----------
+
+    def _on_notify(self, conn, pid: int, channel: str, payload: str) -> None:
+        try:
+            self._pending.put_nowait(payload)
+        except asyncio.QueueFull:
+            self._overflow()
+
+    def _overflow(self) -> None:
+        # Что именно изменилось, уже не узнать: все подписчики
+        # пересинхронизируются, кэш сбрасывается целиком
+        dropped = self._pending.qsize() + 1
+        while not self._pending.empty():
+            self._pending.get_nowait()
+        self.dropped += dropped
+        logger.warning("Change notifications backlog overflowed, dropped %d", dropped)
+        self._resync()
+
+    def _resync(self) -> None:
+        self.db.invalidate_questions()
+        for subscribers in self._subscribers.values():
+            for subscription in tuple(subscribers):
+                subscription.overflow()
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            payload = await self._pending.get()
+            try:
+                await self._dispatch(payload)
+            except Exception as e:
+                logger.exception("Failed to dispatch change notification: %s", e)
+
+    async def _dispatch(self, payload: str) -> None:
+        event = json.loads(payload)
+        question_id = event["question_id"]
+        # Запись могла прийти из другого воркера — закэшированный вопрос устарел
+        self.db.invalidate_question(question_id)
+        if (event["entity"], event["op"]) != ("answer", "create"):
+            return
+        if not self.subscriber_count(question_id):
+            return
+        answer = await self.db.get_answer_by_id_fast(event["id"])
+        if answer is not None:
+            self.publish(question_id, answer)
@@ -0,0 +1,297 @@
+"""
+Bulk export and import of questions and answers through Postgres ``COPY``.
+
+A dump is a directory with ``questions.<format>`` and ``answers.<format>``,
+``format`` being ``jsonl`` or ``csv``. Files are streamed between disk and
+the COPY protocol chunk by chunk, so memory use does not depend on their
+size; all parsing and id remapping happens on the server.
+
+On import every question gets a fresh id from the target sequence and the
+answers are re-attached to the new ids, so a dump can be loaded into a
+database that already has data (or into the same one again).
+"""
+
+import csv
+import logging
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from app.db.partitions import add_months, month_start
+
+if TYPE_CHECKING:
+    import asyncpg
+
+    from app.db.database import Database
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("jsonl", "csv")
+
+QUESTION_COLUMNS = ("id", "text", "created_at")
+ANSWER_COLUMNS = ("id", "question_id", "user_id", "text", "created_at")
+
+# JSONL через COPY в csv-режиме: кавычка и разделитель — управляющие символы,
+# которых не бывает в выводе row_to_json, поэтому строка документа идёт как есть
+JSONL_COPY_OPTIONS = {"format": "csv", "quote": "\x01", "delimiter": "\x02"}
+CSV_COPY_OPTIONS = {"format": "csv", "header": True}
+
+EXPORT_QUESTIONS = "SELECT id, text, created_at FROM questions ORDER BY id"
+EXPORT_ANSWERS = (
+    "SELECT id, question_id, user_id, text, created_at FROM answers ORDER BY id"
+)
+
+IMPORT_WORK_MEM = "256MB"
+# Насколько глубоко в прошлое импорт создаёт помесячные партиции; ответы
+# старше ложатся в DEFAULT. Без предела одна строка с датой 1970 года
+# создала бы сотни пустых партиций.
+IMPORT_PARTITION_MONTHS = 60
+
+# Промежуточные таблицы живут до конца транзакции импорта
+CREATE_STAGING = """
+CREATE TEMP TABLE import_questions (
+    id integer, text text, created_at timestamptz
+) ON COMMIT DROP;
+CREATE TEMP TABLE import_answers (
+    id integer, question_id integer, user_id text, text text, created_at timestamptz
+) ON COMMIT DROP;
+CREATE TEMP TABLE import_docs (doc json) ON COMMIT DROP;
+"""
+
+FIND_DUPLICATE_QUESTION = (
+    "SELECT id FROM import_questions WHERE id IS NOT NULL "
+    "GROUP BY id HAVING count(*) > 1 LIMIT 1"
+)
+
+OLDEST_IMPORTED_ANSWER = "SELECT min(created_at) FROM import_answers"
+
+# Новые id вопросов выдаются заранее: по src_id к ним привязываются ответы
+MAP_QUESTION_IDS = """
+CREATE TEMP TABLE import_question_ids ON COMMIT DROP AS
+SELECT
+    id AS src_id,
+    nextval(pg_get_serial_sequence('questions', 'id'))::integer AS id,
+    text,
+    coalesce(created_at, now()) AS created_at
+FROM import_questions;
+CREATE INDEX ON import_question_ids (src_id);
+ANALYZE import_question_ids;
+ANALYZE import_answers;
+"""
+
+INSERT_QUESTIONS = """
+WITH inserted AS (
+    INSERT INTO questions (id, text, created_at)
+    SELECT id, text, created_at FROM import_question_ids
+    ORDER BY created_at, id
+    RETURNING id
+)
+INSERT INTO changes (entity, op, entity_id, question_id)
+SELECT 'question', 'create', id, id FROM inserted
+"""
+
+# created_at из дампа переносится как есть. Порядок вставки по времени
+# сохраняет пользу BRIN-индекса.
+INSERT_ANSWERS = """
+WITH inserted AS (
+    INSERT INTO answers (question_id, user_id, text, created_at)
+    SELECT
+        m.id,
+        a.user_id,
+        a.text,
+        coalesce(a.created_at, now())
+    FROM import_answers a
+    JOIN import_question_ids m ON m.src_id = a.question_id
+    ORDER BY 4, a.id
+    RETURNING id, question_id
+)
+INSERT INTO changes (entity, op, entity_id, question_id)
+SELECT 'answer', 'create', id, question_id FROM inserted
+"""
+
+COUNT_ORPHAN_ANSWERS = """
+SELECT count(*) FROM import_answers a
+WHERE NOT EXISTS (SELECT 1 FROM import_question_ids m WHERE m.src_id = a.question_id)
+"""
+
+
+@dataclass
+class CopyStats:
+    """
+    Rows moved for one table and how long it took.
+    """
+
+    table: str
+    rows: int
+    seconds: float
+    skipped: int = 0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        line = (
+            f"{self.table}: {self.rows} rows in {self.seconds:.2f}s "
+            f"({self.rows_per_second:,.0f} rows/s)"
+        )
+        if self.skipped:
+            line += f", {self.skipped} skipped"
+        return line
+
+
+def _row_count(status: str) -> int:
+    # Статус команды: "COPY 42", "INSERT 0 42"
+    return int(status.rsplit(" ", 1)[-1])
+
+
+def _csv_columns(path: Path, allowed: tuple[str, ...]) -> list[str]:
+    with path.open(newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), [])
+    unknown = [name for name in header if name not in allowed]
+    if not header or unknown:
+        raise ValueError(
+            f"{path}: bad CSV header {header!r}, expected columns from {allowed}"
+        )
+    return header
+
+
+async def export_dump(
+        db: "Database", directory: Path, fmt: str = "jsonl"
+) -> list[CopyStats]:
+    """
+    Writes ``questions.<fmt>`` and ``answers.<fmt>`` to ``directory``.
+
+    Both files come from one REPEATABLE READ snapshot, so every exported
+    answer references an exported question.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    stats = []
+    async with db.raw_connection() as conn:
+        async with conn.transaction(isolation="repeatable_read", readonly=True):
+            await conn.execute("SET LOCAL TIME ZONE 'UTC'")
+            for table, query in (
+                ("questions", EXPORT_QUESTIONS),
+                ("answers", EXPORT_ANSWERS),
+            ):
+                if fmt == "jsonl":
+                    query = f"SELECT row_to_json(t)::text FROM ({query}) t"
+                    options = JSONL_COPY_OPTIONS
+                else:
+                    options = CSV_COPY_OPTIONS
+                started = time.perf_counter()
+                status = await conn.copy_from_query(
+                    query, output=str(directory / f"{table}.{fmt}"), **options
+                )
+                stats.append(
+                    CopyStats(table, _row_count(status), time.perf_counter() - started)
+                )
+    return stats
+
+
+async def _stage(
+        conn: "asyncpg.Connection",
+        table: str,
+        columns: tuple[str, ...],
+        path: Path,
+        fmt: str,
+) -> None:
+    if fmt == "csv":
+        await conn.copy_to_table(
+            table,
+            source=str(path),
+            columns=_csv_columns(path, columns),
+            **CSV_COPY_OPTIONS,
+        )
+        return
+    await conn.copy_to_table(
+        "import_docs", source=str(path), columns=["doc"], **JSONL_COPY_OPTIONS
+    )
+    await conn.execute(
+        f"INSERT INTO {table} SELECT r.* FROM import_docs, "
+        f"json_populate_record(NULL::{table}, doc) r WHERE doc IS NOT NULL"
+    )
+    await conn.execute("TRUNCATE import_docs")
+
+
+def _partitions_since(oldest: datetime, months: int) -> datetime:
+    floor = datetime.combine(
+        add_months(month_start(datetime.now(UTC)), -months),
+        datetime.min.time(),
+        UTC,
+    )
+    if oldest < floor:
+        logger.warning(
+            "Imported answers go back to %s; months before %s stay in the "
+            "DEFAULT partition",
+            oldest.date(),
+            floor.date(),
+        )
+        return floor
+    return oldest
+
+
+async def import_dump(
+        db: "Database",
+        directory: Path,
+        fmt: str = "jsonl",
+        partition_months: int = IMPORT_PARTITION_MONTHS,
+) -> list[CopyStats]:
+    """
+    Loads ``questions.<fmt>`` and (if present) ``answers.<fmt>`` from
+    ``directory`` in one transaction. Questions get new ids; answers whose
+    question is not in the dump are skipped and counted.
+
+    Monthly ``answers`` partitions are created for the imported history, but
+    at most ``partition_months`` months back; older answers land in the
+    DEFAULT partition.
+    """
+    questions_path = directory / f"questions.{fmt}"
+    answers_path = directory / f"answers.{fmt}"
+    async with db.raw_connection() as conn:
+        async with conn.transaction():
+            # Время без зоны в файле — это UTC
+            await conn.execute("SET LOCAL TIME ZONE 'UTC'")
+            # Сортировка ответов по времени не должна уходить на диск
+            await conn.execute(f"SET LOCAL work_mem = '{IMPORT_WORK_MEM}'")
+            await conn.execute(CREATE_STAGING)
+
+            started = time.perf_counter()
+            await _stage(
+                conn, "import_questions", QUESTION_COLUMNS, questions_path, fmt
+            )
+            duplicate = await conn.fetchval(FIND_DUPLICATE_QUESTION)
+            if duplicate is not None:
+                raise ValueError(f"{questions_path}: question id {duplicate} repeats")
+            questions_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            if answers_path.exists():
+                await _stage(conn, "import_answers", ANSWER_COLUMNS, answers_path, fmt)
+            oldest = await conn.fetchval(OLDEST_IMPORTED_ANSWER)
+            if oldest is not None:
+                # Партиции под импортируемую историю, иначе она осядет в DEFAULT.
+                # Создаются отдельной транзакцией до вставки: партиции нужна
+                # блокировка questions, которую наша вставка иначе бы держала.
+                created = await db.ensure_answer_partitions(
+                    since=_partitions_since(oldest, partition_months)
+                )
+                if created:
+                    logger.info("Created answer partitions: %s", ", ".join(created))
+            answers_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            await conn.execute(MAP_QUESTION_IDS)
+            questions = _row_count(await conn.execute(INSERT_QUESTIONS))
+            questions_time += time.perf_counter() - started
+
+            started = time.perf_counter()
+            answers = _row_count(await conn.execute(INSERT_ANSWERS))
+            skipped = await conn.fetchval(COUNT_ORPHAN_ANSWERS)
+            answers_time += time.perf_counter() - started
+    return [
+        CopyStats("questions", questions, questions_time),
+        CopyStats("answers", answers, answers_time, skipped=skipped),
+    ]
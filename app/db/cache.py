@@ -0,0 +1,103 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+# (номер последнего сброса, время взятия) — см. ReadCache.token
+Token = tuple[int, float]
+
+
+class ReadCache:
+    """
+    In-process LRU cache of read documents with a time-to-live.
+
+    Holds at most ``max_size`` entries; the least recently used one is
+    evicted first and an entry older than ``ttl`` seconds counts as a miss.
+    Writes made by this process invalidate their keys right away, writes
+    made elsewhere become visible after at most ``ttl``.
+
+    A reader that missed takes a ``token`` before going to the database and
+    hands it back to ``put``: if its key was invalidated (or the cache
+    cleared) in between, the possibly stale result is not stored.
+    Invalidations of other keys do not affect it. A token older than ``ttl``
+    is refused as well, so invalidations only have to be remembered for
+    ``ttl`` seconds.
+    """
+
+    def __init__(
+            self,
+            max_size: int = 1000,
+            ttl: float = 30.0,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        # key -> (expires_at, value); порядок — от давно использованных к свежим
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # Сбросы нумеруются по порядку; для ключа хранится номер и время
+        # последнего сброса, от старых к новым
+        self._generation = 0
+        self._cleared = 0
+        self._invalidated: OrderedDict[Hashable, tuple[int, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= self.clock():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def token(self) -> Token:
+        """
+        Taken by a reader before it goes to the database, see ``put``.
+        """
+        return self._generation, self.clock()
+
+    def _is_current(self, key: Hashable, token: Token) -> bool:
+        generation, taken_at = token
+        if self.clock() - taken_at >= self.ttl or self._cleared > generation:
+            return False
+        invalidated = self._invalidated.get(key)
+        return invalidated is None or invalidated[0] <= generation
+
+    def put(self, key: Hashable, value: Any, token: Token | None = None) -> bool:
+        """
+        Stores ``value`` unless ``key`` was invalidated since ``token`` was
+        taken. Returns whether it was stored.
+        """
+        if token is not None and not self._is_current(key, token):
+            return False
+        self._entries[key] = (self.clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return True
+
+    def invalidate(self, key: Hashable) -> None:
+        self._generation += 1
+        now = self.clock()
+        self._entries.pop(key, None)
+        self._invalidated[key] = (self._generation, now)
+        self._invalidated.move_to_end(key)
+        # Токены старше ttl отвергаются и так: их сбросы можно забыть
+        while self._invalidated:
+            oldest, (_, at) = next(iter(self._invalidated.items()))
+            if at > now - self.ttl:
+                break
+            del self._invalidated[oldest]
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._cleared = self._generation
+        self._entries.clear()
+        self._invalidated.clear()
@@ -1,28 +1,432 @@
+import json
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from math import ceil
 from typing import TYPE_CHECKING
 
-from sqlalchemy import delete, select, insert
+from sqlalchemy import (
+    Integer,
+    bindparam,
+    delete,
+    event,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer
 
 from app.core.config import DbConfig
-from app.db.models import AnswerOrm, Base, QuestionOrm
+from app.core.deadlines import remaining
+from app.db.cache import ReadCache
+from app.db.models import AnswerOrm, Base, ChangeOrm, ChangesPrunedOrm, QuestionOrm
+from app.db.partitions import archive_answer_partitions, ensure_answer_partitions
+from app.db.storage import ChangesPruned
+from app.schemas import trusted
 
 if TYPE_CHECKING:
+    import asyncpg
     from sqlalchemy.ext.asyncio import AsyncSession
     from app.schemas.answer import AnswerCreate
     from app.schemas.question import QuestionCreate
 
 logger = logging.getLogger(__name__)
 
+# Канал NOTIFY обо всех записях в questions/answers (то же, что попадает в
+# changes): по нему воркеры сбрасывают кэш и рассылают новые ответы.
+# Полезная нагрузка — только id: текст может не влезть в лимит NOTIFY (8000 байт).
+CHANGES_CHANNEL = "question_changes"
+
+# ---------- PREBUILT STATEMENTS ----------
+# Конструкции собираются один раз при импорте. ClauseElement мемоизирует свой
+# cache key, поэтому на горячем пути не тратится время ни на сборку select(),
+# ни на генерацию ключа кэша компиляции: значения приходят через bindparam.
+
+_answers = AnswerOrm.__table__
+_questions = QuestionOrm.__table__
+_changes = ChangeOrm.__table__
+_changes_pruned = ChangesPrunedOrm.__table__
+
+INSERT_ANSWER = (
+    insert(_answers)
+    .values(
+        question_id=bindparam("question_id"),
+        user_id=bindparam("user_id"),
+        text=bindparam("text"),
+    )
+    .returning(
+        _answers.c.user_id,
+        _answers.c.text,
+        _answers.c.id,
+        _answers.c.question_id,
+        _answers.c.created_at,
+    )
+)
+
+NOTIFY_CHANGE = select(
+    func.pg_notify(literal(CHANGES_CHANNEL), bindparam("payload"))
+)
+
+# text у моделей deferred: там, где он отдаётся наружу, грузим явно
+SELECT_ANSWER_BY_ID = (
+    select(AnswerOrm)
+    .options(undefer(AnswerOrm.text))
+    .where(AnswerOrm.id == bindparam("answer_id"))
+)
+
+DELETE_ANSWER_BY_ID = (
+    delete(_answers)
+    .where(_answers.c.id == bindparam("answer_id"))
+    .returning(_answers.c.question_id)
+)
+
+# В списке ответы не отдаются — и не грузятся
+SELECT_QUESTIONS = (
+    select(QuestionOrm)
+    .options(undefer(QuestionOrm.text))
+    .order_by(QuestionOrm.created_at.desc(), QuestionOrm.id.desc())
+)
+
+# ---------- PROJECTIONS (sparse fieldsets) ----------
+# Для ?fields= в SELECT попадают только запрошенные колонки. Наборов полей
+# немного, поэтому собранные конструкции кэшируются так же, как prebuilt-
+# выражения выше: cache key мемоизирован, меняются только bindparam.
+
+QUESTION_COLUMNS = ("text", "id", "created_at")
+QUESTION_PREVIEW_COLUMNS = ("id", "text", "created_at", "truncated")
+ANSWER_COLUMNS = ("user_id", "text", "id", "question_id", "created_at")
+
+
+def _question_columns(fields: tuple[str, ...], preview: bool = False) -> list:
+    # id выбираем всегда: по нему ищутся ответы, наружу он уходит только
+    # если был запрошен
+    columns = [] if "id" in fields else [_questions.c.id]
+    for name in fields:
+        if name == "text" and preview:
+            # Превью: обрезаем текст в самой базе
+            columns.append(func.left(_questions.c.text, bindparam("preview")).label("text"))
+        elif name == "truncated":
+            # left(text, n + 1) вместо char_length(text) — чтобы не
+            # распаковывать весь TOAST ради флага
+            probe = func.left(_questions.c.text, bindparam("preview_probe"))
+            columns.append((func.char_length(probe) > bindparam("preview")).label(name))
+        elif name != "answers":
+            columns.append(_questions.c[name])
+    return columns
+
+
+def _created_range(stmt, table, created_after: bool, created_before: bool):
+    # Полуинтервал [created_after, created_before): на created_at есть BRIN
+    if created_after:
+        stmt = stmt.where(table.c.created_at >= bindparam("created_after"))
+    if created_before:
+        stmt = stmt.where(table.c.created_at < bindparam("created_before"))
+    return stmt
+
+
+def _range_params(created_after: datetime | None, created_before: datetime | None):
+    params = {}
+    if created_after is not None:
+        params["created_after"] = created_after
+    if created_before is not None:
+        params["created_before"] = created_before
+    return params
+
+
+@lru_cache(maxsize=64)
+def select_questions_projection(
+        fields: tuple[str, ...],
+        preview: bool = False,
+        created_after: bool = False,
+        created_before: bool = False,
+):
+    stmt = select(*_question_columns(fields, preview)).order_by(
+        _questions.c.created_at.desc(), _questions.c.id.desc()
+    )
+    return _created_range(stmt, _questions, created_after, created_before)
+
+
+@lru_cache(maxsize=64)
+def select_question_projection(fields: tuple[str, ...]):
+    return select(*_question_columns(fields)).where(
+        _questions.c.id == bindparam("question_id")
+    )
+
+
+@lru_cache(maxsize=64)
+def select_answer_projection(fields: tuple[str, ...]):
+    return select(*(_answers.c[name] for name in fields)).where(
+        _answers.c.id == bindparam("answer_id")
+    )
+
+
+@lru_cache(maxsize=64)
+def select_answers(
+        fields: tuple[str, ...],
+        by_user: bool = False,
+        after_cursor: bool = False,
+        created_after: bool = False,
+        created_before: bool = False,
+):
+    # created_at и id нужны для курсора, даже если их не запросили
+    names = [*fields, *(n for n in ("created_at", "id") if n not in fields)]
+    stmt = (
+        select(*(_answers.c[name] for name in names))
+        .order_by(_answers.c.created_at.desc(), _answers.c.id.desc())
+        .limit(bindparam("limit", type_=Integer))
+    )
+    if by_user:
+        stmt = stmt.where(_answers.c.user_id == bindparam("user_id"))
+    if after_cursor:
+        stmt = stmt.where(
+            tuple_(_answers.c.created_at, _answers.c.id)
+            < tuple_(bindparam("before_created_at"), bindparam("before_id"))
+        )
+    return _created_range(stmt, _answers, created_after, created_before)
+
+
+SELECT_ANSWERS_BY_QUESTION = (
+    select(*(_answers.c[name] for name in ANSWER_COLUMNS))
+    .where(_answers.c.question_id == bindparam("question_id"))
+    .order_by(_answers.c.created_at, _answers.c.id)
+)
+
+INSERT_QUESTION = (
+    insert(_questions)
+    .values(text=bindparam("text"))
+    .returning(_questions.c.id, _questions.c.text, _questions.c.created_at)
+)
+
+SELECT_QUESTION_BY_ID = (
+    select(QuestionOrm)
+    .options(
+        undefer(QuestionOrm.text),
+        selectinload(QuestionOrm.answers).undefer(AnswerOrm.text),
+    )
+    .where(QuestionOrm.id == bindparam("question_id"))
+)
+
+DELETE_QUESTION_BY_ID = (
+    delete(_questions)
+    .where(_questions.c.id == bindparam("question_id"))
+    .returning(_questions.c.id)
+)
+
+INSERT_CHANGE = insert(_changes).values(
+    entity=bindparam("entity"),
+    op=bindparam("op"),
+    entity_id=bindparam("entity_id"),
+    question_id=bindparam("question_id"),
+)
+
+# statement_timeout на время транзакции (is_local = true): серверная страховка
+# дедлайна запроса на случай, если отмена из asyncpg до сервера не дошла
+SET_STATEMENT_TIMEOUT = select(
+    func.set_config(literal("statement_timeout"), bindparam("timeout"), literal(True))
+)
+# Запас сверх дедлайна: обычно запрос раньше отменяет сам клиент
+STATEMENT_TIMEOUT_SLACK_MS = 100
+
+# Самая старая транзакция, которая ещё может закоммитить строку в changes
+_SNAPSHOT_XMIN = literal_column(
+    "(pg_snapshot_xmin(pg_current_snapshot())::text)::bigint"
+)
+
+SELECT_CHANGES = (
+    select(
+        _changes.c.seq,
+        _changes.c.txid,
+        _changes.c.entity,
+        _changes.c.op,
+        _changes.c.entity_id,
+        _changes.c.question_id,
+        _changes.c.created_at,
+    )
+    .where(_changes.c.txid < _SNAPSHOT_XMIN)
+    .order_by(_changes.c.txid, _changes.c.seq)
+    .limit(bindparam("limit", type_=Integer))
+)
+
+SELECT_CHANGES_AFTER = SELECT_CHANGES.where(
+    tuple_(_changes.c.txid, _changes.c.seq)
+    > tuple_(bindparam("after_txid"), bindparam("after_seq"))
+)
+
+# Закоммиченные изменения, которые лента ещё не отдаёт: их держит более
+# старая незавершённая транзакция
+SELECT_CHANGES_LAG = select(
+    func.count().label("held_back"),
+    func.min(_changes.c.created_at).label("oldest_held_back"),
+).where(_changes.c.txid >= _SNAPSHOT_XMIN)
+
+# Устаревшие изменения удаляются пачками по seq: всё, что раньше первой
+# строки моложе before. seq растёт вместе со временем записи, так что это
+# проход по первичному ключу с начала, а не скан всей таблицы. Если моложе
+# before нет ничего (лента затихла), устарели все строки.
+_kept = _changes.alias("kept")
+_last = _changes.alias("last")
+_expired = _changes.alias("expired")
+DELETE_EXPIRED_CHANGES = delete(_changes).where(
+    _changes.c.seq.in_(
+        select(_expired.c.seq)
+        .where(
+            _expired.c.seq
+            < func.coalesce(
+                select(_kept.c.seq)
+                .where(_kept.c.created_at >= bindparam("before"))
+                .order_by(_kept.c.seq)
+                .limit(1)
+                .scalar_subquery(),
+                select(func.max(_last.c.seq) + 1).scalar_subquery(),
+            )
+        )
+        .order_by(_expired.c.seq)
+        .limit(bindparam("batch", type_=Integer))
+    )
+).returning(_changes.c.txid, _changes.c.seq)
+
+# Отметка очистки только растёт: старшая позиция среди удалённых строк
+_upsert_pruned = pg_insert(_changes_pruned).values(
+    id=1, txid=bindparam("txid"), seq=bindparam("seq")
+)
+UPSERT_CHANGES_PRUNED = _upsert_pruned.on_conflict_do_update(
+    index_elements=[_changes_pruned.c.id],
+    set_={"txid": _upsert_pruned.excluded.txid, "seq": _upsert_pruned.excluded.seq},
+    where=tuple_(_changes_pruned.c.txid, _changes_pruned.c.seq)
+    < tuple_(_upsert_pruned.excluded.txid, _upsert_pruned.excluded.seq),
+)
+
+SELECT_CHANGES_PRUNED = select(_changes_pruned.c.txid, _changes_pruned.c.seq)
+
+# ---------- RAW SQL (asyncpg fast path) ----------
+# asyncpg готовит (PREPARE) каждый запрос при первом выполнении на соединении
+# и держит prepared statement в своём LRU-кэше, дальше идёт только Bind/Execute.
+
+# Без условия на created_at: поиск по id и по вопросу проходит по индексу
+# каждой подключённой партиции (см. app/db/partitions.py)
+RAW_SELECT_ANSWER_BY_ID = (
+    "SELECT id, question_id, user_id, text, created_at FROM answers WHERE id = $1"
+)
+
+RAW_SELECT_QUESTION_BY_ID = "SELECT id, text, created_at FROM questions WHERE id = $1"
+
+# Прогрев кэша: самые новые вопросы и их ответы пачкой. Порядок — как у
+# списков, по (created_at, id): id с шардов и из импорта с временем не связан.
+# Читается с конца индекса ix_questions_created_at_id
+RAW_SELECT_RECENT_QUESTION_IDS = (
+    "SELECT id FROM questions ORDER BY created_at DESC, id DESC LIMIT $1"
+)
+
+RAW_SELECT_QUESTIONS_BY_IDS = (
+    "SELECT id, text, created_at FROM questions WHERE id = ANY($1::int[])"
+)
+
+RAW_SELECT_ANSWERS_BY_QUESTIONS = (
+    "SELECT id, question_id, user_id, text, created_at FROM answers "
+    "WHERE question_id = ANY($1::int[]) "
+    "ORDER BY question_id, created_at, id"
+)
+
+RAW_SELECT_ANSWERS_BY_QUESTION = (
+    "SELECT id, question_id, user_id, text, created_at FROM answers "
+    "WHERE question_id = $1 ORDER BY created_at, id"
+)
+
+# timestamptz в JSON Postgres пишет в TimeZone сессии (+03:00); время
+# форматируем так же, как pydantic: UTC, "Z", микросекунды только ненулевые
+_JSON_UTC_TIMESTAMP = (
+    "replace(to_char({} AT TIME ZONE 'UTC', "
+    "'YYYY-MM-DD\"T\"HH24:MI:SS.US\"Z\"'), '.000000Z', 'Z')"
+)
+
+# Весь QuestionWithAnswersRead одним запросом: ключи в том же порядке, что и
+# поля схем, ответы упорядочены так же, как в ORM-связи. ::text — чтобы
+# json-кодек, который SQLAlchemy вешает на соединение, не парсил документ.
+RAW_SELECT_QUESTION_JSON = f"""
+SELECT json_build_object(
+    'text', q.text,
+    'id', q.id,
+    'created_at', {_JSON_UTC_TIMESTAMP.format("q.created_at")},
+    'answers', COALESCE(
+        (
+            SELECT json_agg(
+                json_build_object(
+                    'user_id', a.user_id,
+                    'text', a.text,
+                    'id', a.id,
+                    'question_id', a.question_id,
+                    'created_at', {_JSON_UTC_TIMESTAMP.format("a.created_at")}
+                )
+                ORDER BY a.created_at, a.id
+            )
+            FROM answers a
+            WHERE a.question_id = q.id
+        ),
+        '[]'::json
+    )
+)::text
+FROM questions q
+WHERE q.id = $1
+"""
+
+
+def _pick(row, fields: tuple[str, ...]) -> dict:
+    # Ключи в порядке запроса; служебный id (если не запрошен) отбрасывается
+    return {name: row[name] for name in fields if name != "answers"}
+
+
+@dataclass
+class StatementCacheStats:
+    """
+    Counts compiled-cache hits and misses of an engine.
+
+    SQLAlchemy marks every execution context with ``cache_hit``; the counters
+    are fed from the ``after_cursor_execute`` event.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    uncached: int = 0
+
+    def attach(self, sync_engine) -> None:
+        event.listen(sync_engine, "after_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is None:
+            return
+        if context.cache_hit == CACHE_HIT:
+            self.hits += 1
+        elif context.cache_hit == CACHE_MISS:
+            self.misses += 1
+        else:
+            self.uncached += 1
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses + self.uncached
+        return self.hits / total if total else 0.0
+
 
 class Database:
+    # Курсор ленты изменений — (txid, seq)
+    change_cursor_size = 2
+
     def __init__(
             self,
             db_config: DbConfig | None,
             echo=True,
             pool_size=5,
             max_overflow=10,
+            question_cache: ReadCache | None = None,
     ):
         self.db_config = db_config
         self.engine = create_async_engine(
@@ -32,6 +436,45 @@ class Database:
             max_overflow=max_overflow,
         )
         self.session_maker: async_sessionmaker = async_sessionmaker(self.engine)
+        self.fast_reads = bool(getattr(db_config, "fast_reads", False))
+        self.cache_stats = StatementCacheStats()
+        self.cache_stats.attach(self.engine.sync_engine)
+        # Кэш документов get_question (dict с ответами); None — без кэша
+        self.question_cache = question_cache
+
+    def statement_cache_stats(self) -> dict:
+        """
+        Snapshot of the compiled statement cache: hit/miss counters and the
+        current number of entries in the engine's LRU cache.
+        """
+        compiled_cache = self.engine.sync_engine._compiled_cache
+        return {
+            "hits": self.cache_stats.hits,
+            "misses": self.cache_stats.misses,
+            "uncached": self.cache_stats.uncached,
+            "hit_ratio": self.cache_stats.hit_ratio,
+            "size": len(compiled_cache) if compiled_cache is not None else 0,
+        }
+
+    @asynccontextmanager
+    async def raw_connection(self) -> AsyncIterator["asyncpg.Connection"]:
+        """
+        Borrows a pooled connection and yields the asyncpg connection under it.
+
+        The connection goes back to the engine pool on exit, so the pool size
+        and reset-on-return behaviour stay the same as for ORM sessions.
+        """
+        async with self.engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            yield raw.driver_connection
+
+    @property
+    def dsns(self) -> list[str]:
+        # Базы, в которых пишутся ответы (LISTEN фида ответов)
+        return [self.db_config.dsn]
+
+    async def close(self) -> None:
+        await self.engine.dispose()
 
     async def drop_tables(self):
         async with self.engine.begin() as conn:
@@ -40,6 +483,47 @@ class Database:
     async def create_tables(self):
         async with self.engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            await ensure_answer_partitions(conn)
+
+    async def ensure_answer_partitions(
+            self, months_ahead: int = 3, since: datetime | None = None
+    ) -> list[str]:
+        """
+        Makes sure the ``answers`` partitions for the current month and the
+        next ``months_ahead`` months (and, with ``since``, every month from
+        ``since`` on) exist. Returns the created names.
+        """
+        async with self.engine.begin() as conn:
+            return await ensure_answer_partitions(conn, months_ahead, since=since)
+
+    async def archive_answer_partitions(
+            self,
+            before: date | datetime,
+            schema: str = "archive",
+            drop: bool = False,
+    ) -> list[str]:
+        """
+        Detaches the ``answers`` partitions that end on or before ``before``
+        and moves them to ``schema`` (or drops them). Returns their names.
+        """
+        async with self.engine.begin() as conn:
+            return await archive_answer_partitions(conn, before, schema, drop)
+
+    @staticmethod
+    async def _apply_deadline(session: "AsyncSession") -> None:
+        """
+        Bounds the session's transaction by the current request deadline
+        with a server-side ``statement_timeout``. A no-op without a deadline.
+
+        The deadline itself is enforced by cancelling the request task (the
+        driver then cancels the running statement); this only covers the
+        case where the cancel request never reaches the server.
+        """
+        timeout = remaining()
+        if timeout is None:
+            return
+        timeout_ms = ceil(timeout * 1000) + STATEMENT_TIMEOUT_SLACK_MS
+        await session.execute(SET_STATEMENT_TIMEOUT, {"timeout": f"{timeout_ms}ms"})
 
     # ---------- ANSWERS ----------
 
@@ -48,75 +532,413 @@ class Database:
     ) -> AnswerOrm:
         async with self.session_maker() as session:  # type: AsyncSession
             async with session.begin():
-                stmt = (
-                    insert(AnswerOrm)
-                    .values(question_id=question_id, user_id=data.user_id, text=data.text)
-                    .returning(AnswerOrm.user_id,
-                               AnswerOrm.text,
-                               AnswerOrm.id,
-                               AnswerOrm.question_id,
-                               AnswerOrm.created_at)
+                params = {
+                    "question_id": question_id,
+                    "user_id": data.user_id,
+                    "text": data.text,
+                }
+                answer = (await session.execute(INSERT_ANSWER, params)).mappings().one()
+                await self._record_change(
+                    session, "answer", "create", answer["id"], question_id
                 )
-                answer = (await session.execute(stmt)).mappings().one()
+            self.invalidate_question(question_id)
             return answer
 
     async def get_answer_by_id(self, answer_id: int) -> AnswerOrm | None:
+        if self.fast_reads:
+            return await self.get_answer_by_id_fast(answer_id)
         async with self.session_maker() as session:  # type: AsyncSession
             # тянем и связанный question, чтобы сразу можно было отдать наружу
-            stmt = (
-                select(AnswerOrm)
-                .options(selectinload(AnswerOrm.question))
-                .where(AnswerOrm.id == answer_id)
-            )
-            res = await session.execute(stmt)
+            res = await session.execute(SELECT_ANSWER_BY_ID, {"answer_id": answer_id})
         return res.scalar_one_or_none()
 
+    async def get_answer_by_id_fast(self, answer_id: int) -> dict | None:
+        """
+        Same as ``get_answer_by_id`` but bypasses the ORM: one prepared
+        statement on the raw asyncpg connection, result is a plain dict with
+        the ``AnswerRead`` fields.
+        """
+        async with self.raw_connection() as conn:
+            row = await conn.fetchrow(
+                RAW_SELECT_ANSWER_BY_ID, answer_id, timeout=remaining()
+            )
+        return dict(row) if row is not None else None
+
+    async def get_answer_projection(
+            self, answer_id: int, fields: tuple[str, ...]
+    ) -> dict | None:
+        """
+        Answer with only ``fields`` selected from the table.
+        """
+        async with self.session_maker() as session:  # type: AsyncSession
+            res = await session.execute(
+                select_answer_projection(fields), {"answer_id": answer_id}
+            )
+            row = res.mappings().one_or_none()
+        return dict(row) if row is not None else None
+
+    async def list_answers(
+            self,
+            limit: int = 50,
+            before: tuple[datetime, int] | None = None,
+            fields: tuple[str, ...] = ANSWER_COLUMNS,
+            user_id: str | None = None,
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Answers newest first, strictly older than the ``(created_at, id)``
+        keyset cursor ``before``, optionally for one user and within
+        ``[created_after, created_before)``.
+
+        Per-user pages are served by ``ix_answers_user_id_created_at_id``;
+        when ``fields`` are limited to ``user_id``/``created_at``/``id``
+        Postgres can answer with an index-only scan. Time ranges without a
+        user go through the BRIN index on ``created_at``. Rows always carry
+        ``created_at`` and ``id`` so the caller can build the next cursor.
+        """
+        params = {"limit": limit, **_range_params(created_after, created_before)}
+        if user_id is not None:
+            params["user_id"] = user_id
+        if before is not None:
+            params["before_created_at"], params["before_id"] = before
+        stmt = select_answers(
+            fields,
+            by_user=user_id is not None,
+            after_cursor=before is not None,
+            created_after=created_after is not None,
+            created_before=created_before is not None,
+        )
+        async with self.session_maker() as session:  # type: AsyncSession
+            res = await session.execute(stmt, params)
+            return [dict(row) for row in res.mappings()]
+
+    async def list_answers_by_user(
+            self,
+            user_id: str,
+            limit: int = 50,
+            before: tuple[datetime, int] | None = None,
+            fields: tuple[str, ...] = ANSWER_COLUMNS,
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+    ) -> list[dict]:
+        """
+        A user's answers; see ``list_answers``.
+        """
+        return await self.list_answers(
+            limit=limit,
+            before=before,
+            fields=fields,
+            user_id=user_id,
+            created_after=created_after,
+            created_before=created_before,
+        )
+
     async def delete_answer_by_id(self, answer_id: int) -> bool:
         async with self.session_maker() as session:  # type: AsyncSession
             async with session.begin():
-                stmt = delete(AnswerOrm).where(AnswerOrm.id == answer_id)
-                result = await session.execute(stmt)
-                deleted = result.rowcount or 0
-            return deleted > 0
+                result = await session.execute(
+                    DELETE_ANSWER_BY_ID, {"answer_id": answer_id}
+                )
+                question_id = result.scalar_one_or_none()
+                if question_id is None:
+                    return False
+                await self._record_change(
+                    session, "answer", "delete", answer_id, question_id
+                )
+            self.invalidate_question(question_id)
+            return True
 
     # ---------- QUESTIONS ----------
 
     async def list_questions(self) -> list[QuestionOrm]:
         async with self.session_maker() as session:  # type: AsyncSession
-            stmt = (
-                select(QuestionOrm)
-                .options(selectinload(QuestionOrm.answers))
-                .order_by(QuestionOrm.created_at.desc(), QuestionOrm.id.desc())
-            )
-            res = await session.execute(stmt)
+            await self._apply_deadline(session)
+            res = await session.execute(SELECT_QUESTIONS)
             return list(res.scalars().all())
 
+    async def list_question_previews(self, preview: int) -> list[dict]:
+        """
+        Questions for list views with ``text`` cut to ``preview`` characters
+        in SQL; ``truncated`` tells whether anything was cut.
+        """
+        return await self.list_questions_projection(
+            QUESTION_PREVIEW_COLUMNS, preview=preview
+        )
+
+    async def list_questions_projection(
+            self,
+            fields: tuple[str, ...],
+            preview: int | None = None,
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Questions with only ``fields`` selected from the table. With
+        ``preview`` the text is cut in SQL and ``truncated`` may be selected;
+        ``created_after``/``created_before`` bound ``created_at`` to a
+        half-open range.
+        """
+        stmt = select_questions_projection(
+            fields,
+            preview=preview is not None,
+            created_after=created_after is not None,
+            created_before=created_before is not None,
+        )
+        params = _range_params(created_after, created_before)
+        if preview is not None:
+            params.update(preview=preview, preview_probe=preview + 1)
+        async with self.session_maker() as session:  # type: AsyncSession
+            await self._apply_deadline(session)
+            res = await session.execute(stmt, params)
+            return [_pick(row, fields) for row in res.mappings()]
+
     async def create_question(self, data: "QuestionCreate") -> QuestionOrm:
         async with self.session_maker() as session:  # type: AsyncSession
             async with session.begin():
-                stmt = (
-                    insert(QuestionOrm)
-                    .values(text=data.text)
-                    .returning(QuestionOrm.id, QuestionOrm.text, QuestionOrm.created_at)
+                question = (
+                    await session.execute(INSERT_QUESTION, {"text": data.text})
+                ).mappings().one()
+                await self._record_change(
+                    session, "question", "create", question["id"], question["id"]
                 )
-
-                question = (await session.execute(stmt)).mappings().one()
                 return question
 
     async def get_question(self, question_id: int) -> QuestionOrm | None:
+        if self.question_cache is not None:
+            return await self.get_question_cached(question_id)
+        if self.fast_reads:
+            return await self.get_question_fast(question_id)
+        return await self._get_question_orm(question_id)
+
+    async def _get_question_orm(self, question_id: int) -> QuestionOrm | None:
         async with self.session_maker() as session:  # type: AsyncSession
-            stmt = (
-                select(QuestionOrm)
-                .options(selectinload(QuestionOrm.answers))
-                .where(QuestionOrm.id == question_id)
+            await self._apply_deadline(session)
+            res = await session.execute(
+                SELECT_QUESTION_BY_ID, {"question_id": question_id}
             )
-            res = await session.execute(stmt)
             return res.scalar_one_or_none()
 
+    async def get_question_fast(self, question_id: int) -> dict | None:
+        """
+        Same as ``get_question`` but bypasses the ORM: returns a plain dict
+        with the ``QuestionWithAnswersRead`` fields, answers ordered by
+        ``created_at``.
+        """
+        async with self.raw_connection() as conn:
+            row = await conn.fetchrow(
+                RAW_SELECT_QUESTION_BY_ID, question_id, timeout=remaining()
+            )
+            if row is None:
+                return None
+            answers = await conn.fetch(
+                RAW_SELECT_ANSWERS_BY_QUESTION, question_id, timeout=remaining()
+            )
+        question = dict(row)
+        question["answers"] = [dict(answer) for answer in answers]
+        return question
+
+    async def get_question_cached(self, question_id: int) -> dict | None:
+        """
+        ``get_question`` behind the in-process question cache. Misses are
+        loaded as ``fast_reads`` says; either way the cache holds dicts
+        shaped like ``get_question_fast`` results.
+        """
+        cached = self.question_cache.get(question_id)
+        if cached is not None:
+            return cached
+        token = self.question_cache.token()
+        if self.fast_reads:
+            question = await self.get_question_fast(question_id)
+        else:
+            question = await self._get_question_orm(question_id)
+            if question is not None:
+                question = trusted.question_with_answers_read(question)
+        if question is not None:
+            self.question_cache.put(question_id, question, token)
+        return question
+
+    def invalidate_question(self, question_id: int) -> None:
+        if self.question_cache is not None:
+            self.question_cache.invalidate(question_id)
+
+    def invalidate_questions(self) -> None:
+        if self.question_cache is not None:
+            self.question_cache.clear()
+
+    async def warm_question_cache(self, limit: int, batch_size: int = 100) -> int:
+        """
+        Loads the ``limit`` most recent questions with their answers into the
+        question cache, ``batch_size`` questions per round trip. The
+        connection goes back to the pool between batches, so the warm-up
+        never holds more than one of them.
+
+        Returns:
+            Number of questions cached.
+        """
+        if self.question_cache is None or limit <= 0:
+            return 0
+        async with self.raw_connection() as conn:
+            ids = [
+                row["id"]
+                for row in await conn.fetch(RAW_SELECT_RECENT_QUESTION_IDS, limit)
+            ]
+        cached = 0
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            token = self.question_cache.token()
+            async with self.raw_connection() as conn:
+                rows = await conn.fetch(RAW_SELECT_QUESTIONS_BY_IDS, batch)
+                if not rows:
+                    continue
+                answers = await conn.fetch(RAW_SELECT_ANSWERS_BY_QUESTIONS, batch)
+            questions = {row["id"]: {**dict(row), "answers": []} for row in rows}
+            for answer in answers:
+                questions[answer["question_id"]]["answers"].append(dict(answer))
+            for question_id, question in questions.items():
+                cached += self.question_cache.put(question_id, question, token)
+        return cached
+
+    async def get_question_projection(
+            self, question_id: int, fields: tuple[str, ...]
+    ) -> dict | None:
+        """
+        Question with only ``fields`` selected; answers are queried only when
+        ``answers`` is among the fields.
+        """
+        async with self.session_maker() as session:  # type: AsyncSession
+            await self._apply_deadline(session)
+            res = await session.execute(
+                select_question_projection(fields), {"question_id": question_id}
+            )
+            row = res.mappings().one_or_none()
+            if row is None:
+                return None
+            question = _pick(row, fields)
+            if "answers" in fields:
+                answers = await session.execute(
+                    SELECT_ANSWERS_BY_QUESTION, {"question_id": question_id}
+                )
+                question["answers"] = [dict(answer) for answer in answers.mappings()]
+            return question
+
+    async def get_question_json(self, question_id: int) -> bytes | None:
+        """
+        Question with its answers rendered by Postgres as a ready JSON
+        document (``QuestionWithAnswersRead`` shape). No ORM hydration and no
+        Python-side serialization: the bytes go to the client as is.
+        """
+        async with self.raw_connection() as conn:
+            document = await conn.fetchval(
+                RAW_SELECT_QUESTION_JSON, question_id, timeout=remaining()
+            )
+        return document.encode() if document is not None else None
+
     async def delete_question_by_id(self, question_id: int) -> bool:
         async with self.session_maker() as session:  # type: AsyncSession
             async with session.begin():
-                stmt = delete(QuestionOrm).where(QuestionOrm.id == question_id)
-                result = await session.execute(stmt)
-                deleted = result.rowcount or 0
-            return deleted > 0
+                result = await session.execute(
+                    DELETE_QUESTION_BY_ID, {"question_id": question_id}
+                )
+                if result.scalar_one_or_none() is None:
+                    return False
+                # Ответы удаляются каскадом; отдельных tombstone для них нет —
+                # удаление вопроса означает удаление всех его ответов.
+                await self._record_change(
+                    session, "question", "delete", question_id, question_id
+                )
+            self.invalidate_question(question_id)
+            return True
+
+    # ---------- CHANGES ----------
+
+    @staticmethod
+    async def _record_change(
+            session: "AsyncSession",
+            entity: str,
+            op: str,
+            entity_id: int,
+            question_id: int,
+    ) -> None:
+        await session.execute(
+            INSERT_CHANGE,
+            {
+                "entity": entity,
+                "op": op,
+                "entity_id": entity_id,
+                "question_id": question_id,
+            },
+        )
+        # Доставится слушателям только после COMMIT
+        payload = json.dumps(
+            {"entity": entity, "op": op, "id": entity_id, "question_id": question_id}
+        )
+        await session.execute(NOTIFY_CHANGE, {"payload": payload})
+
+    async def list_changes(
+            self, after: tuple[int, int] | None = None, limit: int = 100
+    ) -> list[dict]:
+        """
+        Changes committed after the ``(txid, seq)`` position, oldest first.
+
+        Only transactions older than every still-running one are returned,
+        so a change that commits later always sorts after the cursor. The
+        flip side: one long transaction holds back everything committed
+        after it started, see ``changes_lag``.
+
+        Raises ``ChangesPruned`` when ``after`` is older than the newest
+        pruned change.
+        """
+        async with self.session_maker() as session:  # type: AsyncSession
+            if after is not None:
+                pruned = (await session.execute(SELECT_CHANGES_PRUNED)).one_or_none()
+                if pruned is not None and tuple(after) < tuple(pruned):
+                    raise ChangesPruned(f"changes up to {tuple(pruned)} were pruned")
+            if after is None:
+                res = await session.execute(SELECT_CHANGES, {"limit": limit})
+            else:
+                res = await session.execute(
+                    SELECT_CHANGES_AFTER,
+                    {"after_txid": after[0], "after_seq": after[1], "limit": limit},
+                )
+            return [dict(row) for row in res.mappings()]
+
+    async def pruned_changes_position(self) -> tuple[int, int]:
+        """
+        Position of the newest pruned change, ``(0, 0)`` if nothing was
+        pruned yet. Reading from it misses nothing that is still kept.
+        """
+        async with self.session_maker() as session:  # type: AsyncSession
+            pruned = (await session.execute(SELECT_CHANGES_PRUNED)).one_or_none()
+            return (0, 0) if pruned is None else tuple(pruned)
+
+    async def changes_lag(self) -> dict:
+        async with self.session_maker() as session:  # type: AsyncSession
+            res = await session.execute(SELECT_CHANGES_LAG)
+            return dict(res.mappings().one())
+
+    async def prune_changes(self, before: datetime, batch_size: int = 10_000) -> int:
+        """
+        Deletes changes recorded before ``before``, ``batch_size`` rows per
+        transaction, and moves the prune watermark past them: ``list_changes``
+        refuses cursors that point into the deleted range.
+
+        Returns:
+            Number of deleted changes.
+        """
+        deleted = 0
+        while True:
+            async with self.engine.begin() as conn:
+                rows = (
+                    await conn.execute(
+                        DELETE_EXPIRED_CHANGES, {"before": before, "batch": batch_size}
+                    )
+                ).all()
+                if rows:
+                    txid, seq = max(tuple(row) for row in rows)
+                    await conn.execute(
+                        UPSERT_CHANGES_PRUNED, {"txid": txid, "seq": seq}
+                    )
+            deleted += len(rows)
+            if len(rows) < batch_size:
+                return deleted
@@ -0,0 +1,356 @@
+"""
+Storage engine that keeps everything in process memory.
+
+Rows live in dicts keyed by id; every ordering the API pages through is a
+sorted list of ``(created_at, id)`` keys maintained with ``bisect``:
+
+* all questions (``GET /questions``, newest first);
+* all answers and each user's answers (keyset pages over ``(created_at, id)``);
+* each question's answers (``GET /questions/{id}``, oldest first).
+
+Lookups by id are O(1), a page of ``limit`` rows costs O(log n + limit).
+Writes append to the lists (``created_at`` comes from the clock, so a new key
+almost always sorts last); deletes are O(n) memmoves, which stays cheap at
+the sizes one process holds.
+
+Nothing is shared between processes or survives a restart, and there is no
+loader: a memory-backed process always starts empty. Meant for tests, local
+development and single-worker deployments. No method awaits while it
+touches the indexes, so every call is atomic for the event loop.
+"""
+
+from bisect import bisect_left, insort
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from pydantic_core import to_json
+from sqlalchemy.exc import IntegrityError
+
+from app.db.database import ANSWER_COLUMNS, QUESTION_PREVIEW_COLUMNS
+from app.db.storage import ChangesPruned
+from app.schemas import trusted
+
+if TYPE_CHECKING:
+    from app.schemas.answer import AnswerCreate
+    from app.schemas.question import QuestionCreate
+
+Key = tuple[datetime, int]
+
+
+def _remove(keys: list[Key], key: Key) -> None:
+    index = bisect_left(keys, key)
+    if index < len(keys) and keys[index] == key:
+        del keys[index]
+
+
+def _newest_first(
+        keys: list[Key],
+        before: Key | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+) -> Iterator[Key]:
+    # Ключи строго меньше курсора и внутри [created_after, created_before),
+    # от новых к старым
+    end = len(keys)
+    if before is not None:
+        end = bisect_left(keys, before)
+    if created_before is not None:
+        # (t,) меньше любого (t, id): индекс первого ключа с created_at >= t
+        end = min(end, bisect_left(keys, (created_before,)))
+    start = 0
+    if created_after is not None:
+        start = bisect_left(keys, (created_after,))
+    for index in range(end - 1, start - 1, -1):
+        yield keys[index]
+
+
+class MemoryDatabase:
+    change_cursor_size = 2
+
+    def __init__(self, clock=lambda: datetime.now(UTC)):
+        self.clock = clock
+        self._questions: dict[int, dict] = {}
+        self._answers: dict[int, dict] = {}
+        # Упорядоченные ключи (created_at, id)
+        self._question_keys: list[Key] = []
+        self._answer_keys: list[Key] = []
+        self._answer_keys_by_question: dict[int, list[Key]] = {}
+        self._answer_keys_by_user: dict[str, list[Key]] = {}
+        self._changes: list[dict] = []
+        # Сколько изменений удалено из начала ленты (prune_changes) и
+        # позиция последнего из них
+        self._pruned_changes = 0
+        self._pruned_position: tuple[int, int] | None = None
+        self._last_question_id = 0
+        self._last_answer_id = 0
+
+    async def create_tables(self) -> None:
+        pass
+
+    async def drop_tables(self) -> None:
+        self.__init__(clock=self.clock)
+
+    async def close(self) -> None:
+        pass
+
+    # ---------- ANSWERS ----------
+
+    async def create_answer_for_question(
+            self, question_id: int, data: "AnswerCreate"
+    ) -> dict:
+        if question_id not in self._questions:
+            # Как нарушение внешнего ключа в Postgres
+            raise IntegrityError(
+                "INSERT INTO answers", {"question_id": question_id}, None
+            )
+        self._last_answer_id += 1
+        answer = {
+            "user_id": data.user_id,
+            "text": data.text,
+            "id": self._last_answer_id,
+            "question_id": question_id,
+            "created_at": self.clock(),
+        }
+        self._answers[answer["id"]] = answer
+        key = (answer["created_at"], answer["id"])
+        insort(self._answer_keys, key)
+        insort(self._answer_keys_by_question[question_id], key)
+        insort(self._answer_keys_by_user.setdefault(data.user_id, []), key)
+        self._record_change("answer", "create", answer["id"], question_id)
+        return dict(answer)
+
+    async def get_answer_by_id(self, answer_id: int) -> dict | None:
+        answer = self._answers.get(answer_id)
+        return dict(answer) if answer is not None else None
+
+    async def get_answer_projection(
+            self, answer_id: int, fields: tuple[str, ...]
+    ) -> dict | None:
+        answer = self._answers.get(answer_id)
+        if answer is None:
+            return None
+        return {name: answer[name] for name in fields}
+
+    async def list_answers(
+            self,
+            limit: int = 50,
+            before: Key | None = None,
+            fields: tuple[str, ...] = ANSWER_COLUMNS,
+            user_id: str | None = None,
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Answers newest first, strictly older than the ``(created_at, id)``
+        keyset cursor ``before``; same contract as ``Database.list_answers``.
+        """
+        if user_id is not None:
+            keys = self._answer_keys_by_user.get(user_id, [])
+        else:
+            keys = self._answer_keys
+        # created_at и id нужны для курсора, даже если их не запросили
+        names = [*fields, *(n for n in ("created_at", "id") if n not in fields)]
+        rows = []
+        for _, answer_id in _newest_first(keys, before, created_after, created_before):
+            if len(rows) >= limit:
+                break
+            answer = self._answers[answer_id]
+            rows.append({name: answer[name] for name in names})
+        return rows
+
+    async def list_answers_by_user(
+            self,
+            user_id: str,
+            limit: int = 50,
+            before: Key | None = None,
+            fields: tuple[str, ...] = ANSWER_COLUMNS,
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+    ) -> list[dict]:
+        """
+        A user's answers; see ``list_answers``.
+        """
+        return await self.list_answers(
+            limit=limit,
+            before=before,
+            fields=fields,
+            user_id=user_id,
+            created_after=created_after,
+            created_before=created_before,
+        )
+
+    async def delete_answer_by_id(self, answer_id: int) -> bool:
+        answer = self._answers.get(answer_id)
+        if answer is None:
+            return False
+        self._drop_answer(answer)
+        self._record_change("answer", "delete", answer_id, answer["question_id"])
+        return True
+
+    def _drop_answer(self, answer: dict) -> None:
+        del self._answers[answer["id"]]
+        key = (answer["created_at"], answer["id"])
+        _remove(self._answer_keys, key)
+        _remove(self._answer_keys_by_question[answer["question_id"]], key)
+        user_keys = self._answer_keys_by_user[answer["user_id"]]
+        _remove(user_keys, key)
+        if not user_keys:
+            del self._answer_keys_by_user[answer["user_id"]]
+
+    # ---------- QUESTIONS ----------
+
+    async def list_questions(self) -> list[dict]:
+        return [
+            dict(self._questions[question_id])
+            for _, question_id in _newest_first(self._question_keys)
+        ]
+
+    async def list_question_previews(self, preview: int) -> list[dict]:
+        return await self.list_questions_projection(
+            QUESTION_PREVIEW_COLUMNS, preview=preview
+        )
+
+    async def list_questions_projection(
+            self,
+            fields: tuple[str, ...],
+            preview: int | None = None,
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+    ) -> list[dict]:
+        """
+        Questions with only ``fields``, newest first; same contract as
+        ``Database.list_questions_projection``.
+        """
+        rows = []
+        keys = _newest_first(
+            self._question_keys,
+            created_after=created_after,
+            created_before=created_before,
+        )
+        for _, question_id in keys:
+            question = self._questions[question_id]
+            row = {}
+            for name in fields:
+                if name == "text" and preview is not None:
+                    row[name] = question["text"][:preview]
+                elif name == "truncated":
+                    row[name] = len(question["text"]) > preview
+                elif name != "answers":
+                    row[name] = question[name]
+            rows.append(row)
+        return rows
+
+    async def create_question(self, data: "QuestionCreate") -> dict:
+        self._last_question_id += 1
+        question = {
+            "id": self._last_question_id,
+            "text": data.text,
+            "created_at": self.clock(),
+        }
+        self._questions[question["id"]] = question
+        insort(self._question_keys, (question["created_at"], question["id"]))
+        self._answer_keys_by_question[question["id"]] = []
+        self._record_change("question", "create", question["id"], question["id"])
+        return dict(question)
+
+    def _question_answers(self, question_id: int) -> list[dict]:
+        # Ответы по (created_at, id), как в ORM-связи
+        return [
+            dict(self._answers[answer_id])
+            for _, answer_id in self._answer_keys_by_question[question_id]
+        ]
+
+    async def get_question(self, question_id: int) -> dict | None:
+        question = self._questions.get(question_id)
+        if question is None:
+            return None
+        return {**question, "answers": self._question_answers(question_id)}
+
+    async def get_question_projection(
+            self, question_id: int, fields: tuple[str, ...]
+    ) -> dict | None:
+        question = self._questions.get(question_id)
+        if question is None:
+            return None
+        row = {name: question[name] for name in fields if name != "answers"}
+        if "answers" in fields:
+            row["answers"] = self._question_answers(question_id)
+        return row
+
+    async def get_question_json(self, question_id: int) -> bytes | None:
+        question = await self.get_question(question_id)
+        if question is None:
+            return None
+        return to_json(trusted.question_with_answers_read(question))
+
+    async def delete_question_by_id(self, question_id: int) -> bool:
+        question = self._questions.pop(question_id, None)
+        if question is None:
+            return False
+        _remove(self._question_keys, (question["created_at"], question_id))
+        # Каскад, как ON DELETE CASCADE; tombstone только у вопроса
+        for _, answer_id in list(self._answer_keys_by_question[question_id]):
+            self._drop_answer(self._answers[answer_id])
+        del self._answer_keys_by_question[question_id]
+        self._record_change("question", "delete", question_id, question_id)
+        return True
+
+    # ---------- CHANGES ----------
+
+    def _record_change(
+            self, entity: str, op: str, entity_id: int, question_id: int
+    ) -> None:
+        seq = self._pruned_changes + len(self._changes) + 1
+        self._changes.append(
+            {
+                "seq": seq,
+                # Каждое изменение — своя «транзакция»: txid растёт вместе с seq
+                "txid": seq,
+                "entity": entity,
+                "op": op,
+                "entity_id": entity_id,
+                "question_id": question_id,
+                "created_at": self.clock(),
+            }
+        )
+
+    async def list_changes(
+            self, after: tuple[int, int] | None = None, limit: int = 100
+    ) -> list[dict]:
+        """
+        Changes after the ``(txid, seq)`` position, oldest first. Raises
+        ``ChangesPruned`` when ``after`` points into the pruned head.
+        """
+        if (
+            after is not None
+            and self._pruned_position is not None
+            and tuple(after) < self._pruned_position
+        ):
+            raise ChangesPruned(f"changes up to {self._pruned_position} were pruned")
+        # seq начинается с 1 и идёт без пропусков: позиция в списке — seq
+        # за вычетом удалённого начала
+        start = 0 if after is None else max(after[1] - self._pruned_changes, 0)
+        return [dict(change) for change in self._changes[start:start + limit]]
+
+    async def prune_changes(self, before: datetime, batch_size: int = 10_000) -> int:
+        """
+        Deletes changes recorded before ``before``. ``batch_size`` is accepted
+        for parity with ``Database``: the list is cut in one go.
+        """
+        # created_at идёт от часов в порядке записи: устаревшие — это начало
+        count = 0
+        for change in self._changes:
+            if change["created_at"] >= before:
+                break
+            count += 1
+        if count:
+            last = self._changes[count - 1]
+            self._pruned_position = (last["txid"], last["seq"])
+        del self._changes[:count]
+        self._pruned_changes += count
+        return count
+
+    async def changes_lag(self) -> dict:
+        # Изменение видно сразу: параллельных транзакций здесь нет
+        return {"held_back": 0, "oldest_held_back": None}
@@ -1,6 +1,16 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+    text,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -11,7 +21,9 @@ class Base(DeclarativeBase):
 class AnswerOrm(Base):
     __tablename__ = "answers"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Первичный ключ (id, created_at): у партиционированной таблицы ключ
+    # обязан включать ключ партиционирования. Уникальность id даёт sequence.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
     question_id: Mapped[int] = mapped_column(
         ForeignKey("questions.id", ondelete="CASCADE"),
@@ -20,27 +32,99 @@ class AnswerOrm(Base):
     )
 
     user_id: Mapped[str] = mapped_column(String(200), nullable=False)
-    text: Mapped[str] = mapped_column(String(10_000), nullable=False)
+    # До 10 000 символов: грузится только там, где явно нужен (undefer)
+    text: Mapped[str] = mapped_column(
+        String(10_000), nullable=False, deferred=True, deferred_raiseload=True
+    )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now()
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
     )
 
     # связи
     question: Mapped["QuestionOrm"] = relationship(back_populates="answers")
 
+    __table_args__ = (
+        # Ответы пользователя с keyset-пагинацией; покрывает (user_id,
+        # created_at, id), так что узкие выборки идут index-only scan
+        Index("ix_answers_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Фильтры по времени: строки пишутся по возрастанию created_at, так что
+        # BRIN на пару порядков меньше btree и почти не стоит ничего на вставке
+        Index("ix_answers_created_at_brin", "created_at", postgresql_using="brin"),
+        # Помесячные партиции по created_at (см. app/db/partitions.py)
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
 
 class QuestionOrm(Base):
     __tablename__ = "questions"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    text: Mapped[str] = mapped_column(String(10_000), nullable=False)
+    # До 10 000 символов: грузится только там, где явно нужен (undefer)
+    text: Mapped[str] = mapped_column(
+        String(10_000), nullable=False, deferred=True, deferred_raiseload=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
 
+    __table_args__ = (
+        Index("ix_questions_created_at_brin", "created_at", postgresql_using="brin"),
+        # Самые новые вопросы (списки, прогрев кэша) — ORDER BY created_at DESC,
+        # id DESC LIMIT n: BRIN порядка не даёт, без btree сортируется вся таблица
+        Index("ix_questions_created_at_id", "created_at", "id"),
+    )
+
     # связи
     answers: Mapped[list["AnswerOrm"]] = relationship(
         back_populates="question",
+        order_by=lambda: (AnswerOrm.created_at, AnswerOrm.id),
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
+
+
+class ChangeOrm(Base):
+    """
+    Журнал изменений для инкрементальной синхронизации клиентов.
+
+    Строка пишется в той же транзакции, что и само изменение. ``txid`` — id
+    пишущей транзакции: лента отдаёт только строки транзакций старше самой
+    старой ещё незавершённой, поэтому курсор (txid, seq) никогда не
+    перескакивает через изменение, которое закоммитится позже.
+    """
+
+    __tablename__ = "changes"
+
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    txid: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        server_default=text("(pg_current_xact_id()::text)::bigint"),
+    )
+    # "question" | "answer"
+    entity: Mapped[str] = mapped_column(String(16), nullable=False)
+    # "create" | "delete"
+    op: Mapped[str] = mapped_column(String(16), nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    question_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (Index("ix_changes_txid_seq", "txid", "seq"),)
+
+
+class ChangesPrunedOrm(Base):
+    """
+    Отметка очистки ленты изменений (одна строка): самая старшая позиция
+    (txid, seq) среди удалённых. Курсор младше неё мог пропустить удалённые
+    изменения — такому клиенту нужна полная пересинхронизация.
+    """
+
+    __tablename__ = "changes_pruned"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, default=1)
+    txid: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    seq: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    __table_args__ = (CheckConstraint("id = 1", name="ck_changes_pruned_single"),)
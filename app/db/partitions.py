@@ -0,0 +1,253 @@
+"""
+Monthly range partitions of the ``answers`` table.
+
+``answers`` is declaratively partitioned by ``created_at``: every calendar
+month (UTC) lives in its own partition ``answers_pYYYYMM``, and rows outside
+all of them fall into ``answers_default`` so an insert never fails because
+maintenance fell behind. Partitions are created ahead of time by
+``ensure_answer_partitions`` (on startup and then periodically), old ones are
+detached and moved to an archive schema by ``archive_answer_partitions``.
+
+A detached partition keeps its own copy of the foreign key to ``questions``,
+so deleting a question still cascades into archived answers.
+
+Partitioning serves archiving and time-range scans (the ``created_at``
+filters of the answer listings), not point reads: an answer's
+``created_at`` is not bounded by its question's (imports keep the source
+timestamps), so lookups by answer id or by question carry no
+``created_at`` predicate and probe the index of every attached partition.
+That is one index lookup per month; ``PARTITION_RETENTION_MONTHS`` keeps
+the number of attached partitions bounded.
+"""
+
+import asyncio
+import logging
+import re
+from datetime import UTC, date, datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+if TYPE_CHECKING:
+    from app.core.config import PartitionConfig
+    from app.db.database import Database
+
+logger = logging.getLogger(__name__)
+
+ANSWERS_TABLE = "answers"
+DEFAULT_PARTITION = "answers_default"
+
+_PARTITION_NAME = re.compile(r"^answers_p(\d{4})(\d{2})$")
+# DDL партиций выполняет один процесс за раз; остальные воркеры ждут на
+# блокировке и потом видят уже созданные таблицы
+_ADVISORY_LOCK_ID = 7_037_001
+
+SELECT_PARTITIONS = text(
+    "SELECT c.relname FROM pg_inherits i "
+    "JOIN pg_class c ON c.oid = i.inhrelid "
+    "WHERE i.inhparent = CAST(:parent AS regclass)"
+)
+
+DEFAULT_PARTITION_SQL = (
+    f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} "
+    f"PARTITION OF {ANSWERS_TABLE} DEFAULT"
+)
+
+
+def month_start(value: date | datetime) -> date:
+    if isinstance(value, datetime):
+        value = value.astimezone(UTC) if value.tzinfo else value
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{ANSWERS_TABLE}_p{month:%Y%m}"
+
+
+def partition_month(name: str) -> date | None:
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    return date(int(match[1]), int(match[2]), 1)
+
+
+def _bound(month: date) -> str:
+    # Границы явно в UTC, иначе они зависят от TimeZone сессии
+    return f"'{month:%Y-%m-%d} 00:00:00+00'"
+
+
+def create_partition_sql(month: date) -> str:
+    month = month_start(month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF {ANSWERS_TABLE} "
+        f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(add_months(month, 1))})"
+    )
+
+
+def partition_months(first: date, last: date) -> list[date]:
+    """
+    Month starts from ``first`` to ``last`` inclusive.
+    """
+    months, month = [], month_start(first)
+    last = month_start(last)
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+async def _existing_partitions(conn: AsyncConnection) -> set[str]:
+    result = await conn.execute(SELECT_PARTITIONS, {"parent": ANSWERS_TABLE})
+    return set(result.scalars())
+
+
+async def _lock(conn: AsyncConnection) -> None:
+    await conn.execute(
+        text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_ID}
+    )
+    # DDL ниже берёт ACCESS EXCLUSIVE на answers: лучше упасть и повторить
+    # в следующий раз, чем выстроить за собой очередь из всех запросов
+    await conn.execute(text("SET LOCAL lock_timeout = '5s'"))
+
+
+async def _split_default(conn: AsyncConnection, month: date) -> None:
+    # В DEFAULT уже есть строки этого месяца — CREATE ... PARTITION OF упадёт.
+    # Отцепляем DEFAULT, переносим строки в новую партицию и цепляем обратно.
+    start, end = _bound(month), _bound(add_months(month, 1))
+    predicate = f"created_at >= {start} AND created_at < {end}"
+    await conn.execute(
+        text(f"ALTER TABLE {ANSWERS_TABLE} DETACH PARTITION {DEFAULT_PARTITION}")
+    )
+    await conn.execute(text(create_partition_sql(month)))
+    await conn.execute(
+        text(
+            f"INSERT INTO {partition_name(month)} "
+            f"SELECT * FROM {DEFAULT_PARTITION} WHERE {predicate}"
+        )
+    )
+    await conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {predicate}"))
+    await conn.execute(
+        text(
+            f"ALTER TABLE {ANSWERS_TABLE} "
+            f"ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"
+        )
+    )
+
+
+async def ensure_answer_partitions(
+        conn: AsyncConnection,
+        months_ahead: int = 3,
+        now: datetime | None = None,
+        since: datetime | None = None,
+) -> list[str]:
+    """
+    Creates the partitions for the current month and ``months_ahead`` months
+    after it, plus the DEFAULT partition. Must run inside a transaction.
+    With ``since`` (e.g. for imported history) every month from ``since`` on
+    gets a partition as well.
+
+    Rows already sitting in the DEFAULT partition for a month that gets its
+    own partition are moved there.
+
+    Returns:
+        Names of the partitions that were created.
+    """
+    current = month_start(now or datetime.now(UTC))
+    first = min(current, month_start(since)) if since is not None else current
+    await _lock(conn)
+    existing = await _existing_partitions(conn)
+    created = []
+    if DEFAULT_PARTITION not in existing:
+        await conn.execute(text(DEFAULT_PARTITION_SQL))
+        created.append(DEFAULT_PARTITION)
+    for month in partition_months(first, add_months(current, months_ahead)):
+        name = partition_name(month)
+        if name in existing:
+            continue
+        stray = await conn.scalar(
+            text(
+                f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+                f"WHERE created_at >= {_bound(month)} "
+                f"AND created_at < {_bound(add_months(month, 1))})"
+            )
+        )
+        if stray:
+            await _split_default(conn, month)
+        else:
+            await conn.execute(text(create_partition_sql(month)))
+        created.append(name)
+    return created
+
+
+async def archive_answer_partitions(
+        conn: AsyncConnection,
+        before: date | datetime,
+        schema: str = "archive",
+        drop: bool = False,
+) -> list[str]:
+    """
+    Detaches every monthly partition that ends on or before ``before`` and
+    moves it to ``schema`` (or drops it when ``drop`` is set). Must run
+    inside a transaction.
+
+    Archived answers disappear from every query on ``answers`` but stay
+    queryable as ``<schema>.answers_pYYYYMM``.
+
+    Returns:
+        Names of the partitions that were archived.
+    """
+    cutoff = month_start(before)
+    await _lock(conn)
+    expired = sorted(
+        name
+        for name in await _existing_partitions(conn)
+        if (month := partition_month(name)) is not None
+        and add_months(month, 1) <= cutoff
+    )
+    if expired and not drop:
+        await conn.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema}"'))
+    for name in expired:
+        # С DEFAULT-партицией DETACH ... CONCURRENTLY недоступен; обычный
+        # DETACH — операция над каталогом и держит блокировку недолго
+        await conn.execute(text(f"ALTER TABLE {ANSWERS_TABLE} DETACH PARTITION {name}"))
+        if drop:
+            await conn.execute(text(f"DROP TABLE {name}"))
+        else:
+            await conn.execute(text(f'ALTER TABLE {name} SET SCHEMA "{schema}"'))
+    return expired
+
+
+async def maintain_answer_partitions(
+        db: "Database", config: "PartitionConfig"
+) -> None:
+    """
+    Background loop: keeps future partitions in place and, when retention is
+    configured, archives the expired ones. Errors are logged and retried on
+    the next round.
+    """
+    while True:
+        try:
+            created = await db.ensure_answer_partitions(config.months_ahead)
+            if created:
+                logger.info("Created answer partitions: %s", ", ".join(created))
+            if config.retention_months > 0:
+                before = add_months(
+                    month_start(datetime.now(UTC)), -config.retention_months
+                )
+                archived = await db.archive_answer_partitions(
+                    before, schema=config.archive_schema
+                )
+                if archived:
+                    logger.info(
+                        "Archived answer partitions: %s", ", ".join(archived)
+                    )
+        except Exception as e:
+            logger.exception("Answer partition maintenance failed: %s", e)
+        await asyncio.sleep(config.interval)
@@ -0,0 +1,401 @@
+"""
+Hash sharding of questions (with their answers) over several databases.
+
+Every shard is a complete database with the usual schema. A question lives
+on one shard together with all of its answers, so everything about a
+question (reads, answering, cascading delete, the change record) stays a
+single-shard transaction.
+
+Ids are globally unique and carry their shard: on shard ``k`` of ``n`` the
+``questions`` and ``answers`` id sequences are ``START WITH k + 1 INCREMENT BY
+n``, so ``(id - 1) % n == k``. Lookups by question or answer id go straight
+to one shard, no lookup table needed. New questions are placed round-robin.
+
+Listings (questions, answers, changes) query all shards concurrently and
+merge the already ordered pages.
+
+The shard count and order are part of the id encoding: they are fixed once
+the shards hold data. ``configure_shard_sequences`` refuses a shard whose
+ids do not match its position.
+"""
+
+import asyncio
+import heapq
+import itertools
+from collections.abc import Awaitable, Iterable, Mapping
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import DbConfig
+from app.db.cache import ReadCache
+from app.db.database import ANSWER_COLUMNS, Database
+from app.db.storage import ChangesPruned
+
+if TYPE_CHECKING:
+    from app.schemas.answer import AnswerCreate
+    from app.schemas.question import QuestionCreate
+
+SHARDED_TABLES = ("questions", "answers")
+
+_ADVISORY_LOCK_ID = 7_042_001
+
+SELECT_SEQUENCE = text(
+    "SELECT s.seqrelid::regclass::text AS name, s.seqincrement, s.seqstart "
+    "FROM pg_sequence s "
+    "WHERE s.seqrelid = CAST(pg_get_serial_sequence(:table, 'id') AS regclass)"
+)
+
+
+def shard_index(entity_id: int, count: int) -> int:
+    """
+    Shard of a question or answer id among ``count`` shards.
+    """
+    return (entity_id - 1) % count
+
+
+async def configure_shard_sequences(
+        conn: AsyncConnection, index: int, count: int
+) -> list[str]:
+    """
+    Makes the id sequences of shard ``index`` of ``count`` hand out only
+    ids of that shard. Idempotent; returns the names of the sequences it had
+    to change.
+
+    Raises:
+        RuntimeError: the shard already holds ids of another shard (e.g. a
+            database that was used unsharded, or a changed shard count).
+    """
+    await conn.execute(
+        text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_ID}
+    )
+    changed = []
+    for table in SHARDED_TABLES:
+        sequence = (
+            await conn.execute(SELECT_SEQUENCE, {"table": table})
+        ).mappings().one()
+        if (
+            sequence["seqincrement"] == count
+            and shard_index(sequence["seqstart"], count) == index
+        ):
+            continue
+        params = {"count": count, "index": index}
+        foreign = await conn.scalar(
+            text(
+                f"SELECT id FROM {table} "
+                f"WHERE (id - 1) % :count <> :index LIMIT 1"
+            ),
+            params,
+        )
+        if foreign is not None:
+            raise RuntimeError(
+                f"Shard {index} of {count}: {table}.id {foreign} belongs to "
+                f"shard {shard_index(foreign, count)}"
+            )
+        last_id = await conn.scalar(text(f"SELECT coalesce(max(id), 0) FROM {table}"))
+        # Первый свободный id этого шарда после уже выданных
+        start = last_id + 1 + (index - last_id) % count
+        await conn.execute(
+            text(
+                f"ALTER SEQUENCE {sequence['name']} INCREMENT BY {count} "
+                f"MINVALUE 1 START WITH {start} RESTART WITH {start}"
+            )
+        )
+        changed.append(sequence["name"])
+    return changed
+
+
+async def _scatter(calls: Iterable[Awaitable]) -> list:
+    # Все шарды параллельно; ошибка одного отменяет остальные запросы
+    async with asyncio.TaskGroup() as group:
+        tasks = [group.create_task(call) for call in calls]
+    return [task.result() for task in tasks]
+
+
+def _position(row: Any) -> tuple[datetime, int]:
+    if isinstance(row, Mapping):
+        return row["created_at"], row["id"]
+    return row.created_at, row.id
+
+
+def _newest_first(pages: list[list], limit: int | None = None) -> list:
+    # Страницы шардов уже отсортированы по (created_at, id) по убыванию
+    merged = heapq.merge(*pages, key=_position, reverse=True)
+    return list(itertools.islice(merged, limit))
+
+
+class ShardedDatabase:
+    """
+    ``Storage`` over several ``Database`` shards; see the module docstring.
+
+    The shards share one question cache (ids are globally unique).
+    """
+
+    def __init__(self, shards: list[Database]):
+        self.shards = shards
+        self.question_cache = shards[0].question_cache
+        self._placement = itertools.cycle(range(len(shards)))
+
+    @staticmethod
+    def from_config(
+            db_config: DbConfig,
+            echo: bool = False,
+            question_cache: ReadCache | None = None,
+    ) -> "ShardedDatabase":
+        return ShardedDatabase(
+            [
+                Database(db_config=config, echo=echo, question_cache=question_cache)
+                for config in db_config.shard_configs
+            ]
+        )
+
+    @property
+    def dsns(self) -> list[str]:
+        return [dsn for shard in self.shards for dsn in shard.dsns]
+
+    @property
+    def change_cursor_size(self) -> int:
+        # Позиция (txid, seq) в ленте каждого шарда
+        return 2 * len(self.shards)
+
+    def shard(self, entity_id: int) -> Database:
+        return self.shards[shard_index(entity_id, len(self.shards))]
+
+    async def configure_shards(self) -> list[str]:
+        """
+        Runs ``configure_shard_sequences`` on every shard.
+        """
+        changed = []
+        for index, shard in enumerate(self.shards):
+            async with shard.engine.begin() as conn:
+                changed += await configure_shard_sequences(
+                    conn, index, len(self.shards)
+                )
+        return changed
+
+    async def close(self) -> None:
+        await _scatter(shard.close() for shard in self.shards)
+
+    async def drop_tables(self) -> None:
+        await _scatter(shard.drop_tables() for shard in self.shards)
+
+    async def create_tables(self) -> None:
+        await _scatter(shard.create_tables() for shard in self.shards)
+        await self.configure_shards()
+
+    async def ensure_answer_partitions(
+            self, months_ahead: int = 3, since: datetime | None = None
+    ) -> list[str]:
+        created = await _scatter(
+            shard.ensure_answer_partitions(months_ahead, since=since)
+            for shard in self.shards
+        )
+        return [name for names in created for name in names]
+
+    async def archive_answer_partitions(
+            self,
+            before: date | datetime,
+            schema: str = "archive",
+            drop: bool = False,
+    ) -> list[str]:
+        archived = await _scatter(
+            shard.archive_answer_partitions(before, schema, drop)
+            for shard in self.shards
+        )
+        return [name for names in archived for name in names]
+
+    # ---------- ANSWERS ----------
+
+    async def create_answer_for_question(
+            self, question_id: int, data: "AnswerCreate"
+    ):
+        return await self.shard(question_id).create_answer_for_question(
+            question_id, data
+        )
+
+    async def get_answer_by_id(self, answer_id: int):
+        return await self.shard(answer_id).get_answer_by_id(answer_id)
+
+    async def get_answer_by_id_fast(self, answer_id: int) -> dict | None:
+        return await self.shard(answer_id).get_answer_by_id_fast(answer_id)
+
+    async def get_answer_projection(
+            self, answer_id: int, fields: tuple[str, ...]
+    ) -> dict | None:
+        return await self.shard(answer_id).get_answer_projection(answer_id, fields)
+
+    async def list_answers(
+            self,
+            limit: int = 50,
+            before: tuple[datetime, int] | None = None,
+            fields: tuple[str, ...] = ANSWER_COLUMNS,
+            user_id: str | None = None,
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+    ) -> list[dict]:
+        """
+        ``limit`` newest answers of every shard merged into one page. The
+        ``(created_at, id)`` cursor is global: ids never repeat across
+        shards.
+        """
+        pages = await _scatter(
+            shard.list_answers(
+                limit=limit,
+                before=before,
+                fields=fields,
+                user_id=user_id,
+                created_after=created_after,
+                created_before=created_before,
+            )
+            for shard in self.shards
+        )
+        return _newest_first(pages, limit)
+
+    async def list_answers_by_user(
+            self,
+            user_id: str,
+            limit: int = 50,
+            before: tuple[datetime, int] | None = None,
+            fields: tuple[str, ...] = ANSWER_COLUMNS,
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+    ) -> list[dict]:
+        return await self.list_answers(
+            limit=limit,
+            before=before,
+            fields=fields,
+            user_id=user_id,
+            created_after=created_after,
+            created_before=created_before,
+        )
+
+    async def delete_answer_by_id(self, answer_id: int) -> bool:
+        return await self.shard(answer_id).delete_answer_by_id(answer_id)
+
+    # ---------- QUESTIONS ----------
+
+    async def list_questions(self) -> list:
+        pages = await _scatter(shard.list_questions() for shard in self.shards)
+        return _newest_first(pages)
+
+    async def list_question_previews(self, preview: int) -> list[dict]:
+        pages = await _scatter(
+            shard.list_question_previews(preview) for shard in self.shards
+        )
+        return _newest_first(pages)
+
+    async def list_questions_projection(
+            self,
+            fields: tuple[str, ...],
+            preview: int | None = None,
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+    ) -> list[dict]:
+        # Для слияния нужны created_at и id, лишние потом отбрасываются
+        extra = tuple(name for name in ("created_at", "id") if name not in fields)
+        pages = await _scatter(
+            shard.list_questions_projection(
+                (*fields, *extra),
+                preview=preview,
+                created_after=created_after,
+                created_before=created_before,
+            )
+            for shard in self.shards
+        )
+        rows = _newest_first(pages)
+        if extra:
+            for row in rows:
+                for name in extra:
+                    del row[name]
+        return rows
+
+    async def create_question(self, data: "QuestionCreate"):
+        return await self.shards[next(self._placement)].create_question(data)
+
+    async def get_question(self, question_id: int):
+        return await self.shard(question_id).get_question(question_id)
+
+    async def get_question_projection(
+            self, question_id: int, fields: tuple[str, ...]
+    ) -> dict | None:
+        return await self.shard(question_id).get_question_projection(
+            question_id, fields
+        )
+
+    async def get_question_json(self, question_id: int) -> bytes | None:
+        return await self.shard(question_id).get_question_json(question_id)
+
+    def invalidate_question(self, question_id: int) -> None:
+        self.shard(question_id).invalidate_question(question_id)
+
+    def invalidate_questions(self) -> None:
+        for shard in self.shards:
+            shard.invalidate_questions()
+
+    async def warm_question_cache(self, limit: int, batch_size: int = 100) -> int:
+        # Вопросы раскладываются по кругу: у каждого шарда своя доля новых
+        share = -(-limit // len(self.shards))
+        cached = await _scatter(
+            shard.warm_question_cache(share, batch_size) for shard in self.shards
+        )
+        return sum(cached)
+
+    async def delete_question_by_id(self, question_id: int) -> bool:
+        return await self.shard(question_id).delete_question_by_id(question_id)
+
+    # ---------- CHANGES ----------
+
+    async def list_changes(
+            self, after: tuple[int, ...] | None = None, limit: int = 100
+    ) -> list[dict]:
+        """
+        Changes of all shards after the position ``after`` (a ``(txid,
+        seq)`` pair per shard), each shard's changes in its own order.
+        Every row carries the ``position`` to continue from.
+        """
+        count = len(self.shards)
+        if after is None:
+            # Шард без изменений на странице остаётся на этой позиции:
+            # она не должна указывать внутрь уже удалённой части ленты
+            positions = await _scatter(
+                shard.pruned_changes_position() for shard in self.shards
+            )
+        else:
+            positions = [tuple(after[i:i + 2]) for i in range(0, 2 * count, 2)]
+        try:
+            pages = await _scatter(
+                shard.list_changes(after=position, limit=limit)
+                for shard, position in zip(self.shards, positions)
+            )
+        except* ChangesPruned as group:
+            # Курсор устарел хотя бы для одного шарда — устарел весь
+            raise group.exceptions[0] from None
+        # Между шардами порядок — по времени изменения; внутри шарда
+        # heapq.merge сохраняет порядок ленты самого шарда
+        merged = heapq.merge(
+            *(
+                [(row["created_at"], index, n, row) for n, row in enumerate(page)]
+                for index, page in enumerate(pages)
+            )
+        )
+        rows = []
+        for _, index, _, row in itertools.islice(merged, limit):
+            positions[index] = (row["txid"], row["seq"])
+            rows.append({**row, "position": tuple(itertools.chain(*positions))})
+        return rows
+
+    async def changes_lag(self) -> dict:
+        lags = await _scatter(shard.changes_lag() for shard in self.shards)
+        oldest = [lag["oldest_held_back"] for lag in lags if lag["oldest_held_back"]]
+        return {
+            "held_back": sum(lag["held_back"] for lag in lags),
+            "oldest_held_back": min(oldest, default=None),
+        }
+
+    async def prune_changes(self, before: datetime, batch_size: int = 10_000) -> int:
+        deleted = await _scatter(
+            shard.prune_changes(before, batch_size) for shard in self.shards
+        )
+        return sum(deleted)
@@ -0,0 +1,133 @@
+"""
+Storage protocol: what the API needs from a storage engine.
+
+``Database`` (Postgres) and ``MemoryDatabase`` (process memory) implement it.
+Rows come back as dicts or ORM objects with the schema field names; the API
+reads both through ``app.schemas.trusted``. Engine-specific extras (raw
+asyncpg connections, partitions, the question cache) are not part of it.
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
+
+if TYPE_CHECKING:
+    from app.schemas.answer import AnswerCreate
+    from app.schemas.question import QuestionCreate
+
+# dict или ORM-объект с полями схемы
+Row = Any
+
+
+class ChangesPruned(Exception):
+    """
+    The change feed position is older than the pruned part of the feed:
+    changes after it may be gone, the client has to resync from scratch.
+    """
+
+
+@runtime_checkable
+class Storage(Protocol):
+    # Сколько чисел в позиции ленты изменений (см. list_changes)
+    change_cursor_size: int
+
+    async def create_tables(self) -> None: ...
+
+    async def drop_tables(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+    # ---------- ANSWERS ----------
+
+    async def create_answer_for_question(
+            self, question_id: int, data: "AnswerCreate"
+    ) -> Row:
+        """
+        Raises ``sqlalchemy.exc.IntegrityError`` when the question does not
+        exist.
+        """
+        ...
+
+    async def get_answer_by_id(self, answer_id: int) -> Row | None: ...
+
+    async def get_answer_projection(
+            self, answer_id: int, fields: tuple[str, ...]
+    ) -> dict | None: ...
+
+    async def list_answers(
+            self,
+            limit: int = 50,
+            before: tuple[datetime, int] | None = None,
+            fields: tuple[str, ...] = ...,
+            user_id: str | None = None,
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+    ) -> list[dict]: ...
+
+    async def list_answers_by_user(
+            self,
+            user_id: str,
+            limit: int = 50,
+            before: tuple[datetime, int] | None = None,
+            fields: tuple[str, ...] = ...,
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+    ) -> list[dict]: ...
+
+    async def delete_answer_by_id(self, answer_id: int) -> bool: ...
+
+    # ---------- QUESTIONS ----------
+
+    async def list_questions(self) -> list[Row]: ...
+
+    async def list_question_previews(self, preview: int) -> list[dict]: ...
+
+    async def list_questions_projection(
+            self,
+            fields: tuple[str, ...],
+            preview: int | None = None,
+            created_after: datetime | None = None,
+            created_before: datetime | None = None,
+    ) -> list[dict]: ...
+
+    async def create_question(self, data: "QuestionCreate") -> Row: ...
+
+    async def get_question(self, question_id: int) -> Row | None: ...
+
+    async def get_question_projection(
+            self, question_id: int, fields: tuple[str, ...]
+    ) -> dict | None: ...
+
+    async def get_question_json(self, question_id: int) -> bytes | None: ...
+
+    async def delete_question_by_id(self, question_id: int) -> bool: ...
+
+    # ---------- CHANGES ----------
+
+    async def list_changes(
+            self, after: tuple[int, ...] | None = None, limit: int = 100
+    ) -> list[dict]:
+        """
+        Changes after the position ``after`` (``change_cursor_size`` ints),
+        oldest first. A row's ``position``, or ``(txid, seq)`` when it has
+        none, is where the next call continues.
+
+        Raises ``ChangesPruned`` when changes after ``after`` were deleted
+        by ``prune_changes``.
+        """
+        ...
+
+    async def prune_changes(
+            self, before: datetime, batch_size: int = 10_000
+    ) -> int:
+        """
+        Deletes changes recorded before ``before``; returns how many.
+        """
+        ...
+
+    async def changes_lag(self) -> dict:
+        """
+        ``held_back``: committed changes ``list_changes`` does not return yet
+        because an older transaction is still running; ``oldest_held_back``:
+        ``created_at`` of the oldest of them (``None`` when there are none).
+        """
+        ...
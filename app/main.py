@@ -1,36 +1,152 @@
+import asyncio
+import contextlib
 import logging
 from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
 
 import uvicorn
 from fastapi import FastAPI
 
 from app.api import api_router
-from app.core.config import Config, load_config
+from app.api.middleware import RequestIdMiddleware
+from app.core.config import CacheConfig, ChangesConfig, Config, load_config
 from app.core.logging import setup_logging
+from app.db.answer_feed import AnswerFeed
+from app.db.cache import ReadCache
 from app.db.database import Database
+from app.db.memory import MemoryDatabase
+from app.db.partitions import maintain_answer_partitions
+from app.db.sharding import ShardedDatabase
+from app.db.storage import Storage
 
 logger = logging.getLogger(__name__)
 
 
+async def warm_up_cache(db: Database, config: CacheConfig) -> None:
+    """
+    Preloads the most recent questions into the question cache, giving up
+    after ``config.warmup_budget`` seconds.
+    """
+    try:
+        async with asyncio.timeout(config.warmup_budget):
+            cached = await db.warm_question_cache(config.warmup_size)
+    except TimeoutError:
+        logger.warning(
+            "Cache warm-up stopped after %.1fs: %d questions cached",
+            config.warmup_budget,
+            len(db.question_cache),
+        )
+    except Exception as e:
+        logger.exception("Cache warm-up failed: %s", e)
+    else:
+        logger.info("Cache warm-up done: %d questions cached", cached)
+
+
+async def maintain_changes(db: Storage, config: ChangesConfig) -> None:
+    """
+    Background loop: deletes changes older than ``config.retention_days``.
+    Errors are logged and retried on the next round.
+    """
+    while True:
+        try:
+            before = datetime.now(UTC) - timedelta(days=config.retention_days)
+            deleted = await db.prune_changes(before)
+            if deleted:
+                logger.info("Pruned %d changes older than %s", deleted, before)
+        except Exception as e:
+            logger.exception("Change pruning failed: %s", e)
+        await asyncio.sleep(config.interval)
+
+
+async def _cancel(task: asyncio.Task) -> None:
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    setup_logging()
-    logger.info("🚀 Запускаем Q&A API...")
-    # startup
-    config: Config = load_config(path=".env")
-    db = Database(db_config=config.db, echo=False)
+    # Остановка — в обратном порядке запуска; если запуск упал на полпути,
+    # закрывается то, что успело подняться (и логгер последним)
+    async with contextlib.AsyncExitStack() as stack:
+        # startup
+        config: Config = load_config(path=".env")
+        log_listener = setup_logging(config.log)
+        stack.callback(log_listener.stop)
+        logger.info("🚀 Запускаем Q&A API...")
+        # Фид, партиции и кэш держатся на Postgres: у памяти их нет
+        postgres = config.storage.backend == "postgres"
+        question_cache = None
+        if postgres and config.cache.enabled and not config.feed.enabled:
+            # Без фида записи других воркеров до кэша не доходят
+            logger.warning("Question cache needs FEED_ENABLED, leaving it off")
+        elif postgres and config.cache.enabled:
+            question_cache = ReadCache(
+                max_size=config.cache.max_size, ttl=config.cache.ttl
+            )
+        db: Storage
+        if not postgres:
+            db = MemoryDatabase()
+        elif config.db.shards:
+            db = ShardedDatabase.from_config(
+                config.db, echo=False, question_cache=question_cache
+            )
+        else:
+            db = Database(
+                db_config=config.db, echo=False, question_cache=question_cache
+            )
+        stack.push_async_callback(db.close)
+        if isinstance(db, ShardedDatabase):
+            # Последовательности id шардов: каждая выдаёт только свои id
+            await db.configure_shards()
+        logger.info(
+            "Storage backend: %s (%d shards)",
+            config.storage.backend,
+            len(config.db.shard_configs) if postgres else 1,
+        )
 
-    app.state.db = db
-    try:
-        yield
-    finally:
-        logger.info("🛑 Stopping Q&A API...")
+        app.state.config = config
+        app.state.db = db
+
+        answer_feed = None
+        if postgres and config.feed.enabled:
+            answer_feed = AnswerFeed(
+                db,
+                buffer_size=config.feed.buffer_size,
+                pending_size=config.feed.pending_size,
+            )
+            # stop закрывает и соединения, открытые до сбоя start
+            stack.push_async_callback(answer_feed.stop)
+            await answer_feed.start()
+        app.state.answer_feed = answer_feed
+
+        # Первый круг создаёт партиции текущего и следующих месяцев сразу на старте
+        if postgres and config.partitions.enabled:
+            partition_task = asyncio.create_task(
+                maintain_answer_partitions(db, config.partitions)
+            )
+            stack.push_async_callback(_cancel, partition_task)
+
+        # Лента изменений есть у любого движка, и в памяти тоже растёт
+        if config.changes.enabled and config.changes.retention_days > 0:
+            changes_task = asyncio.create_task(maintain_changes(db, config.changes))
+            stack.push_async_callback(_cancel, changes_task)
 
-    await app.state.db.engine.dispose()
+        # Прогрев кэша: ждём не дольше warmup_wait, дальше он догружается в фоне,
+        # а приложение уже принимает запросы (промахи просто идут в БД)
+        if question_cache is not None:
+            warmup_task = asyncio.create_task(warm_up_cache(db, config.cache))
+            stack.push_async_callback(_cancel, warmup_task)
+            await asyncio.wait({warmup_task}, timeout=config.cache.warmup_wait)
+        try:
+            yield
+        finally:
+            logger.info("🛑 Stopping Q&A API...")
 
 
 def create_app() -> FastAPI:
     app = FastAPI(title="Q&A API", lifespan=lifespan)
+    app.add_middleware(RequestIdMiddleware)
     app.include_router(api_router, tags=["Q&A API"])
     return app
 
@@ -18,3 +18,9 @@ class AnswerRead(AnswerBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class AnswersPageRead(BaseModel):
+    answers: list[AnswerRead]
+    # Передайте в следующий запрос как ?cursor=...; None — страниц больше нет
+    next_cursor: str | None
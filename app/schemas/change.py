@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ChangeRead(BaseModel):
+    seq: int
+    entity: Literal["question", "answer"]
+    op: Literal["create", "delete"]
+    entity_id: int
+    question_id: int
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ChangesRead(BaseModel):
+    changes: list[ChangeRead]
+    # Передайте в следующий запрос как ?cursor=...; не меняется, если пусто
+    next_cursor: str | None
+    has_more: bool
+
+
+class ChangesLagRead(BaseModel):
+    # Закоммиченные изменения, которые лента ещё не отдаёт из-за более
+    # старой незавершённой транзакции, и время самого старого из них
+    held_back: int
+    oldest_held_back: datetime | None
@@ -28,3 +28,15 @@ class QuestionWithAnswersRead(QuestionRead):
 
 class QuestionsRead(BaseModel):
     questions: list[QuestionRead]
+
+
+class QuestionPreviewRead(BaseModel):
+    id: int
+    # Первые N символов текста вопроса
+    text: str
+    created_at: datetime
+    truncated: bool
+
+
+class QuestionPreviewsRead(BaseModel):
+    questions: list[QuestionPreviewRead]
@@ -0,0 +1,68 @@
+"""
+Serialization of rows we already trust.
+
+Everything returned by ``Database`` was validated by ``*Create`` schemas on
+the way in and is shaped by our own SQL, so re-running ``response_model``
+validation (``from_attributes``, ``min_length``/``max_length``) on the way
+out only burns CPU. These helpers copy the schema fields into plain dicts,
+in schema field order, and render them with pydantic-core's ``to_json``:
+the same encoder (and datetime format) FastAPI would use, minus validation.
+"""
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from fastapi import Response, status
+from pydantic_core import to_json
+
+from app.schemas.answer import AnswerRead
+from app.schemas.question import QuestionPreviewRead, QuestionRead
+
+ANSWER_FIELDS = tuple(AnswerRead.model_fields)
+QUESTION_FIELDS = tuple(QuestionRead.model_fields)
+QUESTION_PREVIEW_FIELDS = tuple(QuestionPreviewRead.model_fields)
+
+
+def _values(row: Any, fields: Iterable[str]) -> dict[str, Any]:
+    # Строки бывают dict/RowMapping или ORM-объектами. У ORM-объекта
+    # загруженные колонки лежат в __dict__ — это в разы дешевле, чем
+    # getattr через instrumented attribute; незагруженные берём через getattr.
+    source = row if isinstance(row, Mapping) else row.__dict__
+    try:
+        return {name: source[name] for name in fields}
+    except KeyError:
+        return {name: getattr(row, name) for name in fields}
+
+
+def answer_read(row: Any) -> dict[str, Any]:
+    return _values(row, ANSWER_FIELDS)
+
+
+def question_read(row: Any) -> dict[str, Any]:
+    return _values(row, QUESTION_FIELDS)
+
+
+def question_with_answers_read(row: Any) -> dict[str, Any]:
+    answers = row["answers"] if isinstance(row, Mapping) else row.answers
+    question = _values(row, QUESTION_FIELDS)
+    question["answers"] = [_values(answer, ANSWER_FIELDS) for answer in answers]
+    return question
+
+
+def questions_read(rows: Iterable[Any]) -> dict[str, Any]:
+    return {"questions": [_values(row, QUESTION_FIELDS) for row in rows]}
+
+
+def question_previews_read(rows: Iterable[Any]) -> dict[str, Any]:
+    return {"questions": [_values(row, QUESTION_PREVIEW_FIELDS) for row in rows]}
+
+
+def json_response(content: Any, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Renders already-shaped content to JSON bytes without validation.
+    """
+    return Response(
+        content=to_json(content),
+        status_code=status_code,
+        media_type="application/json",
+    )
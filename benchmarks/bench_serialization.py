@@ -0,0 +1,61 @@
+"""
+Benchmark: CPU per response for a question with a large answer list.
+
+``validated`` mimics what FastAPI does with ``response_model``: validate the
+ORM object with ``from_attributes``, dump it to JSON-compatible Python and
+``json.dumps`` the result. ``trusted`` is the path from
+``app.schemas.trusted``: schema fields copied into plain dicts and rendered by pydantic-core's
+``to_json`` without validation.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_serialization
+"""
+
+import json
+import timeit
+from datetime import UTC, datetime
+
+from app.db.models import AnswerOrm, QuestionOrm
+from app.schemas import QuestionWithAnswersRead, trusted
+
+ROUNDS = 20
+
+
+def make_question(answers: int) -> QuestionOrm:
+    now = datetime.now(UTC)
+    question = QuestionOrm(id=1, text="q" * 500, created_at=now)
+    question.answers = [
+        AnswerOrm(
+            id=i,
+            question_id=1,
+            user_id="e2b50b32-76ae-42f9-a012-4e5ae315645b",
+            text="a" * 500,
+            created_at=now,
+        )
+        for i in range(answers)
+    ]
+    return question
+
+
+def validated(question: QuestionOrm) -> bytes:
+    model = QuestionWithAnswersRead.model_validate(question)
+    return json.dumps(model.model_dump(mode="json")).encode()
+
+
+def trusted_path(question: QuestionOrm) -> bytes:
+    return trusted.json_response(trusted.question_with_answers_read(question)).body
+
+
+def main():
+    print(f"{'answers':>8}{'validated, ms':>16}{'trusted, ms':>14}{'speedup':>10}")
+    for answers in (10, 100, 1_000, 10_000):
+        question = make_question(answers)
+        slow = timeit.timeit(lambda q=question: validated(q), number=ROUNDS)
+        fast = timeit.timeit(lambda q=question: trusted_path(q), number=ROUNDS)
+        slow_ms, fast_ms = slow / ROUNDS * 1e3, fast / ROUNDS * 1e3
+        print(f"{answers:>8}{slow_ms:>16.2f}{fast_ms:>14.2f}{slow_ms / fast_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Micro-benchmark: per-call overhead of building SQLAlchemy statements.
+
+Compares the old approach (a fresh ``select()/insert()`` on every call, as the
+``Database`` methods used to do) with the prebuilt statements from
+``app.db.database``. Both variants pay for the compiled-cache key generation,
+which is what SQLAlchemy does on every ``execute``; only the prebuilt ones get
+it memoized.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_statements
+"""
+
+import timeit
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import selectinload
+
+from app.db import database
+from app.db.models import AnswerOrm, QuestionOrm
+
+N = 20_000
+
+
+def fresh_get_question():
+    stmt = (
+        select(QuestionOrm)
+        .options(selectinload(QuestionOrm.answers))
+        .where(QuestionOrm.id == 42)
+    )
+    return stmt._generate_cache_key()
+
+
+def fresh_get_answer():
+    stmt = (
+        select(AnswerOrm)
+        .options(selectinload(AnswerOrm.question))
+        .where(AnswerOrm.id == 42)
+    )
+    return stmt._generate_cache_key()
+
+
+def fresh_insert_answer():
+    stmt = (
+        insert(AnswerOrm)
+        .values(question_id=1, user_id="u", text="t")
+        .returning(
+            AnswerOrm.user_id,
+            AnswerOrm.text,
+            AnswerOrm.id,
+            AnswerOrm.question_id,
+            AnswerOrm.created_at,
+        )
+    )
+    return stmt._generate_cache_key()
+
+
+def fresh_list_questions():
+    stmt = (
+        select(QuestionOrm)
+        .options(selectinload(QuestionOrm.answers))
+        .order_by(QuestionOrm.created_at.desc(), QuestionOrm.id.desc())
+    )
+    return stmt._generate_cache_key()
+
+
+CASES = {
+    "get_question": (fresh_get_question, database.SELECT_QUESTION_BY_ID),
+    "get_answer_by_id": (fresh_get_answer, database.SELECT_ANSWER_BY_ID),
+    "create_answer": (fresh_insert_answer, database.INSERT_ANSWER),
+    "list_questions": (fresh_list_questions, database.SELECT_QUESTIONS),
+}
+
+
+def _cache_key_of(stmt):
+    # Не берём bound-метод заранее: мемоизация подменяет его после первого вызова
+    return lambda: stmt._generate_cache_key()
+
+
+def main():
+    print(f"{'statement':<20}{'fresh, us':>12}{'prebuilt, us':>14}{'speedup':>10}")
+    for name, (fresh, prebuilt) in CASES.items():
+        fresh_us = timeit.timeit(fresh, number=N) / N * 1e6
+        prebuilt_us = timeit.timeit(_cache_key_of(prebuilt), number=N) / N * 1e6
+        print(
+            f"{name:<20}{fresh_us:>12.2f}{prebuilt_us:>14.2f}"
+            f"{fresh_us / prebuilt_us:>9.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
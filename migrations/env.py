@@ -9,14 +9,18 @@ from app.core.config import DbConfig
 from app.db.models import (
     AnswerOrm,  # noqa
     Base,
+    ChangeOrm,  # noqa
     QuestionOrm,  # noqa
 )
+from app.db.partitions import DEFAULT_PARTITION, partition_month
 
 os.environ.setdefault("DB_PORT", "5432")
 
 env = Env()
 env.read_env(".env")
-db_conf = DbConfig.from_env(env)
+# С шардами миграции катятся на каждый: alembic -x shard=N upgrade head
+shard = int(context.get_x_argument(as_dictionary=True).get("shard", 0))
+db_conf = DbConfig.from_env(env).shard_configs[shard]
 
 config = context.config
 if config.config_file_name is not None:
@@ -26,6 +30,13 @@ config.set_main_option("sqlalchemy.url", db_conf.database_url + "?async_fallback
 target_metadata = Base.metadata
 
 
+def include_name(name, type_, parent_names) -> bool:
+    # Партиции answers создаются приложением, а не описаны в моделях
+    if type_ == "table":
+        return name != DEFAULT_PARTITION and partition_month(name) is None
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -43,6 +54,7 @@ def run_migrations_offline() -> None:
         url=url,
         target_metadata=target_metadata,
         literal_binds=True,
+        include_name=include_name,
         dialect_opts={"paramstyle": "named"},
     )
 
@@ -64,7 +76,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,48 @@
+"""changes
+
+Revision ID: 0b0fd80fead7
+Revises: 10d1ec7ea1ea
+Create Date: 2026-10-19 12:10:41.318402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b0fd80fead7'
+down_revision: Union[str, Sequence[str], None] = '10d1ec7ea1ea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('changes',
+    sa.Column('seq', sa.BigInteger(), nullable=False),
+    sa.Column('txid', sa.BigInteger(), server_default=sa.text('(pg_current_xact_id()::text)::bigint'), nullable=False),
+    sa.Column('entity', sa.String(length=16), nullable=False),
+    sa.Column('op', sa.String(length=16), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('seq')
+    )
+    op.create_index('ix_changes_txid_seq', 'changes', ['txid', 'seq'], unique=False)
+    # Стартовая точка ленты: уже существующие строки как create-события
+    op.execute(
+        "INSERT INTO changes (entity, op, entity_id, question_id, created_at) "
+        "SELECT 'question', 'create', id, id, created_at FROM questions ORDER BY id"
+    )
+    op.execute(
+        "INSERT INTO changes (entity, op, entity_id, question_id, created_at) "
+        "SELECT 'answer', 'create', id, question_id, created_at FROM answers ORDER BY id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_changes_txid_seq', table_name='changes')
+    op.drop_table('changes')
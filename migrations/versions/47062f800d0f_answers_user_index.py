@@ -0,0 +1,42 @@
+"""answers user index
+
+Revision ID: 47062f800d0f
+Revises: 0b0fd80fead7
+Create Date: 2026-10-19 14:02:17.551830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '47062f800d0f'
+down_revision: Union[str, Sequence[str], None] = '0b0fd80fead7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в answers, но не работает в транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_answers_user_id_created_at_id',
+            'answers',
+            ['user_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_answers_user_id_created_at_id',
+            table_name='answers',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,34 @@
+"""changes pruned watermark
+
+Revision ID: 5e8b1c2d9a40
+Revises: c3a9e51f7b20
+Create Date: 2026-10-19 20:05:12.417305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b1c2d9a40'
+down_revision: Union[str, Sequence[str], None] = 'c3a9e51f7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('changes_pruned',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('txid', sa.BigInteger(), nullable=False),
+    sa.Column('seq', sa.BigInteger(), nullable=False),
+    sa.CheckConstraint('id = 1', name='ck_changes_pruned_single'),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('changes_pruned')
@@ -0,0 +1,59 @@
+"""created_at brin
+
+Revision ID: 77d847611f57
+Revises: 47062f800d0f
+Create Date: 2026-10-19 15:26:03.904113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '77d847611f57'
+down_revision: Union[str, Sequence[str], None] = '47062f800d0f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # BRIN по created_at: таблицы append-only, время растёт вместе с физическим
+    # порядком строк, поэтому индекс крошечный и почти бесплатен на вставке
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_questions_created_at_brin',
+            'questions',
+            ['created_at'],
+            unique=False,
+            postgresql_using='brin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_answers_created_at_brin',
+            'answers',
+            ['created_at'],
+            unique=False,
+            postgresql_using='brin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_answers_created_at_brin',
+            table_name='answers',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_questions_created_at_brin',
+            table_name='questions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,43 @@
+"""questions created_at id
+
+Revision ID: 9d4f2a6b1e07
+Revises: 5e8b1c2d9a40
+Create Date: 2026-10-19 19:40:12.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f2a6b1e07'
+down_revision: Union[str, Sequence[str], None] = '5e8b1c2d9a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Новые вопросы первыми (ORDER BY created_at DESC, id DESC LIMIT n):
+    # по BRIN это полная сортировка, по btree — чтение с конца индекса
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_questions_created_at_id',
+            'questions',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_questions_created_at_id',
+            table_name='questions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
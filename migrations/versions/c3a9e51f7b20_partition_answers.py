@@ -0,0 +1,106 @@
+"""partition answers by created_at
+
+Revision ID: c3a9e51f7b20
+Revises: 77d847611f57
+Create Date: 2026-10-19 17:02:41.518236
+
+"""
+from datetime import UTC, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.partitions import (
+    DEFAULT_PARTITION_SQL,
+    add_months,
+    create_partition_sql,
+    month_start,
+    partition_months,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a9e51f7b20'
+down_revision: Union[str, Sequence[str], None] = '77d847611f57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Сколько месяцев вперёд создаём партиции сразу; дальше их держит
+# фоновое обслуживание приложения (PartitionConfig.months_ahead)
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, question_id, user_id, text, created_at"
+
+
+def _answers_table(name: str, *constraints, **kwargs) -> None:
+    # Колонки как в init; id по-прежнему берётся из answers_id_seq
+    op.create_table(name,
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('answers_id_seq'::regclass)"), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(length=200), nullable=False),
+    sa.Column('text', sa.String(length=10000), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], name='answers_question_id_fkey', ondelete='CASCADE'),
+    *constraints,
+    **kwargs,
+    )
+
+
+def _answers_indexes() -> None:
+    op.create_index(op.f('ix_answers_question_id'), 'answers', ['question_id'], unique=False)
+    op.create_index('ix_answers_user_id_created_at_id', 'answers', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_answers_created_at_brin', 'answers', ['created_at'], unique=False, postgresql_using='brin')
+
+
+def _drop_answers_indexes(table: str) -> None:
+    op.drop_index('ix_answers_created_at_brin', table_name=table)
+    op.drop_index('ix_answers_user_id_created_at_id', table_name=table)
+    op.drop_index(op.f('ix_answers_question_id'), table_name=table)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Таблицу нельзя сделать партиционированной на месте: создаём новую,
+    # переносим строки и меняем местами. Всё в одной транзакции миграции —
+    # на время переноса answers заблокирована на запись.
+    op.rename_table('answers', 'answers_unpartitioned')
+    op.execute('ALTER INDEX answers_pkey RENAME TO answers_unpartitioned_pkey')
+    _drop_answers_indexes('answers_unpartitioned')
+
+    # Ключ партиционирования обязан входить в первичный ключ
+    _answers_table(
+        'answers',
+        sa.PrimaryKeyConstraint('id', 'created_at', name='answers_pkey'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+
+    now = datetime.now(UTC)
+    first = op.get_bind().execute(
+        sa.text('SELECT min(created_at) FROM answers_unpartitioned')
+    ).scalar()
+    for month in partition_months(first or now, add_months(month_start(now), MONTHS_AHEAD)):
+        op.execute(create_partition_sql(month))
+    op.execute(DEFAULT_PARTITION_SQL)
+
+    op.execute(f'INSERT INTO answers ({COLUMNS}) SELECT {COLUMNS} FROM answers_unpartitioned')
+    # Иначе sequence удалится вместе со старой таблицей
+    op.execute('ALTER SEQUENCE answers_id_seq OWNED BY answers.id')
+    op.drop_table('answers_unpartitioned')
+    # Индексы на родителе создаются сразу на всех партициях
+    _answers_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Партиции, уже отправленные в архивную схему, остаются там как есть
+    op.rename_table('answers', 'answers_partitioned')
+    op.execute('ALTER INDEX answers_pkey RENAME TO answers_partitioned_pkey')
+    _drop_answers_indexes('answers_partitioned')
+
+    _answers_table('answers', sa.PrimaryKeyConstraint('id', name='answers_pkey'))
+    op.execute(f'INSERT INTO answers ({COLUMNS}) SELECT {COLUMNS} FROM answers_partitioned')
+    op.execute('ALTER SEQUENCE answers_id_seq OWNED BY answers.id')
+    # Вместе с родителем удаляются и все партиции
+    op.drop_table('answers_partitioned')
+    _answers_indexes()
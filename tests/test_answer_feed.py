@@ -0,0 +1,203 @@
+# test_answer_feed.py
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+from pydantic_core import to_json
+
+from app.api.v1 import deps
+from app.db.answer_feed import AnswerFeed, Subscription
+from app.schemas import trusted
+from app.schemas.answer import AnswerCreate
+from app.schemas.question import QuestionCreate
+
+
+async def _question_exists(question_id: int, fields):
+    return {"id": question_id}
+
+
+def _answer(answer_id: int, question_id: int = 1):
+    return {
+        "id": answer_id,
+        "question_id": question_id,
+        "user_id": "e2b50b32-76ae-42f9-a012-4e5ae315645b",
+        "text": "ok",
+        "created_at": datetime.now(UTC),
+    }
+
+
+class _Db:
+    cleared = 0
+
+    def invalidate_questions(self):
+        self.cleared += 1
+
+
+@pytest.mark.asyncio
+async def test_publish_fans_out_only_to_question_subscribers():
+    feed = AnswerFeed(db=None, buffer_size=10)
+
+    async with feed.subscribe(1) as a, feed.subscribe(1) as b, feed.subscribe(2) as c:
+        feed.publish(1, _answer(10))
+
+        assert (await a.get())["id"] == 10
+        assert (await b.get())["id"] == 10
+        assert c.queue.empty()
+
+    assert feed.subscriber_count(1) == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_overflows_instead_of_growing():
+    subscription = Subscription(question_id=1, buffer_size=2)
+    for i in range(5):
+        subscription.push(_answer(i))
+
+    assert subscription.overflowed
+    assert await subscription.get() is None
+    assert subscription.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_pending_overflow_signals_every_subscriber():
+    db = _Db()
+    feed = AnswerFeed(db=db, buffer_size=10, pending_size=2)
+
+    async with feed.subscribe(1) as a, feed.subscribe(2) as b:
+        for i in range(3):
+            feed._on_notify(None, 0, "", f'{{"id": {i}}}')
+
+        assert await a.get() is None
+        assert await b.get() is None
+    assert feed._pending.empty()
+    assert (feed.dropped, db.cleared) == (3, 1)
+
+
+@pytest.mark.asyncio
+async def test_reconnect_signals_every_subscriber():
+    db = _Db()
+    feed = AnswerFeed(db=db, buffer_size=10)
+    connects = []
+
+    async def _connect():
+        feed._lost.clear()
+        connects.append(True)
+
+    feed._connect = _connect
+    task = asyncio.create_task(feed._reconnect_loop())
+    try:
+        async with feed.subscribe(1) as a:
+            feed._lost.set()
+
+            assert await asyncio.wait_for(a.get(), timeout=1) is None
+    finally:
+        task.cancel()
+    assert (len(connects), db.cleared) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_on_disconnect_before_keepalive(config, db):
+    from starlette.requests import Request
+
+    from app.api.v1.answers import stream_answers_endpoint
+
+    gone = asyncio.Event()
+
+    async def receive():
+        await gone.wait()
+        return {"type": "http.disconnect"}
+
+    feed = AnswerFeed(db=None)
+    config.feed.keepalive = 60
+    db.get_question_projection = _question_exists
+    response = await stream_answers_endpoint(
+        1, Request({"type": "http"}, receive), feed=feed, db=db, config=config
+    )
+    stream = response.body_iterator
+
+    assert await anext(stream) == ": connected\n\n"
+    gone.set()
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(anext(stream), timeout=1)
+    assert feed.subscriber_count(1) == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_emits_answer_then_overflow(app, client, db):
+    feed = AnswerFeed(db=None, buffer_size=1)
+    db.get_question_projection = _question_exists
+    answer = _answer(7)
+
+    async def _override():
+        return feed
+
+    app.dependency_overrides[deps.get_answer_feed] = _override
+
+    async def _produce():
+        while not feed.subscriber_count(1):
+            await asyncio.sleep(0)
+        feed.publish(1, answer)
+        (subscription,) = feed._subscribers[1]
+        # Ждём, пока поток заберёт ответ, и переполняем буфер на одно место
+        while not subscription.queue.empty():
+            await asyncio.sleep(0)
+        feed.publish(1, _answer(8))
+        feed.publish(1, _answer(9))
+
+    producer = asyncio.create_task(_produce())
+    r = await client.get("/questions/1/answers/stream")
+    await producer
+
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    data = to_json(trusted.answer_read(answer)).decode()
+    assert f"event: answer\nid: 7\ndata: {data}\n\n" in r.text
+    assert r.text.endswith("event: overflow\ndata: {}\n\n")
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_503_when_disabled(app, client):
+    async def _override():
+        return None
+
+    app.dependency_overrides[deps.get_answer_feed] = _override
+
+    r = await client.get("/questions/1/answers/stream")
+    assert r.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_404_for_missing_question(app, client, db):
+    feed = AnswerFeed(db=None)
+
+    async def _override():
+        return feed
+
+    async def _missing(question_id, fields):
+        return None
+
+    app.dependency_overrides[deps.get_answer_feed] = _override
+    db.get_question_projection = _missing
+
+    r = await client.get("/questions/999/answers/stream")
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Question not found"
+    assert feed.subscriber_count(999) == 0
+
+
+@pytest.mark.asyncio
+async def test_notify_reaches_subscriber(pg_db):
+    feed = AnswerFeed(pg_db, buffer_size=10)
+    await feed.start()
+    try:
+        question = await pg_db.create_question(QuestionCreate(text="Вопрос"))
+        async with feed.subscribe(question["id"]) as subscription:
+            created = await pg_db.create_answer_for_question(
+                question["id"], AnswerCreate(user_id="u", text="Ответ")
+            )
+            answer = await asyncio.wait_for(subscription.get(), timeout=5)
+    finally:
+        await feed.stop()
+
+    assert answer["id"] == created["id"]
+    assert answer["text"] == "Ответ"
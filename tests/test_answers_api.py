@@ -133,3 +133,60 @@ async def test_delete_answer_500_on_exception(client, db):
     r = await client.delete("/answers/5")
     assert r.status_code == 500
     assert r.json()["detail"] == "Internal Server Error"
+
+
+@pytest.mark.asyncio
+async def test_get_answer_fields_projection(client, db):
+    async def _get_answer_projection(answer_id: int, fields):
+        assert fields == ("id", "created_at")
+        return {"id": answer_id, "created_at": datetime.now(UTC)}
+
+    db.get_answer_projection = _get_answer_projection
+
+    r = await client.get("/answers/7", params={"fields": "id,created_at"})
+    assert r.status_code == 200
+    assert set(r.json()) == {"id", "created_at"}
+
+
+@pytest.mark.asyncio
+async def test_get_answer_fields_404(client, db):
+    async def _get_answer_projection(answer_id: int, fields):
+        return None
+
+    db.get_answer_projection = _get_answer_projection
+
+    r = await client.get("/answers/7", params={"fields": "id"})
+    assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_answers_created_range(client, db):
+    calls = []
+
+    async def _list_answers(limit=50, before=None, fields=None, **filters):
+        calls.append(filters)
+        return [
+            {
+                "id": 1,
+                "question_id": 1,
+                "user_id": "u",
+                "text": "ok",
+                "created_at": datetime(2025, 1, 15, tzinfo=UTC),
+            }
+        ]
+
+    db.list_answers = _list_answers
+
+    r = await client.get(
+        "/answers",
+        params={"created_after": "2025-01-01T00:00:00Z", "created_before": "2025-02-01T00:00:00Z"},
+    )
+    assert r.status_code == 200
+    assert r.json()["next_cursor"] is None
+    assert calls == [
+        {
+            "user_id": None,
+            "created_after": datetime(2025, 1, 1, tzinfo=UTC),
+            "created_before": datetime(2025, 2, 1, tzinfo=UTC),
+        }
+    ]
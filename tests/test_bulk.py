@@ -0,0 +1,141 @@
+# test_bulk.py
+import json
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import text
+
+from app.cli import build_parser
+from app.db.bulk import export_dump, import_dump
+from app.schemas.answer import AnswerCreate
+from app.schemas.question import QuestionCreate
+
+# Всё, что ломает наивный CSV/JSONL: кавычки, разделители, переводы строк,
+# обратные слэши и не-ASCII
+TRICKY_TEXT = 'Вопрос, "в кавычках";\nвторая строка\t\\N и \\ слэш 🚀'
+
+
+async def _seed(db) -> tuple[dict, dict]:
+    question = await db.create_question(QuestionCreate(text=TRICKY_TEXT))
+    await db.create_question(QuestionCreate(text="Без ответов"))
+    answer = await db.create_answer_for_question(
+        question["id"], AnswerCreate(user_id="user,1", text=TRICKY_TEXT)
+    )
+    return question, answer
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+async def test_export_import_round_trip_remaps_ids(pg_db, tmp_path, fmt):
+    question, answer = await _seed(pg_db)
+
+    exported = await export_dump(pg_db, tmp_path, fmt)
+    imported = await import_dump(pg_db, tmp_path, fmt)
+
+    assert [(s.table, s.rows) for s in exported] == [("questions", 2), ("answers", 1)]
+    assert [(s.table, s.rows) for s in imported] == [("questions", 2), ("answers", 1)]
+    assert all(s.rows_per_second > 0 for s in imported)
+
+    async with pg_db.engine.begin() as conn:
+        rows = (
+            await conn.execute(
+                text(
+                    "SELECT q.id, q.text, q.created_at, a.user_id, a.text AS answer "
+                    "FROM questions q JOIN answers a ON a.question_id = q.id "
+                    "ORDER BY q.id"
+                )
+            )
+        ).mappings().all()
+        changes = await conn.scalar(text("SELECT count(*) FROM changes"))
+
+    original, copy = rows
+    # Ответ привязан к новому вопросу, содержимое не изменилось
+    assert original["id"] == question["id"]
+    assert copy["id"] > question["id"]
+    assert copy["text"] == original["text"] == TRICKY_TEXT
+    assert copy["answer"] == TRICKY_TEXT
+    assert copy["user_id"] == "user,1"
+    assert copy["created_at"] == original["created_at"]
+    # Импорт виден в ленте изменений
+    assert changes == 6
+
+
+@pytest.mark.asyncio
+async def test_import_skips_orphans_and_partitions_history(pg_db, tmp_path):
+    (tmp_path / "questions.jsonl").write_text(
+        json.dumps({"id": 7, "text": "Старый", "created_at": "2023-05-01T10:00:00"})
+        + "\n"
+    )
+    (tmp_path / "answers.jsonl").write_text(
+        json.dumps({"question_id": 7, "user_id": "u", "text": "a",
+                    "created_at": "2023-05-02T10:00:00"})
+        + "\n"
+        + json.dumps({"question_id": 8, "user_id": "u", "text": "сирота"})
+        + "\n"
+        # Часы источника отстают: ответ «раньше» вопроса сохраняется как есть
+        + json.dumps({"question_id": 7, "user_id": "u", "text": "b",
+                      "created_at": "2023-04-30T10:00:00"})
+        + "\n"
+    )
+
+    questions, answers = await import_dump(pg_db, tmp_path, "jsonl")
+
+    assert (questions.rows, answers.rows, answers.skipped) == (1, 2, 1)
+    async with pg_db.engine.begin() as conn:
+        placed = await conn.execute(
+            text(
+                "SELECT tableoid::regclass::text, created_at FROM answers "
+                "ORDER BY created_at"
+            )
+        )
+        assert placed.all() == [
+            ("answers_p202304", datetime(2023, 4, 30, 10, tzinfo=UTC)),
+            ("answers_p202305", datetime(2023, 5, 2, 10, tzinfo=UTC)),
+        ]
+
+
+@pytest.mark.asyncio
+async def test_import_caps_partitioned_history(pg_db, tmp_path, caplog):
+    (tmp_path / "questions.jsonl").write_text(
+        json.dumps({"id": 1, "text": "Вопрос"}) + "\n"
+    )
+    (tmp_path / "answers.jsonl").write_text(
+        json.dumps({"question_id": 1, "user_id": "u", "text": "a",
+                    "created_at": "1970-01-01T00:00:00"})
+        + "\n"
+    )
+
+    with caplog.at_level("INFO", logger="app.db.bulk"):
+        await import_dump(pg_db, tmp_path, "jsonl", partition_months=2)
+
+    async with pg_db.engine.begin() as conn:
+        placed = await conn.scalar(
+            text("SELECT tableoid::regclass::text FROM answers")
+        )
+        partitions = await conn.scalar(
+            text(
+                "SELECT count(*) FROM pg_inherits "
+                "WHERE inhparent = 'answers'::regclass"
+            )
+        )
+    assert placed == "answers_default"
+    # DEFAULT, два месяца назад, текущий и три вперёд
+    assert partitions <= 1 + 2 + 1 + 3
+    assert "stay in the DEFAULT partition" in caplog.text
+    assert "Created answer partitions" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_duplicate_question_ids(pg_db, tmp_path):
+    (tmp_path / "questions.csv").write_text("id,text\n1,a\n1,b\n")
+
+    with pytest.raises(ValueError, match="repeats"):
+        await import_dump(pg_db, tmp_path, "csv")
+
+
+def test_cli_parses_commands():
+    args = build_parser().parse_args(["export", "dump", "--format", "csv"])
+
+    assert (args.command, str(args.directory), args.format) == ("export", "dump", "csv")
+    args = build_parser().parse_args(["import", "dump", "--partition-months", "6"])
+    assert args.partition_months == 6
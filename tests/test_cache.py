@@ -0,0 +1,186 @@
+# test_cache.py
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.db.answer_feed import AnswerFeed
+from app.db.cache import ReadCache
+from app.db.database import Database
+from app.schemas.answer import AnswerCreate
+from app.schemas.question import QuestionCreate
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ReadCache(max_size=2)
+    cache.put(1, "a")
+    cache.put(2, "b")
+    cache.get(1)
+    cache.put(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+
+
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    cache = ReadCache(ttl=10, clock=clock)
+    cache.put(1, "a")
+
+    clock.now = 9.9
+    assert cache.get(1) == "a"
+    clock.now = 10.0
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+
+def test_put_skipped_after_invalidation_since_read():
+    cache = ReadCache()
+    token = cache.token()
+    # Пока читатель ходил в БД, кто-то записал и сбросил этот ключ
+    cache.invalidate(1)
+
+    assert cache.put(1, "stale", token) is False
+    assert cache.get(1) is None
+    # Сброс другого ключа чтению не мешает
+    assert cache.put(2, "fresh", token) is True
+    assert cache.put(1, "fresh", cache.token()) is True
+
+
+def test_put_skipped_after_clear_or_ttl_since_read():
+    clock = Clock()
+    cache = ReadCache(ttl=10, clock=clock)
+    token = cache.token()
+    cache.clear()
+    assert cache.put(1, "stale", token) is False
+
+    token = cache.token()
+    cache.invalidate(2)
+    clock.now = 10.0
+    # Старый сброс забыт, но и токен старше ttl уже не годится
+    cache.invalidate(3)
+    assert cache.put(2, "stale", token) is False
+    assert cache.put(2, "fresh", cache.token()) is True
+
+
+@pytest.fixture
+def cached_db(pg_db):
+    pg_db.question_cache = ReadCache(max_size=100)
+    return pg_db
+
+
+@pytest.mark.asyncio
+async def test_warm_up_loads_recent_questions_with_answers(cached_db):
+    questions = [
+        await cached_db.create_question(QuestionCreate(text=f"Вопрос {i}"))
+        for i in range(5)
+    ]
+    answer = await cached_db.create_answer_for_question(
+        questions[-1]["id"], AnswerCreate(user_id="u", text="Ответ")
+    )
+    cached_db.question_cache.clear()
+
+    cached = await cached_db.warm_question_cache(limit=3, batch_size=2)
+
+    assert cached == 3
+    assert len(cached_db.question_cache) == 3
+    assert cached_db.question_cache.get(questions[0]["id"]) is None
+    newest = cached_db.question_cache.get(questions[-1]["id"])
+    assert [a["id"] for a in newest["answers"]] == [answer["id"]]
+    # Вопрос из кэша — в той же форме, что и из get_question_fast
+    assert newest == await cached_db.get_question_fast(questions[-1]["id"])
+
+
+@pytest.mark.asyncio
+async def test_warm_up_picks_newest_by_created_at_not_id(cached_db):
+    fresh = await cached_db.create_question(QuestionCreate(text="Новый"))
+    # Импортированный вопрос: id больше, а создан давно
+    async with cached_db.engine.begin() as conn:
+        await conn.execute(
+            text(
+                "INSERT INTO questions (id, text, created_at) "
+                "VALUES (:id, 'Старый', '2020-01-01 00:00:00+00')"
+            ),
+            {"id": fresh["id"] + 100},
+        )
+    cached_db.question_cache.clear()
+
+    assert await cached_db.warm_question_cache(limit=1) == 1
+    assert cached_db.question_cache.get(fresh["id"]) is not None
+    assert cached_db.question_cache.get(fresh["id"] + 100) is None
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_question(cached_db):
+    question = await cached_db.create_question(QuestionCreate(text="Вопрос"))
+    await cached_db.warm_question_cache(limit=10)
+    hits = cached_db.question_cache.hits
+
+    assert (await cached_db.get_question(question["id"]))["answers"] == []
+    assert cached_db.question_cache.hits == hits + 1
+
+    await cached_db.create_answer_for_question(
+        question["id"], AnswerCreate(user_id="u", text="Ответ")
+    )
+    fresh = await cached_db.get_question(question["id"])
+    assert len(fresh["answers"]) == 1
+
+    await cached_db.delete_question_by_id(question["id"])
+    assert await cached_db.get_question(question["id"]) is None
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_follows_fast_reads(cached_db, monkeypatch):
+    question = await cached_db.create_question(QuestionCreate(text="Вопрос"))
+    await cached_db.create_answer_for_question(
+        question["id"], AnswerCreate(user_id="u", text="Ответ")
+    )
+    expected = await cached_db.get_question_fast(question["id"])
+
+    async def _no_fast_path(question_id):
+        raise AssertionError("fast path used with fast_reads off")
+
+    monkeypatch.setattr(cached_db, "get_question_fast", _no_fast_path)
+    cached_db.fast_reads = False
+
+    assert await cached_db.get_question(question["id"]) == expected
+    assert cached_db.question_cache.get(question["id"]) == expected
+
+
+@pytest.mark.asyncio
+async def test_writes_in_other_worker_invalidate_through_feed(cached_db, pg_config):
+    other = Database(db_config=pg_config, echo=False)
+    feed = AnswerFeed(cached_db)
+    await feed.start()
+    try:
+        question = await cached_db.create_question(QuestionCreate(text="Вопрос"))
+        answer = await cached_db.create_answer_for_question(
+            question["id"], AnswerCreate(user_id="u", text="Ответ")
+        )
+
+        async def _evicted():
+            while cached_db.question_cache.get(question["id"]) is not None:
+                await asyncio.sleep(0.01)
+
+        # Удаления в другом воркере доходят до кэша через NOTIFY
+        for write in (
+            lambda: other.delete_answer_by_id(answer["id"]),
+            lambda: other.delete_question_by_id(question["id"]),
+        ):
+            await cached_db.get_question(question["id"])
+            await write()
+            await asyncio.wait_for(_evicted(), timeout=5)
+    finally:
+        await feed.stop()
+        await other.close()
+
+    assert await cached_db.get_question(question["id"]) is None
@@ -0,0 +1,193 @@
+# test_changes_api.py
+from datetime import UTC, datetime, timedelta
+
+import asyncpg
+import pytest
+from sqlalchemy import text
+
+from app.api.v1.pagination import decode_cursor, encode_cursor
+from app.db.storage import ChangesPruned
+from app.schemas.answer import AnswerCreate
+from app.schemas.question import QuestionCreate
+
+
+def _change(seq: int, entity="question", op="create"):
+    return {
+        "seq": seq,
+        "txid": 1000 + seq,
+        "entity": entity,
+        "op": op,
+        "entity_id": seq,
+        "question_id": seq,
+        "created_at": datetime.now(UTC),
+    }
+
+
+@pytest.mark.asyncio
+async def test_changes_first_page(client, db):
+    calls = []
+
+    async def _list_changes(after=None, limit=100):
+        calls.append((after, limit))
+        return [_change(1), _change(2), _change(3)]
+
+    db.list_changes = _list_changes
+
+    r = await client.get("/changes", params={"limit": 2})
+    assert r.status_code == 200
+    body = r.json()
+    assert [c["seq"] for c in body["changes"]] == [1, 2]
+    assert body["has_more"] is True
+    assert decode_cursor(body["next_cursor"], size=2) == ["1002", "2"]
+    assert calls == [(None, 3)]
+
+
+@pytest.mark.asyncio
+async def test_changes_after_cursor(client, db):
+    calls = []
+
+    async def _list_changes(after=None, limit=100):
+        calls.append(after)
+        return []
+
+    db.list_changes = _list_changes
+    cursor = encode_cursor(1002, 2)
+
+    r = await client.get("/changes", params={"cursor": cursor})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["changes"] == []
+    assert body["has_more"] is False
+    # Пустая страница не сдвигает курсор
+    assert body["next_cursor"] == cursor
+    assert calls == [(1002, 2)]
+
+
+@pytest.mark.asyncio
+async def test_changes_400_on_bad_cursor(client, db):
+    r = await client.get("/changes", params={"cursor": "not-a-cursor"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+async def test_changes_410_on_pruned_cursor(client, db):
+    async def _pruned(after=None, limit=100):
+        raise ChangesPruned("changes up to (1005, 5) were pruned")
+
+    db.list_changes = _pruned
+
+    r = await client.get("/changes", params={"cursor": encode_cursor(1002, 2)})
+    assert r.status_code == 410
+    assert r.json()["detail"] == "Cursor expired, resync from scratch"
+
+
+@pytest.mark.asyncio
+async def test_changes_500(client, db):
+    async def _boom(after=None, limit=100):
+        raise RuntimeError("db down")
+
+    db.list_changes = _boom
+
+    r = await client.get("/changes")
+    assert r.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_changes_lag(client, db):
+    async def _lag():
+        return {"held_back": 3, "oldest_held_back": datetime(2024, 1, 1, tzinfo=UTC)}
+
+    db.changes_lag = _lag
+
+    r = await client.get("/changes/lag")
+    assert r.status_code == 200
+    assert r.json() == {"held_back": 3, "oldest_held_back": "2024-01-01T00:00:00Z"}
+
+
+@pytest.mark.asyncio
+async def test_changes_recorded_with_tombstones(pg_db):
+    question = await pg_db.create_question(QuestionCreate(text="Вопрос"))
+    answer = await pg_db.create_answer_for_question(
+        question["id"], AnswerCreate(user_id="u", text="Ответ")
+    )
+    first_page = await pg_db.list_changes()
+    cursor = (first_page[-1]["txid"], first_page[-1]["seq"])
+
+    await pg_db.delete_answer_by_id(answer["id"])
+    await pg_db.delete_question_by_id(question["id"])
+    assert await pg_db.delete_question_by_id(question["id"]) is False
+
+    delta = await pg_db.list_changes(after=cursor)
+
+    assert [(c["entity"], c["op"]) for c in first_page] == [
+        ("question", "create"),
+        ("answer", "create"),
+    ]
+    assert [(c["entity"], c["op"], c["entity_id"]) for c in delta] == [
+        ("answer", "delete", answer["id"]),
+        ("question", "delete", question["id"]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_long_transaction_holds_back_feed_and_shows_as_lag(pg_db, pg_config):
+    blocker = await asyncpg.connect(pg_config.dsn)
+    try:
+        transaction = blocker.transaction()
+        await transaction.start()
+        # Транзакции нужен свой txid, иначе она не держит снапшот-xmin
+        await blocker.fetchval("SELECT pg_current_xact_id()")
+        question = await pg_db.create_question(QuestionCreate(text="Вопрос"))
+
+        held = await pg_db.changes_lag()
+        assert await pg_db.list_changes() == []
+        await transaction.rollback()
+    finally:
+        await blocker.close()
+
+    assert held == {"held_back": 1, "oldest_held_back": question["created_at"]}
+    assert (await pg_db.changes_lag())["held_back"] == 0
+    assert [c["entity_id"] for c in await pg_db.list_changes()] == [question["id"]]
+
+
+@pytest.mark.asyncio
+async def test_prune_changes_deletes_only_expired(pg_db):
+    questions = [
+        await pg_db.create_question(QuestionCreate(text=f"Вопрос {i}"))
+        for i in range(5)
+    ]
+    now = datetime.now(UTC)
+    async with pg_db.engine.begin() as conn:
+        await conn.execute(
+            text(
+                "UPDATE changes SET created_at = :old "
+                "WHERE entity_id = ANY(:ids)"
+            ),
+            {"old": now - timedelta(days=40), "ids": [q["id"] for q in questions[:3]]},
+        )
+
+    deleted = await pg_db.prune_changes(now - timedelta(days=30), batch_size=2)
+
+    assert deleted == 3
+    assert [c["entity_id"] for c in await pg_db.list_changes()] == [
+        q["id"] for q in questions[3:]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_prune_changes_empties_a_quiet_feed(pg_db):
+    for i in range(3):
+        await pg_db.create_question(QuestionCreate(text=f"Вопрос {i}"))
+    now = datetime.now(UTC)
+    async with pg_db.engine.begin() as conn:
+        await conn.execute(
+            text("UPDATE changes SET created_at = :old"),
+            {"old": now - timedelta(days=40)},
+        )
+
+    # Моложе отсечки нет ни одной строки — устарели все
+    deleted = await pg_db.prune_changes(now - timedelta(days=30), batch_size=2)
+
+    assert deleted == 3
+    assert await pg_db.list_changes() == []
@@ -0,0 +1,240 @@
+# test_database.py
+# Проверки Database на настоящем Postgres (TEST_DATABASE_URL).
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db.database import (
+    SELECT_ANSWERS_BY_QUESTION,
+    select_answers,
+    select_questions_projection,
+)
+from app.db.partitions import ensure_answer_partitions
+
+from app.schemas.answer import AnswerCreate
+from app.schemas.question import QuestionCreate
+
+
+@pytest.mark.asyncio
+async def test_question_previews_are_cut_in_sql(pg_db):
+    await pg_db.create_question(QuestionCreate(text="Короткий"))
+    await pg_db.create_question(QuestionCreate(text="Длинный " * 100))
+
+    previews = await pg_db.list_question_previews(preview=10)
+
+    assert [(p["text"], p["truncated"]) for p in previews] == [
+        ("Длинный Дл", True),
+        ("Короткий", False),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_text_is_loaded_only_where_requested(pg_db):
+    question = await pg_db.create_question(QuestionCreate(text="Вопрос"))
+    created = await pg_db.create_answer_for_question(
+        question["id"], AnswerCreate(user_id="u", text="Ответ")
+    )
+
+    answer = await pg_db.get_answer_by_id(created["id"])
+    full = await pg_db.get_question(question["id"])
+    listed = await pg_db.list_questions()
+
+    assert answer.text == "Ответ"
+    assert full.text == "Вопрос"
+    assert full.answers[0].text == "Ответ"
+    assert listed[0].text == "Вопрос"
+    # Ответу вопрос не нужен (AnswerRead его не содержит) — он не грузится
+    with pytest.raises(SQLAlchemyError):
+        _ = answer.question
+
+
+@pytest.mark.asyncio
+async def test_projections_select_only_requested_columns(pg_db):
+    question = await pg_db.create_question(QuestionCreate(text="Вопрос " * 10))
+    answer = await pg_db.create_answer_for_question(
+        question["id"], AnswerCreate(user_id="u", text="Ответ")
+    )
+
+    listed = await pg_db.list_questions_projection(("created_at",))
+    previews = await pg_db.list_questions_projection(("text", "truncated"), preview=6)
+    detail = await pg_db.get_question_projection(question["id"], ("id", "answers"))
+    only_answers = await pg_db.get_question_projection(question["id"], ("answers",))
+    single = await pg_db.get_answer_projection(answer["id"], ("id", "user_id"))
+
+    assert list(listed[0]) == ["created_at"]
+    assert previews == [{"text": "Вопрос", "truncated": True}]
+    assert detail["id"] == question["id"]
+    assert [a["id"] for a in detail["answers"]] == [answer["id"]]
+    assert list(only_answers) == ["answers"]
+    assert single == {"id": answer["id"], "user_id": "u"}
+    assert await pg_db.get_answer_projection(404, ("id",)) is None
+
+
+async def _explain(conn, stmt, **params) -> str:
+    sql = stmt.params(**params).compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    return "\n".join((await conn.execute(text(f"EXPLAIN {sql}"))).scalars())
+
+
+@pytest.mark.asyncio
+async def test_created_range_uses_brin_indexes(pg_db):
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    async with pg_db.engine.begin() as conn:
+        await ensure_answer_partitions(conn, months_ahead=5, now=start)
+        # 200 000 вопросов и ответов, по одному в минуту, в порядке вставки
+        await conn.execute(
+            text(
+                "INSERT INTO questions (text, created_at) "
+                "SELECT 'q' || g, CAST(:start AS timestamptz) + g * interval '1 minute' "
+                "FROM generate_series(1, 200000) g"
+            ),
+            {"start": start},
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO answers (question_id, user_id, text, created_at) "
+                "SELECT g, 'u' || (g % 100), 'a', CAST(:start AS timestamptz) + g * interval '1 minute' "
+                "FROM generate_series(1, 200000) g"
+            ),
+            {"start": start},
+        )
+        await conn.execute(text("ANALYZE questions"))
+        await conn.execute(text("ANALYZE answers"))
+
+        window = {
+            "created_after": start + timedelta(days=30),
+            "created_before": start + timedelta(days=31),
+        }
+        questions_plan = await _explain(
+            conn,
+            select_questions_projection(
+                ("id", "created_at"), created_after=True, created_before=True
+            ),
+            **window,
+        )
+        answers_plan = await _explain(
+            conn,
+            select_answers(("id",), created_after=True, created_before=True),
+            limit=100,
+            **window,
+        )
+
+    assert "ix_questions_created_at_brin" in questions_plan
+    # Окно в один день: остаётся одна партиция, внутри неё — BRIN
+    assert "answers_p202501" in answers_plan
+    assert "answers_p202502" not in answers_plan
+    assert "answers_default" not in answers_plan
+    assert "answers_p202501_created_at_idx" in answers_plan
+
+    rows = await pg_db.list_questions_projection(("created_at",), **window)
+    assert len(rows) == 24 * 60
+    assert all(
+        window["created_after"] <= r["created_at"] < window["created_before"]
+        for r in rows
+    )
+
+
+async def _answer_at(conn, question_id: int, created_at: datetime) -> None:
+    await conn.execute(
+        text(
+            "INSERT INTO answers (question_id, user_id, text, created_at) "
+            "VALUES (:question_id, 'u', 'a', :created_at)"
+        ),
+        {"question_id": question_id, "created_at": created_at},
+    )
+
+
+async def _partition_of(conn) -> list[str]:
+    result = await conn.execute(
+        text("SELECT tableoid::regclass::text FROM answers ORDER BY created_at")
+    )
+    return list(result.scalars())
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_moves_rows_out_of_default(pg_db):
+    question = await pg_db.create_question(QuestionCreate(text="Вопрос"))
+    old = datetime(2024, 3, 15, tzinfo=UTC)
+    async with pg_db.engine.begin() as conn:
+        await _answer_at(conn, question["id"], old)
+        assert await _partition_of(conn) == ["answers_default"]
+
+        created = await ensure_answer_partitions(conn, months_ahead=1, now=old)
+
+        assert created == ["answers_p202403", "answers_p202404"]
+        assert await _partition_of(conn) == ["answers_p202403"]
+        # Повторный вызов ничего не делает
+        assert await ensure_answer_partitions(conn, months_ahead=1, now=old) == []
+
+
+@pytest.mark.asyncio
+async def test_archive_detaches_old_partitions_and_keeps_cascade(pg_db):
+    question = await pg_db.create_question(QuestionCreate(text="Вопрос"))
+    old = datetime(2024, 3, 15, tzinfo=UTC)
+    async with pg_db.engine.begin() as conn:
+        await ensure_answer_partitions(conn, months_ahead=0, now=old)
+        await _answer_at(conn, question["id"], old)
+    await pg_db.create_answer_for_question(
+        question["id"], AnswerCreate(user_id="u", text="свежий")
+    )
+
+    archived = await pg_db.archive_answer_partitions(
+        datetime(2024, 4, 1, tzinfo=UTC), schema="archive_test"
+    )
+
+    try:
+        assert archived == ["answers_p202403"]
+        async with pg_db.engine.begin() as conn:
+            assert await _partition_of(conn) != []
+            assert "answers_p202403" not in await _partition_of(conn)
+            archived_rows = await conn.scalar(
+                text("SELECT count(*) FROM archive_test.answers_p202403")
+            )
+            assert archived_rows == 1
+        # ON DELETE CASCADE доходит и до архивной партиции
+        assert await pg_db.delete_question_by_id(question["id"])
+        async with pg_db.engine.begin() as conn:
+            assert await conn.scalar(
+                text("SELECT count(*) FROM archive_test.answers_p202403")
+            ) == 0
+    finally:
+        async with pg_db.engine.begin() as conn:
+            await conn.execute(text("DROP SCHEMA IF EXISTS archive_test CASCADE"))
+
+
+@pytest.mark.asyncio
+async def test_every_read_path_returns_answers_older_than_question(pg_db):
+    # created_at ответа ничем не ограничен (импорт, старые данные): ответ
+    # «старше» вопроса виден на всех путях чтения одинаково
+    question = await pg_db.create_question(QuestionCreate(text="Вопрос"))
+    async with pg_db.engine.begin() as conn:
+        await ensure_answer_partitions(
+            conn, months_ahead=0, now=datetime(2024, 1, 1, tzinfo=UTC)
+        )
+        old_id = await conn.scalar(
+            text(
+                "INSERT INTO answers (question_id, user_id, text, created_at) "
+                "VALUES (:question_id, 'u', 'Старый', '2024-01-15 00:00:00+00') "
+                "RETURNING id"
+            ),
+            {"question_id": question["id"]},
+        )
+    new = await pg_db.create_answer_for_question(
+        question["id"], AnswerCreate(user_id="u", text="Новый")
+    )
+    expected = [old_id, new["id"]]
+
+    orm = await pg_db.get_question(question["id"])
+    fast = await pg_db.get_question_fast(question["id"])
+    document = json.loads(await pg_db.get_question_json(question["id"]))
+    projection = await pg_db.get_question_projection(question["id"], ("answers",))
+
+    assert [a.id for a in orm.answers] == expected
+    assert [a["id"] for a in fast["answers"]] == expected
+    assert [a["id"] for a in document["answers"]] == expected
+    assert [a["id"] for a in projection["answers"]] == expected
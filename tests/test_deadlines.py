@@ -0,0 +1,75 @@
+# test_deadlines.py
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.core.deadlines import (
+    ClientDisconnected,
+    DeadlineExceeded,
+    remaining,
+    run_with_deadline,
+)
+
+
+@pytest.mark.asyncio
+async def test_deadline_is_visible_inside_the_task():
+    async def _work():
+        return remaining()
+
+    left = await run_with_deadline(_work(), timeout=5)
+
+    assert 0 < left <= 5
+    # Снаружи задачи дедлайна нет
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_the_work():
+    cancelled = asyncio.Event()
+    disconnect = asyncio.Event()
+
+    async def _work():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    asyncio.get_running_loop().call_later(0.01, disconnect.set)
+    with pytest.raises(ClientDisconnected):
+        await run_with_deadline(_work(), timeout=None, disconnected=disconnect.wait())
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_statement_and_frees_connection(pg_db):
+    async def _slow():
+        async with pg_db.session_maker() as session:
+            await session.execute(text("SELECT pg_sleep(5)"))
+
+    with pytest.raises(DeadlineExceeded):
+        await run_with_deadline(_slow(), timeout=0.2)
+
+    # Соединение вернулось в пул, а запрос на сервере остановлен
+    assert pg_db.engine.pool.checkedout() == 0
+    async with pg_db.raw_connection() as conn:
+        running = await conn.fetchval(
+            "SELECT count(*) FROM pg_stat_activity "
+            "WHERE state = 'active' AND query = 'SELECT pg_sleep(5)'"
+        )
+    assert running == 0
+
+
+@pytest.mark.asyncio
+async def test_deadline_sets_statement_timeout(pg_db):
+    async def _timeout():
+        async with pg_db.session_maker() as session:
+            await pg_db._apply_deadline(session)
+            return (await session.execute(text("SHOW statement_timeout"))).scalar()
+
+    assert await run_with_deadline(_timeout(), timeout=None) == "0"
+    configured = await run_with_deadline(_timeout(), timeout=2)
+    # Остаток дедлайна плюс небольшой запас
+    assert configured.endswith("ms")
+    assert 1900 < int(configured.removesuffix("ms")) <= 2100
@@ -0,0 +1,91 @@
+# test_fast_path.py
+# Паритет asyncpg fast path и ORM-пути. Нужен Postgres (TEST_DATABASE_URL).
+import json
+
+import pytest
+from pydantic_core import to_json
+from sqlalchemy import text
+
+from app.schemas import AnswerRead, QuestionWithAnswersRead, trusted
+from app.schemas.answer import AnswerCreate
+from app.schemas.question import QuestionCreate
+
+
+async def _seed(db, answers=3):
+    question = await db.create_question(QuestionCreate(text="Вопрос"))
+    for i in range(answers):
+        await db.create_answer_for_question(
+            question["id"], AnswerCreate(user_id=f"user-{i}", text=f"Ответ {i}")
+        )
+    return question["id"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("answers", [0, 1, 5])
+async def test_get_question_parity(pg_db, answers):
+    question_id = await _seed(pg_db, answers=answers)
+
+    orm = await pg_db.get_question(question_id)
+    fast = await pg_db.get_question_fast(question_id)
+
+    assert QuestionWithAnswersRead.model_validate(fast) == (
+        QuestionWithAnswersRead.model_validate(orm)
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_answer_parity(pg_db):
+    question_id = await _seed(pg_db, answers=2)
+    question = await pg_db.get_question(question_id)
+
+    for answer in question.answers:
+        orm = await pg_db.get_answer_by_id(answer.id)
+        fast = await pg_db.get_answer_by_id_fast(answer.id)
+        assert AnswerRead.model_validate(fast) == AnswerRead.model_validate(orm)
+
+
+@pytest.mark.asyncio
+async def test_missing_rows_parity(pg_db):
+    assert await pg_db.get_question(404) is None
+    assert await pg_db.get_question_fast(404) is None
+    assert await pg_db.get_answer_by_id(404) is None
+    assert await pg_db.get_answer_by_id_fast(404) is None
+
+
+@pytest.mark.asyncio
+async def test_fast_reads_flag_routes_to_raw_path(pg_db):
+    question_id = await _seed(pg_db, answers=1)
+    pg_db.fast_reads = True
+
+    question = await pg_db.get_question(question_id)
+
+    assert isinstance(question, dict)
+    assert len(question["answers"]) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("answers", [0, 3])
+async def test_get_question_json_parity(pg_db, answers):
+    question_id = await _seed(pg_db, answers=answers)
+
+    async with pg_db.engine.begin() as conn:
+        # Время без долей секунды: pydantic пишет его без ".000000"
+        await conn.execute(
+            text(
+                "UPDATE questions SET created_at = '2024-05-01 12:00:00+03' "
+                "WHERE id = :id"
+            ),
+            {"id": question_id},
+        )
+
+    orm = await pg_db.get_question(question_id)
+    document = await pg_db.get_question_json(question_id)
+
+    assert QuestionWithAnswersRead.model_validate_json(document) == (
+        QuestionWithAnswersRead.model_validate(orm)
+    )
+    # Строки те же, что у ORM-пути: время в UTC с "Z", а не в TimeZone сессии
+    raw = json.loads(document)
+    assert raw == json.loads(to_json(trusted.question_with_answers_read(orm)))
+    assert raw["created_at"] == "2024-05-01T09:00:00Z"
+    assert await pg_db.get_question_json(404) is None
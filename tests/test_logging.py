@@ -0,0 +1,159 @@
+# test_logging.py
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from app.api.middleware import RequestIdMiddleware
+from app.core.config import LogConfig
+from app.core.logging import (
+    UVICORN_LOGGERS,
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RateLimitFilter,
+    RequestIdFilter,
+    request_id_var,
+    setup_logging,
+)
+
+
+def _record(msg="Unexpected error: %s", args=("boom",), level=logging.ERROR):
+    return logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+
+
+def test_rate_limit_suppresses_duplicates_and_reports_count(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("app.core.logging.time.monotonic", lambda: now[0])
+    f = RateLimitFilter(burst=2, window=10)
+
+    passed = [f.filter(_record(args=(i,))) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+
+    # Новое окно: запись проходит и несёт счётчик подавленных
+    now[0] = 11.0
+    rec = _record()
+    assert f.filter(rec) is True
+    assert rec.suppressed == 3
+
+
+def test_rate_limit_ignores_info():
+    f = RateLimitFilter(burst=1, window=60)
+    assert all(f.filter(_record(level=logging.INFO)) for _ in range(10))
+
+
+def test_json_formatter_contains_request_id_and_message():
+    token = request_id_var.set("req-1")
+    try:
+        rec = _record()
+        RequestIdFilter().filter(rec)
+    finally:
+        request_id_var.reset(token)
+
+    body = json.loads(JsonFormatter().format(rec))
+    assert body["message"] == "Unexpected error: boom"
+    assert body["request_id"] == "req-1"
+    assert body["level"] == "ERROR"
+
+
+def test_queue_handler_drops_when_full():
+    q = queue.Queue(maxsize=1)
+    handler = NonBlockingQueueHandler(q)
+    first, second = _record(), _record()
+    handler.emit(first)
+    handler.emit(second)
+
+    assert handler.dropped == 1
+    assert q.qsize() == 1
+
+
+def test_queue_handler_fixes_message_but_not_traceback():
+    q = queue.Queue()
+    handler = NonBlockingQueueHandler(q)
+    payload = ["boom"]
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        rec = logging.LogRecord(
+            "app.test", logging.ERROR, __file__, 1, "failed: %s", (payload,),
+            sys.exc_info(),
+        )
+    handler.emit(rec)
+    payload.append("later")
+
+    queued = q.get_nowait()
+    # Аргументы подставлены сразу, трейсбек форматирует поток-слушатель
+    assert (queued.msg, queued.args) == ("failed: ['boom']", None)
+    assert queued.exc_info[0] is ValueError and queued.exc_text is None
+    assert rec.args == (payload,)
+    assert "ValueError: bad" in JsonFormatter().format(queued)
+
+
+def test_setup_logging_routes_uvicorn_through_queue():
+    root = logging.getLogger()
+    saved = root.handlers[:], root.level
+    access = logging.getLogger("uvicorn.access")
+    access.addHandler(logging.StreamHandler(sys.stderr))
+    access.propagate = False
+
+    listener = setup_logging(LogConfig())
+    try:
+        for name in UVICORN_LOGGERS:
+            uvicorn_logger = logging.getLogger(name)
+            assert uvicorn_logger.handlers == []
+            assert uvicorn_logger.propagate is True
+        assert [type(h) for h in root.handlers] == [NonBlockingQueueHandler]
+    finally:
+        listener.stop()
+        root.handlers[:], level = saved
+        root.setLevel(level)
+
+
+@pytest.mark.asyncio
+async def test_request_id_middleware_echoes_header():
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["request_id"] = request_id_var.get()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"x-request-id", b"abc")]}
+    await RequestIdMiddleware(app)(scope, None, send)
+
+    assert seen["request_id"] == "abc"
+    assert (b"x-request-id", b"abc") in sent[0]["headers"]
+    assert request_id_var.get() is None
+
+
+@pytest.mark.asyncio
+async def test_lifespan_stops_log_listener_when_startup_fails(config, monkeypatch):
+    from fastapi import FastAPI
+
+    from app import main
+
+    class _Listener:
+        stopped = False
+
+        def stop(self):
+            self.stopped = True
+
+    def _broken_storage():
+        raise RuntimeError("storage down")
+
+    listener = _Listener()
+    config.storage.backend = "memory"
+    monkeypatch.setattr(main, "load_config", lambda path: config)
+    monkeypatch.setattr(main, "setup_logging", lambda log_config: listener)
+    monkeypatch.setattr(main, "MemoryDatabase", _broken_storage)
+
+    with pytest.raises(RuntimeError, match="storage down"):
+        async with main.lifespan(FastAPI()):
+            pass
+    assert listener.stopped
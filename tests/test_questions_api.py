@@ -1,4 +1,5 @@
 # test_questions_api.py
+import asyncio
 from datetime import UTC, datetime
 
 import pytest
@@ -135,3 +136,191 @@ async def test_delete_question_500(client, db):
     r = await client.delete("/questions/10")
     assert r.status_code == 500
     assert r.json()["detail"] == "Internal Server Error"
+
+
+@pytest.mark.asyncio
+async def test_get_question_json_mode_returns_db_bytes(client, db, config):
+    document = b'{"text":"t","id":5,"created_at":"2025-01-01T00:00:00+00:00","answers":[]}'
+
+    async def _get_question_json(question_id: int):
+        return document
+
+    async def _get_question(question_id: int):
+        raise AssertionError("ORM path must not be used in json mode")
+
+    db.get_question_json = _get_question_json
+    db.get_question = _get_question
+    config.db.json_reads = True
+
+    r = await client.get("/questions/5")
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/json"
+    assert r.content == document
+
+
+@pytest.mark.asyncio
+async def test_get_question_json_mode_404(client, db, config):
+    async def _get_question_json(question_id: int):
+        return None
+
+    db.get_question_json = _get_question_json
+    config.db.json_reads = True
+
+    r = await client.get("/questions/5")
+    assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_questions_preview_200(client, db):
+    calls = []
+
+    async def _list_question_previews(preview: int):
+        calls.append(preview)
+        return [
+            {"id": 1, "text": "te", "created_at": datetime.now(UTC), "truncated": True},
+            {"id": 2, "text": "ok", "created_at": datetime.now(UTC), "truncated": False},
+        ]
+
+    async def _list_questions():
+        raise AssertionError("full texts must not be loaded in preview mode")
+
+    db.list_question_previews = _list_question_previews
+    db.list_questions = _list_questions
+
+    r = await client.get("/questions", params={"preview": 2})
+    assert r.status_code == 200
+    assert calls == [2]
+    body = r.json()["questions"]
+    assert [q["truncated"] for q in body] == [True, False]
+    assert body[0]["text"] == "te"
+
+
+@pytest.mark.asyncio
+async def test_list_questions_preview_422_on_bad_length(client, db):
+    r = await client.get("/questions", params={"preview": 0})
+    assert r.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_questions_fields_projection(client, db):
+    calls = []
+
+    async def _list_questions_projection(fields, preview=None, **filters):
+        calls.append((fields, preview))
+        return [{"id": 1, "created_at": datetime.now(UTC)}]
+
+    db.list_questions_projection = _list_questions_projection
+
+    r = await client.get("/questions", params={"fields": "created_at,id"})
+    assert r.status_code == 200
+    # Поля приходят в порядке схемы, независимо от порядка в запросе
+    assert calls == [(("id", "created_at"), None)]
+    assert set(r.json()["questions"][0]) == {"id", "created_at"}
+
+
+@pytest.mark.asyncio
+async def test_get_question_fields_projection(client, db):
+    async def _get_question_projection(question_id: int, fields):
+        assert fields == ("id", "answers")
+        return {"id": question_id, "answers": []}
+
+    db.get_question_projection = _get_question_projection
+
+    r = await client.get("/questions/3", params={"fields": "answers,id"})
+    assert r.status_code == 200
+    assert r.json() == {"id": 3, "answers": []}
+
+
+@pytest.mark.asyncio
+async def test_fields_422_on_unknown_field(client, db):
+    r = await client.get("/questions", params={"fields": "id,password"})
+    assert r.status_code == 422
+    assert "password" in r.json()["detail"]
+
+    # truncated есть только в режиме превью
+    r = await client.get("/questions", params={"fields": "truncated"})
+    assert r.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_questions_created_range(client, db):
+    calls = []
+
+    async def _list_questions_projection(fields, preview=None, **filters):
+        calls.append((fields, filters))
+        return [{"text": "t", "id": 1, "created_at": datetime.now(UTC)}]
+
+    db.list_questions_projection = _list_questions_projection
+
+    r = await client.get(
+        "/questions",
+        params={"created_after": "2025-01-01T00:00:00", "created_before": "2025-02-01T00:00:00Z"},
+    )
+    assert r.status_code == 200
+    fields, filters = calls[0]
+    # Без fields= отдаются все поля схемы
+    assert fields == ("text", "id", "created_at")
+    # Время без зоны трактуется как UTC
+    assert filters["created_after"] == datetime(2025, 1, 1, tzinfo=UTC)
+    assert filters["created_before"] == datetime(2025, 2, 1, tzinfo=UTC)
+
+
+@pytest.mark.asyncio
+async def test_list_questions_created_range_422_on_empty_window(client, db):
+    r = await client.get(
+        "/questions",
+        params={"created_after": "2025-02-01T00:00:00Z", "created_before": "2025-01-01T00:00:00Z"},
+    )
+    assert r.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_questions_504_when_header_deadline_passes(client, db):
+    cancelled = asyncio.Event()
+
+    async def _slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    db.list_questions = _slow
+
+    r = await client.get("/questions", headers={"X-Request-Timeout": "0.05"})
+    assert r.status_code == 504
+    assert r.json()["detail"] == "Deadline exceeded"
+    # Запрос к БД отменён до того, как ушёл ответ
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_get_question_uses_route_deadline(client, db, config):
+    config.deadlines.routes["questions.get"] = 0.05
+
+    async def _slow(question_id):
+        await asyncio.sleep(5)
+
+    db.get_question = _slow
+
+    r = await client.get("/questions/1")
+    assert r.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_header_cannot_extend_route_deadline(client, db, config):
+    config.deadlines.routes["questions.list"] = 0.05
+
+    async def _slow():
+        await asyncio.sleep(5)
+
+    db.list_questions = _slow
+
+    r = await client.get("/questions", headers={"X-Request-Timeout": "60"})
+    assert r.status_code == 504
+
+
+@pytest.mark.asyncio
+async def test_invalid_deadline_header_400(client, db):
+    r = await client.get("/questions", headers={"X-Request-Timeout": "soon"})
+    assert r.status_code == 400
@@ -0,0 +1,140 @@
+# test_sharding.py
+# Шардирование на нескольких базах одного Postgres (TEST_DATABASE_URL);
+# общий контракт Storage проверяется в test_storage_conformance.py.
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from app.api.v1.pagination import decode_cursor
+from app.db.answer_feed import AnswerFeed
+from app.db.sharding import configure_shard_sequences, shard_index
+from app.schemas.answer import AnswerCreate
+from app.schemas.question import QuestionCreate
+
+
+def test_shard_index_is_id_residue():
+    assert [shard_index(i, 3) for i in range(1, 8)] == [0, 1, 2, 0, 1, 2, 0]
+    assert [shard_index(i, 1) for i in (1, 2, 99)] == [0, 0, 0]
+
+
+async def _rows(shard, sql):
+    async with shard.engine.connect() as conn:
+        return (await conn.execute(text(sql))).all()
+
+
+@pytest.mark.asyncio
+async def test_ids_encode_shard_and_answers_live_with_question(pg_shards):
+    count = len(pg_shards.shards)
+    questions = [
+        await pg_shards.create_question(QuestionCreate(text=f"Вопрос {i}"))
+        for i in range(2 * count)
+    ]
+    for question in questions:
+        await pg_shards.create_answer_for_question(
+            question["id"], AnswerCreate(user_id="u", text="Ответ")
+        )
+
+    for index, shard in enumerate(pg_shards.shards):
+        rows = await _rows(shard, "SELECT id FROM questions")
+        question_ids = [row.id for row in rows]
+        answers = await _rows(
+            shard,
+            "SELECT a.id, q.id AS local_question FROM answers a "
+            "LEFT JOIN questions q ON q.id = a.question_id",
+        )
+        # По кругу: на каждом шарде по два вопроса
+        assert len(question_ids) == 2
+        assert {shard_index(i, count) for i in question_ids} == {index}
+        assert {shard_index(a.id, count) for a in answers} == {index}
+        assert all(a.local_question is not None for a in answers)
+
+    # Поиск по id ответа идёт в нужный шард без справочника
+    listed = await pg_shards.list_answers(limit=100)
+    for answer in listed:
+        found = await pg_shards.get_answer_by_id(answer["id"])
+        assert found.id == answer["id"]
+
+
+@pytest.mark.asyncio
+async def test_listings_merge_shards_in_global_order(pg_shards):
+    created = [
+        await pg_shards.create_question(QuestionCreate(text=f"Вопрос {i}"))
+        for i in range(7)
+    ]
+
+    listed = await pg_shards.list_questions()
+    projected = await pg_shards.list_questions_projection(("text",))
+
+    assert [q.id for q in listed] == [q["id"] for q in reversed(created)]
+    # Служебные created_at и id для слияния не попадают в ответ
+    assert projected == [{"text": q["text"]} for q in reversed(created)]
+
+
+@pytest.mark.asyncio
+async def test_configure_is_idempotent_and_refuses_foreign_ids(pg_shards, pg_db):
+    assert await pg_shards.configure_shards() == []
+
+    # pg_db — шард 0: id другого шарда в нём означает сломанную раскладку
+    async with pg_db.engine.begin() as conn:
+        await conn.execute(text("INSERT INTO questions (id, text) VALUES (2, 'x')"))
+    with pytest.raises(RuntimeError, match="belongs to shard 1"):
+        async with pg_db.engine.begin() as conn:
+            await configure_shard_sequences(conn, 0, 2)
+
+
+@pytest.mark.asyncio
+async def test_changes_cursor_covers_every_shard(app, pg_shards):
+    from app.api.v1 import deps
+
+    for i in range(4):
+        question = await pg_shards.create_question(QuestionCreate(text=f"В{i}"))
+        await pg_shards.create_answer_for_question(
+            question["id"], AnswerCreate(user_id="u", text="Ответ")
+        )
+
+    async def _override():
+        return pg_shards
+
+    app.dependency_overrides[deps.get_db] = _override
+    seen, cursor, pages = [], None, 0
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as c:
+        while True:
+            params = {"limit": 3} if cursor is None else {"limit": 3, "cursor": cursor}
+            body = (await c.get("/changes", params=params)).json()
+            seen += [(ch["entity"], ch["entity_id"]) for ch in body["changes"]]
+            cursor = body["next_cursor"]
+            pages += 1
+            if not body["has_more"]:
+                break
+        repeat = (await c.get("/changes", params={"cursor": cursor})).json()
+
+    assert len(decode_cursor(cursor, size=2 * len(pg_shards.shards))) == 6
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 8
+    assert repeat["changes"] == []
+
+
+@pytest.mark.asyncio
+async def test_notify_from_every_shard_reaches_subscriber(pg_shards):
+    feed = AnswerFeed(pg_shards, buffer_size=10)
+    await feed.start()
+    try:
+        questions = [
+            await pg_shards.create_question(QuestionCreate(text="Вопрос"))
+            for _ in pg_shards.shards
+        ]
+        received = []
+        for question in questions:
+            async with feed.subscribe(question["id"]) as subscription:
+                created = await pg_shards.create_answer_for_question(
+                    question["id"], AnswerCreate(user_id="u", text="Ответ")
+                )
+                answer = await asyncio.wait_for(subscription.get(), timeout=5)
+            received.append(answer["id"] == created["id"])
+    finally:
+        await feed.stop()
+
+    assert received == [True] * len(pg_shards.shards)
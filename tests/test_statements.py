@@ -0,0 +1,58 @@
+# test_statements.py
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.db import database
+from app.db.database import StatementCacheStats
+from app.db.models import Base, QuestionOrm
+
+
+@pytest.fixture
+def engine():
+    # Синхронный sqlite достаточно, чтобы проверить кэш компиляции SQLAlchemy
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def _now(dbapi_conn, _):
+        dbapi_conn.create_function("now", 0, lambda: "2025-01-01 00:00:00")
+
+    # Только таблицы без Postgres-специфичных default'ов. answers в Postgres
+    # партиционирована с ключом (id, created_at) — в sqlite такой ключ не
+    # автоинкрементный, поэтому создаём её упрощённой копией.
+    Base.metadata.create_all(engine, tables=[QuestionOrm.__table__])
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE answers ("
+            "id INTEGER PRIMARY KEY, "
+            "question_id INTEGER NOT NULL REFERENCES questions (id), "
+            "user_id VARCHAR(200) NOT NULL, "
+            "text VARCHAR(10000) NOT NULL, "
+            "created_at DATETIME DEFAULT (now()) NOT NULL)"
+        )
+    yield engine
+    engine.dispose()
+
+
+def test_prebuilt_statements_hit_compiled_cache(engine):
+    stats = StatementCacheStats()
+    stats.attach(engine)
+
+    for i in range(5):
+        with Session(engine) as session, session.begin():
+            q = session.execute(database.INSERT_QUESTION, {"text": f"q{i}"}).one()
+            session.execute(
+                database.INSERT_ANSWER,
+                {"question_id": q.id, "user_id": "u", "text": "a"},
+            )
+            session.execute(database.SELECT_QUESTION_BY_ID, {"question_id": q.id})
+            session.execute(database.SELECT_ANSWER_BY_ID, {"answer_id": 1})
+
+    # Первый круг — промахи, все последующие — попадания
+    assert stats.misses <= 6
+    assert stats.hit_ratio > 0.7
+
+
+def test_cache_key_is_memoized():
+    stmt = database.SELECT_QUESTION_BY_ID
+    assert stmt._generate_cache_key() is stmt._generate_cache_key()
@@ -0,0 +1,281 @@
+# test_storage_conformance.py
+# Общий контракт Storage: одни и те же проверки для каждого движка.
+# Postgres-вариант пропускается без TEST_DATABASE_URL.
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.db.memory import MemoryDatabase
+from app.db.storage import ChangesPruned, Storage
+from app.schemas import trusted
+from app.schemas.answer import AnswerCreate
+from app.schemas.question import QuestionCreate, QuestionWithAnswersRead
+
+
+@pytest.fixture(params=["memory", "postgres", "sharded"])
+def storage(request) -> Storage:
+    if request.param == "memory":
+        return MemoryDatabase()
+    if request.param == "sharded":
+        return request.getfixturevalue("pg_shards")
+    return request.getfixturevalue("pg_db")
+
+
+def _position(change) -> tuple[int, ...]:
+    return change.get("position", (change["txid"], change["seq"]))
+
+
+async def _question(storage, text="Вопрос"):
+    return await storage.create_question(QuestionCreate(text=text))
+
+
+async def _answer(storage, question_id, user_id="u1", text="Ответ"):
+    return await storage.create_answer_for_question(
+        question_id, AnswerCreate(user_id=user_id, text=text)
+    )
+
+
+def test_engines_implement_protocol(storage):
+    assert isinstance(storage, Storage)
+
+
+@pytest.mark.asyncio
+async def test_question_round_trip(storage):
+    created = await _question(storage, "Первый")
+    answer = await _answer(storage, created["id"])
+
+    question = trusted.question_with_answers_read(
+        await storage.get_question(created["id"])
+    )
+
+    assert question == {
+        "text": "Первый",
+        "id": created["id"],
+        "created_at": created["created_at"],
+        "answers": [trusted.answer_read(answer)],
+    }
+    assert await storage.get_question(created["id"] + 1000) is None
+
+
+@pytest.mark.asyncio
+async def test_question_json_matches_question(storage):
+    created = await _question(storage)
+    await _answer(storage, created["id"], text="Первый")
+    await _answer(storage, created["id"], text="Второй")
+
+    document = await storage.get_question_json(created["id"])
+    question = await storage.get_question(created["id"])
+
+    assert QuestionWithAnswersRead.model_validate_json(
+        document
+    ) == QuestionWithAnswersRead.model_validate(
+        trusted.question_with_answers_read(question)
+    )
+    assert await storage.get_question_json(created["id"] + 1000) is None
+
+
+@pytest.mark.asyncio
+async def test_questions_are_listed_newest_first(storage):
+    first = await _question(storage, "Короткий")
+    second = await _question(storage, "Длинный " * 10)
+
+    listed = trusted.questions_read(await storage.list_questions())["questions"]
+    previews = await storage.list_question_previews(preview=10)
+
+    assert [q["id"] for q in listed] == [second["id"], first["id"]]
+    assert previews == [
+        {
+            "id": second["id"],
+            "text": "Длинный Дл",
+            "created_at": second["created_at"],
+            "truncated": True,
+        },
+        {
+            "id": first["id"],
+            "text": "Короткий",
+            "created_at": first["created_at"],
+            "truncated": False,
+        },
+    ]
+
+
+@pytest.mark.asyncio
+async def test_question_projections(storage):
+    old = await _question(storage, "Старый")
+    new = await _question(storage, "Новый")
+    answer = await _answer(storage, new["id"])
+
+    listed = await storage.list_questions_projection(("text",))
+    recent = await storage.list_questions_projection(
+        ("id",), created_after=new["created_at"]
+    )
+    older = await storage.list_questions_projection(
+        ("id",), created_before=new["created_at"]
+    )
+    question = await storage.get_question_projection(new["id"], ("answers", "text"))
+
+    assert listed == [{"text": "Новый"}, {"text": "Старый"}]
+    assert recent == [{"id": new["id"]}]
+    assert older == [{"id": old["id"]}]
+    # Ответы идут последними и целиком
+    assert list(question) == ["text", "answers"]
+    assert [trusted.answer_read(a) for a in question["answers"]] == [
+        trusted.answer_read(answer)
+    ]
+    assert await storage.get_question_projection(new["id"] + 1000, ("id",)) is None
+
+
+@pytest.mark.asyncio
+async def test_answer_to_missing_question_is_integrity_error(storage):
+    with pytest.raises(IntegrityError):
+        await _answer(storage, 12345)
+
+
+@pytest.mark.asyncio
+async def test_answer_lookups(storage):
+    question = await _question(storage)
+    created = await _answer(storage, question["id"], user_id="u7", text="Да")
+
+    answer = await storage.get_answer_by_id(created["id"])
+    projection = await storage.get_answer_projection(created["id"], ("text", "id"))
+
+    assert trusted.answer_read(answer) == trusted.answer_read(created)
+    assert projection == {"text": "Да", "id": created["id"]}
+    assert await storage.get_answer_by_id(created["id"] + 1000) is None
+    assert await storage.get_answer_projection(created["id"] + 1000, ("id",)) is None
+
+
+@pytest.mark.asyncio
+async def test_answers_keyset_pages(storage):
+    first_question = await _question(storage)
+    second_question = await _question(storage)
+    answers = []
+    for i in range(5):
+        question = first_question if i % 2 else second_question
+        answers.append(await _answer(storage, question["id"], user_id=f"u{i % 2}"))
+    newest_first = [a["id"] for a in reversed(answers)]
+
+    page = await storage.list_answers(limit=2)
+    last = page[-1]
+    rest = await storage.list_answers(
+        limit=10, before=(last["created_at"], last["id"])
+    )
+    by_user = await storage.list_answers_by_user("u1", fields=("user_id",))
+    window = await storage.list_answers(
+        created_after=answers[1]["created_at"],
+        created_before=answers[3]["created_at"],
+        fields=("id",),
+    )
+
+    assert [a["id"] for a in page + rest] == newest_first
+    # created_at и id добавляются ради курсора
+    assert by_user == [
+        {"user_id": "u1", "created_at": a["created_at"], "id": a["id"]}
+        for a in (answers[3], answers[1])
+    ]
+    assert [a["id"] for a in window] == [answers[2]["id"], answers[1]["id"]]
+    assert await storage.list_answers_by_user("nobody") == []
+
+
+@pytest.mark.asyncio
+async def test_deletes_cascade(storage):
+    kept = await _question(storage)
+    doomed = await _question(storage)
+    kept_answer = await _answer(storage, kept["id"], user_id="u1")
+    doomed_answer = await _answer(storage, doomed["id"], user_id="u1")
+    deleted_answer = await _answer(storage, kept["id"], user_id="u2")
+
+    assert await storage.delete_answer_by_id(deleted_answer["id"]) is True
+    assert await storage.delete_answer_by_id(deleted_answer["id"]) is False
+    assert await storage.delete_question_by_id(doomed["id"]) is True
+    assert await storage.delete_question_by_id(doomed["id"]) is False
+
+    assert await storage.get_question(doomed["id"]) is None
+    assert await storage.get_answer_by_id(doomed_answer["id"]) is None
+    assert [a["id"] for a in await storage.list_answers()] == [kept_answer["id"]]
+    assert await storage.list_answers_by_user("u2") == []
+    question = await storage.get_question(kept["id"])
+    answers = trusted.question_with_answers_read(question)["answers"]
+    assert [a["id"] for a in answers] == [kept_answer["id"]]
+
+
+@pytest.mark.asyncio
+async def test_changes_feed(storage):
+    question = await _question(storage)
+    answer = await _answer(storage, question["id"])
+    await storage.delete_answer_by_id(answer["id"])
+    await storage.delete_question_by_id(question["id"])
+
+    changes = await storage.list_changes()
+    first = await storage.list_changes(limit=2)
+    rest = await storage.list_changes(after=_position(first[-1]))
+
+    assert [
+        (c["entity"], c["op"], c["entity_id"], c["question_id"]) for c in changes
+    ] == [
+        ("question", "create", question["id"], question["id"]),
+        ("answer", "create", answer["id"], question["id"]),
+        ("answer", "delete", answer["id"], question["id"]),
+        ("question", "delete", question["id"], question["id"]),
+    ]
+    assert [_position(c) for c in first + rest] == [_position(c) for c in changes]
+    assert await storage.list_changes(after=_position(changes[-1])) == []
+    assert await storage.changes_lag() == {"held_back": 0, "oldest_held_back": None}
+
+
+@pytest.mark.asyncio
+async def test_prune_changes_keeps_feed_going(storage):
+    questions = [await _question(storage, f"Вопрос {i}") for i in range(3)]
+    changes = await storage.list_changes()
+
+    deleted = await storage.prune_changes(changes[1]["created_at"])
+    kept = await storage.list_changes()
+    later = await _question(storage)
+    delta = await storage.list_changes(after=_position(kept[-1]))
+
+    assert deleted == 1
+    assert [c["entity_id"] for c in kept] == [q["id"] for q in questions[1:]]
+    assert [c["entity_id"] for c in delta] == [later["id"]]
+
+
+@pytest.mark.asyncio
+async def test_cursor_into_pruned_changes_is_refused(storage):
+    for i in range(3):
+        await _question(storage, f"Вопрос {i}")
+    changes = await storage.list_changes()
+
+    await storage.prune_changes(changes[2]["created_at"])
+
+    # Курсор до последнего удалённого изменения пропустил бы удалённое
+    with pytest.raises(ChangesPruned):
+        await storage.list_changes(after=_position(changes[0]))
+    rest = await storage.list_changes(after=_position(changes[1]))
+    assert [_position(c) for c in rest] == [_position(changes[2])]
+
+
+@pytest.mark.asyncio
+async def test_api_runs_on_memory_engine(app, valid_question_payload):
+    from httpx import ASGITransport, AsyncClient
+
+    from app.api.v1 import deps
+
+    storage = MemoryDatabase()
+
+    async def _override():
+        return storage
+
+    app.dependency_overrides[deps.get_db] = _override
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as c:
+        created = (await c.post("/questions", json=valid_question_payload)).json()
+        answer = await c.post(
+            f"/questions/{created['id']}/answers",
+            json={"user_id": "u1", "text": "Да"},
+        )
+        missing = await c.post(
+            "/questions/999/answers", json={"user_id": "u1", "text": "Да"}
+        )
+        question = (await c.get(f"/questions/{created['id']}")).json()
+
+    assert answer.status_code == 201
+    assert missing.status_code == 404
+    assert [a["text"] for a in question["answers"]] == ["Да"]
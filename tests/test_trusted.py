@@ -0,0 +1,54 @@
+# test_trusted.py
+import json
+from datetime import UTC, datetime
+
+from app.db.models import AnswerOrm, QuestionOrm
+from app.schemas import AnswerRead, QuestionWithAnswersRead, trusted
+from app.schemas.question import QuestionsRead
+
+
+def _question_orm(answers: int) -> QuestionOrm:
+    now = datetime.now(UTC)
+    question = QuestionOrm(id=1, text="Вопрос", created_at=now)
+    question.answers = [
+        AnswerOrm(id=i, question_id=1, user_id=f"user-{i}", text="Ответ", created_at=now)
+        for i in range(answers)
+    ]
+    return question
+
+
+def test_question_with_answers_matches_validated_output():
+    question = _question_orm(answers=3)
+
+    body = json.loads(
+        trusted.json_response(trusted.question_with_answers_read(question)).body
+    )
+
+    assert body == QuestionWithAnswersRead.model_validate(question).model_dump(
+        mode="json"
+    )
+
+
+def test_answer_from_mapping_matches_validated_output():
+    row = {
+        "id": 5,
+        "question_id": 1,
+        "user_id": "u",
+        "text": "t",
+        "created_at": datetime.now(UTC),
+    }
+
+    body = json.loads(trusted.json_response(trusted.answer_read(row)).body)
+
+    assert body == AnswerRead.model_validate(row).model_dump(mode="json")
+
+
+def test_questions_list_ignores_unloaded_extra_attributes():
+    rows = [_question_orm(answers=0), _question_orm(answers=2)]
+
+    body = json.loads(trusted.json_response(trusted.questions_read(rows)).body)
+
+    assert body == QuestionsRead.model_validate(
+        {"questions": [trusted.question_read(row) for row in rows]}
+    ).model_dump(mode="json")
+    assert "answers" not in body["questions"][0]
@@ -0,0 +1,134 @@
+# test_users_api.py
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.api.v1.pagination import decode_cursor, encode_cursor
+from app.db.database import select_answers
+from app.schemas.answer import AnswerCreate
+from app.schemas.question import QuestionCreate
+
+USER_ID = "e2b50b32-76ae-42f9-a012-4e5ae315645b"
+
+
+def _answer(answer_id: int, created_at: datetime):
+    return {
+        "id": answer_id,
+        "question_id": 1,
+        "user_id": USER_ID,
+        "text": "ok",
+        "created_at": created_at,
+    }
+
+
+@pytest.mark.asyncio
+async def test_user_answers_first_page(client, db):
+    now = datetime.now(UTC)
+    calls = []
+
+    async def _list_answers(limit=50, before=None, fields=None, **filters):
+        calls.append((filters["user_id"], limit, before))
+        return [_answer(3, now), _answer(2, now - timedelta(seconds=1)), _answer(1, now)]
+
+    db.list_answers = _list_answers
+
+    r = await client.get(f"/users/{USER_ID}/answers", params={"limit": 2})
+    assert r.status_code == 200
+    body = r.json()
+    assert [a["id"] for a in body["answers"]] == [3, 2]
+    created_at, answer_id = decode_cursor(body["next_cursor"], size=2)
+    assert answer_id == "2"
+    assert datetime.fromisoformat(created_at) == now - timedelta(seconds=1)
+    assert calls == [(USER_ID, 3, None)]
+
+
+@pytest.mark.asyncio
+async def test_user_answers_last_page_has_no_cursor(client, db):
+    now = datetime.now(UTC)
+    calls = []
+
+    async def _list_answers(limit=50, before=None, fields=None, **filters):
+        calls.append(before)
+        return [_answer(1, now)]
+
+    db.list_answers = _list_answers
+    cursor = encode_cursor(now.isoformat(), 2)
+
+    r = await client.get(f"/users/{USER_ID}/answers", params={"cursor": cursor})
+    assert r.status_code == 200
+    assert r.json()["next_cursor"] is None
+    assert calls == [(now, 2)]
+
+
+@pytest.mark.asyncio
+async def test_user_answers_fields(client, db):
+    async def _list_answers(limit=50, before=None, fields=None, **filters):
+        assert fields == ("id", "created_at")
+        return [{"id": 1, "created_at": datetime.now(UTC)}]
+
+    db.list_answers = _list_answers
+
+    r = await client.get(f"/users/{USER_ID}/answers", params={"fields": "id,created_at"})
+    assert r.status_code == 200
+    assert set(r.json()["answers"][0]) == {"id", "created_at"}
+
+
+@pytest.mark.asyncio
+async def test_user_answers_400_on_bad_cursor(client, db):
+    r = await client.get(
+        f"/users/{USER_ID}/answers", params={"cursor": encode_cursor("nope", 1)}
+    )
+    assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_user_answers_500(client, db):
+    async def _boom(limit=50, before=None, fields=None, **filters):
+        raise RuntimeError("db down")
+
+    db.list_answers = _boom
+
+    r = await client.get(f"/users/{USER_ID}/answers")
+    assert r.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_cover_all_answers_once(pg_db):
+    question = await pg_db.create_question(QuestionCreate(text="Вопрос"))
+    created = []
+    for i in range(7):
+        answer = await pg_db.create_answer_for_question(
+            question["id"], AnswerCreate(user_id="me", text=f"Ответ {i}")
+        )
+        created.append(answer["id"])
+    await pg_db.create_answer_for_question(
+        question["id"], AnswerCreate(user_id="someone-else", text="Чужой")
+    )
+
+    seen, before = [], None
+    while True:
+        page = await pg_db.list_answers_by_user("me", limit=3, before=before)
+        seen += [a["id"] for a in page]
+        if len(page) < 3:
+            break
+        before = (page[-1]["created_at"], page[-1]["id"])
+
+    assert seen == sorted(created, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_narrow_user_listing_uses_index_only_scan(pg_db):
+    async with pg_db.engine.begin() as conn:
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        await conn.execute(text("SET LOCAL enable_bitmapscan = off"))
+        stmt = select_answers(("id", "created_at"), by_user=True)
+        sql = stmt.params(user_id="me", limit=10).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+        plan = (await conn.execute(text(f"EXPLAIN {sql}"))).scalars().all()
+
+    assert any("Index Only Scan" in line for line in plan)
+    # На партициях индекс называется answers_pYYYYMM_user_id_created_at_id_idx
+    assert any("user_id_created_at_id" in line for line in plan)